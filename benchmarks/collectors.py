@@ -0,0 +1,138 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from os.path import abspath, dirname, join as pathJoin
+from sys import path as sysPath, exit as sysExit
+from time import perf_counter
+from types import SimpleNamespace
+
+
+# ==> MAKE THE PACTOOL SOURCES IMPORTABLE
+sysPath.insert(0, pathJoin(dirname(dirname(abspath(__file__))), "src"))
+
+
+# ==> PACTOOL FILES
+from core.formatter import Formatter
+from core.manager import Manager
+from core.database import PacmanDatabase
+from operations.packages import Packages
+
+
+
+
+##########################################################################
+#                                                                        #
+#                               BENCHMARK                                #
+#                                                                        #
+##########################################################################
+
+
+def timeCollector(label: str, collector, rounds: int = 10):
+    # ==> WARM UP ONCE SO BOTH PATHS START WITH A HOT PAGE CACHE
+    result = collector()
+    timings = []
+
+
+    for _ in range(rounds):
+        start = perf_counter()
+        collector()
+        timings.append((perf_counter() - start) * 1000)
+
+
+    best = min(timings)
+    average = sum(timings) / len(timings)
+    print(f"{Formatter.tab4}{label:<24} best {best:8.2f} ms   avg {average:8.2f} ms   ({len(result)} packages)")
+    return result, best
+
+
+
+
+
+def main() -> int:
+    manager = Manager()
+    packages = Packages(Pactool=SimpleNamespace(manager=manager))
+
+
+    if manager.defaultPackageManager == "apt":
+        print(Formatter.colorText("collectAptPackages", Formatter.headerColor, Formatter.bold))
+        legacy, legacyTime = timeCollector("dpkg-query + stat()", packages._queryAptPackages)
+        native, nativeTime = timeCollector("native status reader", packages.collectAptPackages)
+    elif manager.defaultPackageManager == "pacman":
+        print(Formatter.colorText("collectPacmanPackages", Formatter.headerColor, Formatter.bold))
+        legacy, legacyTime = timeCollector("pacman -Qi", packages._queryPacmanPackages)
+        native, nativeTime = timeCollector("native local DB reader", lambda: PacmanDatabase().collect())
+    else:
+        print(Formatter.colorText("No benchmarkable package manager found.", Formatter.red))
+        return 1
+
+
+    # ==> BOTH BACKENDS MUST AGREE ON THE RECORDS THEY PRODUCE (TO THE SECOND)
+    # ==> (dpkg-query MISSES name:arch.list DATES, THE NATIVE READER DOES NOT)
+    recordKey = lambda pkg: (pkg.sizeBytes, int(pkg.installedTs), int(pkg.updatedTs))
+    nativeByName = {pkg.name: pkg for pkg in native}
+    mismatched = []
+    recovered = 0
+
+
+    for pkg in legacy:
+        other = nativeByName.get(pkg.name)
+        if other and recordKey(other) == recordKey(pkg):
+            continue
+        if other and not pkg.installedTs and other.sizeBytes == pkg.sizeBytes:
+            recovered += 1
+            continue
+        mismatched.append(pkg.name)
+
+
+    print()
+    print(f"{Formatter.tab4}Speedup                  {legacyTime / max(nativeTime, 1e-9):.1f}x")
+    print(f"{Formatter.tab4}Recovered multi-arch     {recovered}")
+    print(f"{Formatter.tab4}Mismatched records       {len(mismatched)}")
+    for name in mismatched[:10]:
+        print(f"{Formatter.tab8}{name}")
+
+
+    return 1 if mismatched or len(legacy) != len(native) else 0
+
+
+
+
+
+if __name__ == "__main__":
+    sysExit(main())
@@ -0,0 +1,326 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from bisect import bisect_right
+from time import localtime
+
+
+# ==> OPTIONAL: VECTORIZED BACKEND, IMPORTED ON FIRST USE (numpy ALONE COSTS ~80 ms)
+numpy = None
+numpyAvailable = None
+
+
+
+
+def loadNumpy() -> bool:
+    global numpy, numpyAvailable
+    if numpyAvailable is None:
+        try:
+            import numpy as numpyModule
+            numpy = numpyModule
+            numpyAvailable = True
+        except ImportError:
+            numpyAvailable = False
+    return numpyAvailable
+
+
+
+
+##########################################################################
+#                                                                        #
+#                          PACKAGE AGGREGATOR                            #
+#                                                                        #
+##########################################################################
+
+
+class PackageAggregator:
+    """
+    Computes every --stats figure in a single pass over PackageRecords:
+    counts, size totals, user/system splits, extremes, size percentiles,
+    a size histogram and optional group-by breakdowns.
+    Uses NumPy for the numeric columns on large inventories when it is installed.
+    """
+    percentiles = (50, 90, 99)
+    histogramEdges = (100 * 1024, 1024 ** 2, 10 * 1024 ** 2, 100 * 1024 ** 2)
+    histogramLabels = ("< 100 KiB", "100 KiB - 1 MiB", "1 - 10 MiB", "10 - 100 MiB", ">= 100 MiB")
+    groupKeys = ("type", "month", "section")
+    numpyThreshold = 5000
+
+
+
+
+    def __init__(self, records: list, groupBy: tuple = (), useNumpy: bool = None) -> None:
+        self.records = records
+        self.groupBy = tuple(key for key in groupBy if key in self.groupKeys)
+        # ==> ON SMALL INVENTORIES IMPORTING numpy COSTS MORE THAN IT SAVES
+        if useNumpy is None:
+            useNumpy = len(records) >= self.numpyThreshold
+        self.useNumpy = bool(useNumpy) and loadNumpy()
+        self._monthCache = {}
+
+
+
+
+
+    def run(self) -> dict:
+        if not self.records:
+            return {}
+        return self._aggregateNumpy() if self.useNumpy else self._aggregatePython()
+
+
+
+
+
+    ##########################################################################
+    #                               GROUP KEYS                               #
+    ##########################################################################
+
+
+    def groupValue(self, key: str, record) -> str:
+        if key == "type":
+            return "User" if record.isUser else "System"
+
+
+        elif key == "month":
+            if not record.installedTs:
+                return "Unknown"
+
+
+            # ==> ONE localtime() PER DISTINCT TIMESTAMP (PACKAGES ARE INSTALLED IN BATCHES);
+            # ==> A UTC DAY CAN STRADDLE TWO LOCAL MONTHS, SO NOTHING COARSER IS SAFE
+            month = self._monthCache.get(record.installedTs)
+            if month is None:
+                month = "%04d-%02d" % localtime(record.installedTs)[:2]
+                self._monthCache[record.installedTs] = month
+            return month
+
+
+        return record.section or "Unknown"
+
+
+
+
+
+    ##########################################################################
+    #                             PURE PYTHON                                #
+    ##########################################################################
+
+
+    def _aggregatePython(self) -> dict:
+        first = self.records[0]
+        result = {
+            "count": 0,
+            "userCount": 0,
+            "totalSize": 0,
+            "userSize": 0,
+            "largest": first,
+            "smallest": first,
+            "oldestInstalled": None,
+            "latestInstalled": first,
+            "oldestUpdated": None,
+            "latestUpdated": first,
+        }
+
+
+        histogram = [[0, 0] for _ in self.histogramLabels]
+        groups = {key: {} for key in self.groupBy}
+        sizes = []
+        edges = self.histogramEdges
+
+
+        # ==> THE ONLY PASS OVER THE RECORDS
+        for record in self.records:
+            size = record.sizeBytes
+            sizes.append(size)
+            result["count"] += 1
+            result["totalSize"] += size
+
+
+            if record.isUser:
+                result["userCount"] += 1
+                result["userSize"] += size
+
+
+            # ==> EXTREMES
+            if size > result["largest"].sizeBytes:
+                result["largest"] = record
+            if size < result["smallest"].sizeBytes:
+                result["smallest"] = record
+            if record.installedTs > result["latestInstalled"].installedTs:
+                result["latestInstalled"] = record
+            if record.updatedTs > result["latestUpdated"].updatedTs:
+                result["latestUpdated"] = record
+
+
+            # ==> PACKAGES WITHOUT A DATE NEVER COUNT AS THE OLDEST
+            oldest = result["oldestInstalled"]
+            if record.installedTs and (oldest is None or record.installedTs < oldest.installedTs):
+                result["oldestInstalled"] = record
+            oldest = result["oldestUpdated"]
+            if record.updatedTs and (oldest is None or record.updatedTs < oldest.updatedTs):
+                result["oldestUpdated"] = record
+
+
+            # ==> HISTOGRAM
+            bucket = histogram[bisect_right(edges, size)]
+            bucket[0] += 1
+            bucket[1] += size
+
+
+            # ==> GROUP-BY
+            for key in self.groupBy:
+                entry = groups[key].setdefault(self.groupValue(key, record), [0, 0])
+                entry[0] += 1
+                entry[1] += size
+
+
+        sizes.sort()
+        result["percentiles"] = {p: sizes[self._rank(p, len(sizes))] for p in self.percentiles}
+        result["histogram"] = [(label, count, total) for label, (count, total) in zip(self.histogramLabels, histogram)]
+        result["groups"] = {key: self._sortGroup(key, values) for key, values in groups.items()}
+        return self._finish(result)
+
+
+
+
+
+    ##########################################################################
+    #                                 NUMPY                                  #
+    ##########################################################################
+
+
+    def _aggregateNumpy(self) -> dict:
+        records = self.records
+        count = len(records)
+
+
+        # ==> BUILD THE NUMERIC COLUMNS ONCE
+        sizes = numpy.fromiter((r.sizeBytes for r in records), dtype=numpy.int64, count=count)
+        installed = numpy.fromiter((r.installedTs for r in records), dtype=numpy.float64, count=count)
+        updated = numpy.fromiter((r.updatedTs for r in records), dtype=numpy.float64, count=count)
+        isUser = numpy.fromiter((r.isUser for r in records), dtype=bool, count=count)
+
+
+        result = {
+            "count": count,
+            "userCount": int(isUser.sum()),
+            "totalSize": int(sizes.sum()),
+            "userSize": int(sizes[isUser].sum()),
+            "largest": records[int(sizes.argmax())],
+            "smallest": records[int(sizes.argmin())],
+            "oldestInstalled": self._oldest(installed),
+            "latestInstalled": records[int(installed.argmax())],
+            "oldestUpdated": self._oldest(updated),
+            "latestUpdated": records[int(updated.argmax())],
+        }
+
+
+        # ==> PERCENTILES (SAME NEAREST-RANK DEFINITION AS THE PYTHON PATH)
+        sortedSizes = numpy.sort(sizes)
+        result["percentiles"] = {p: int(sortedSizes[self._rank(p, count)]) for p in self.percentiles}
+
+
+        # ==> HISTOGRAM
+        buckets = numpy.searchsorted(numpy.array(self.histogramEdges), sizes, side="right")
+        bucketCounts = numpy.bincount(buckets, minlength=len(self.histogramLabels))
+        bucketSizes = numpy.bincount(buckets, weights=sizes, minlength=len(self.histogramLabels))
+        result["histogram"] = [
+            (label, int(bucketCounts[i]), int(bucketSizes[i]))
+            for i, label in enumerate(self.histogramLabels)
+        ]
+
+
+        # ==> GROUP-BY
+        result["groups"] = {}
+        for key in self.groupBy:
+            labels, inverse = numpy.unique(numpy.array([self.groupValue(key, r) for r in records], dtype=object), return_inverse=True)
+            groupCounts = numpy.bincount(inverse, minlength=len(labels))
+            groupSizes = numpy.bincount(inverse, weights=sizes, minlength=len(labels))
+            values = {str(label): [int(groupCounts[i]), int(groupSizes[i])] for i, label in enumerate(labels)}
+            result["groups"][key] = self._sortGroup(key, values)
+
+
+        return self._finish(result)
+
+
+
+
+
+    def _oldest(self, timestamps):
+        dated = numpy.flatnonzero(timestamps)
+        if not len(dated):
+            return self.records[0]
+        return self.records[int(dated[timestamps[dated].argmin()])]
+
+
+
+
+
+    ##########################################################################
+    #                                HELPERS                                 #
+    ##########################################################################
+
+
+    @classmethod
+    def _rank(cls, percentile: int, count: int) -> int:
+        # ==> NEAREST-RANK INDEX INTO A SORTED LIST
+        return max(0, min(count - 1, -(-percentile * count // 100) - 1))
+
+
+
+
+
+    def _sortGroup(self, key: str, values: dict) -> list:
+        # ==> MONTHS READ BEST CHRONOLOGICALLY, EVERYTHING ELSE BY SIZE
+        rows = [(label, count, total) for label, (count, total) in values.items()]
+        if key == "month":
+            return sorted(rows, key=lambda row: row[0], reverse=True)
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+
+
+
+    def _finish(self, result: dict) -> dict:
+        result["systemCount"] = result["count"] - result["userCount"]
+        result["systemSize"] = result["totalSize"] - result["userSize"]
+        result["oldestInstalled"] = result["oldestInstalled"] or self.records[0]
+        result["oldestUpdated"] = result["oldestUpdated"] or self.records[0]
+        result["backend"] = "numpy" if self.useNumpy else "python"
+        return result
@@ -0,0 +1,171 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from os import stat, replace, getpid
+from pathlib import Path
+from marshal import dumps as marshalDumps, loads as marshalLoads
+
+
+
+
+##########################################################################
+#                                                                        #
+#                           INVENTORY CACHE                              #
+#                                                                        #
+##########################################################################
+
+
+class InventoryCache:
+    """
+    Persists parsed package data under ~/.cache/pactool/ in marshal form.
+    The whole file is invalidated as soon as the package database changes
+    (mtime, inode or size of the watched paths).
+    """
+    formatVersion = 5
+    cacheDir = Path.home() / ".cache" / "pactool"
+
+    # ==> WHERE core.daemon LISTENS; HERE SO CLIENTS CAN LOOK FOR IT WITHOUT IMPORTING SOCKETS
+    daemonSocket = cacheDir / "daemon.sock"
+    watchedPaths = {
+        "apt": ("/var/lib/dpkg/status", "/var/lib/apt/extended_states"),
+        "pacman": ("/var/lib/pacman/local",),
+    }
+
+
+
+
+    def __init__(self, manager: str, enabled: bool = True) -> None:
+        self.manager = manager
+        self.enabled = enabled and bool(manager)
+        self.path = self.cacheDir / f"inventory-{manager}.bin"
+        self._stamp = None
+        self._sections = None
+
+
+
+
+
+    def stamp(self) -> tuple:
+        # ==> ANY CHANGE TO THE PACKAGE DATABASE CHANGES THIS TUPLE
+        stamps = []
+        for path in self.watchedPaths.get(self.manager, ()):
+            try:
+                st = stat(path)
+                stamps.append((path, st.st_mtime_ns, st.st_ino, st.st_size))
+            except OSError:
+                stamps.append((path, None, None, None))
+        return tuple(stamps)
+
+
+
+
+
+    def _load(self) -> dict:
+        if self._sections is not None:
+            return self._sections
+
+
+        # ==> TAKE THE STAMP BEFORE ANYTHING IS COLLECTED SO A CONCURRENT
+        # ==> UPGRADE CAN ONLY EVER MAKE THE STORED DATA LOOK OLDER
+        self._stamp = self.stamp()
+        self._sections = {}
+
+
+        if not self.enabled:
+            return self._sections
+
+
+        try:
+            version, storedStamp, sections = marshalLoads(self.path.read_bytes())
+            if version == self.formatVersion and storedStamp == self._stamp:
+                self._sections = sections
+        except (OSError, ValueError, EOFError, TypeError):
+            pass
+
+
+        return self._sections
+
+
+
+
+
+    def get(self, section: str, default=None):
+        return self._load().get(section, default)
+
+
+
+
+
+    def put(self, section: str, value) -> None:
+        sections = self._load()
+        sections[section] = value
+
+
+        if not self.enabled:
+            return
+
+
+        # ==> WRITE TO A TEMP FILE AND RENAME SO READERS NEVER SEE HALF A CACHE
+        try:
+            self.cacheDir.mkdir(parents=True, exist_ok=True)
+            tempPath = self.path.with_name(f"{self.path.name}.{getpid()}.tmp")
+            tempPath.write_bytes(marshalDumps((self.formatVersion, self._stamp, sections)))
+            replace(tempPath, self.path)
+        except (OSError, ValueError):
+            pass
+
+
+
+
+
+    def refresh(self) -> None:
+        # ==> DROP THE IN-MEMORY COPY SO THE NEXT READ RE-CHECKS THE STAMP
+        self._stamp = None
+        self._sections = None
+
+
+
+
+
+    def clear(self) -> None:
+        self._sections = None
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,313 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from os import stat, replace, getpid, scandir
+from shutil import which
+from mmap import mmap, ACCESS_READ
+
+
+# ==> PACTOOL FILES (KEEP THIS LIST SHORT, IT IS LOADED ON EVERY TAB PRESS)
+from core.cache import InventoryCache
+
+
+
+
+##########################################################################
+#                                                                        #
+#                               NAME LIST                                #
+#                                                                        #
+##########################################################################
+
+
+class NameList:
+    """
+    Sorted package names, one per line, memory-mapped and searched by
+    prefix with a binary search over the raw bytes. The file is
+    considered fresh while it is newer than every watched path.
+    """
+    def __init__(self, path, watchedPaths: tuple = ()) -> None:
+        self.path = path
+        self.watchedPaths = watchedPaths
+
+
+
+
+
+    def fresh(self) -> bool:
+        try:
+            listTime = stat(self.path).st_mtime_ns
+        except OSError:
+            return False
+
+
+        for path in self.watchedPaths:
+            try:
+                if stat(path).st_mtime_ns > listTime:
+                    return False
+            except OSError:
+                continue
+        return True
+
+
+
+
+
+    def write(self, names) -> None:
+        # ==> SORTED AS BYTES SO THE BINARY SEARCH COMPARES LIKE THE FILE IS LAID OUT
+        data = b"".join(name + b"\n" for name in sorted({name.encode() for name in names}))
+
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tempPath = self.path.with_name(f"{self.path.name}.{getpid()}.tmp")
+            tempPath.write_bytes(data)
+            replace(tempPath, self.path)
+        except OSError:
+            pass
+
+
+
+
+
+    def complete(self, prefix: str, limit: int = None) -> list:
+        try:
+            with open(self.path, "rb") as listFile:
+                if not stat(listFile.fileno()).st_size:
+                    return []
+                with mmap(listFile.fileno(), 0, access=ACCESS_READ) as names:
+                    return self._scan(names, prefix.encode(), limit)
+        except (OSError, ValueError):
+            return []
+
+
+
+
+
+    @staticmethod
+    def _scan(names, prefix: bytes, limit: int = None) -> list:
+        # ==> LOWER BOUND: FIRST LINE >= PREFIX (low IS ALWAYS A LINE START)
+        low, high = 0, len(names)
+        while low < high:
+            start = names.rfind(b"\n", 0, (low + high) // 2) + 1
+            start = max(start, low)
+            end = names.find(b"\n", start)
+            if names[start:end] < prefix:
+                low = end + 1
+            else:
+                high = start
+
+
+        # ==> WALK FORWARD WHILE LINES KEEP THE PREFIX
+        matches = []
+        while low < len(names) and (limit is None or len(matches) < limit):
+            end = names.find(b"\n", low)
+            line = names[low:end]
+            if not line.startswith(prefix):
+                break
+            matches.append(line.decode())
+            low = end + 1
+        return matches
+
+
+
+
+
+##########################################################################
+#                                                                        #
+#                               COMPLETION                               #
+#                                                                        #
+##########################################################################
+
+
+# ==> WHICH NAME LIST EACH OPTION COMPLETES FROM
+completionTargets = {
+    "--info": "available",
+    "--files": "installed",
+    "--why": "installed",
+    "--history": "installed",
+    "--versions": "available",
+    "--install": "available",
+    "--uninstall": "installed",
+}
+
+
+# ==> OPTIONS WHOSE ARGUMENT IS A FILESYSTEM PATH (COMPLETED BY THE SHELL ITSELF)
+pathOptions = ("--owns", "--orphan-files")
+
+
+# ==> REPLACING A LIST OR DATABASE FILE TOUCHES ITS DIRECTORY TOO
+availableWatchedPaths = {
+    "apt": ("/var/lib/dpkg/status", "/var/lib/apt/lists"),
+    "pacman": ("/var/lib/pacman/local", "/var/lib/pacman/sync"),
+}
+
+
+shells = ("bash", "zsh", "fish")
+
+
+
+
+def detectManager() -> str:
+    # ==> SAME ORDER AS Manager.detectManager, WITHOUT PULLING IN THE LOGGER
+    if which("apt"):
+        return "apt"
+    elif which("pacman"):
+        return "pacman"
+    return ""
+
+
+
+
+def installedNames(manager: str) -> list:
+    if manager == "apt":
+        from core.database import DpkgDatabase
+        return [stanza["Package"] for stanza in DpkgDatabase().installedPackages(set()) if stanza.get("Status", "").endswith(" installed")]
+
+
+    # ==> pacman: ONE name-version-release DIRECTORY PER PACKAGE
+    with scandir("/var/lib/pacman/local") as entries:
+        return [entry.name.rsplit("-", 2)[0] for entry in entries if entry.is_dir()]
+
+
+
+
+def nameList(kind: str, manager: str) -> NameList:
+    """
+    The installed or available name list for a manager, rebuilt first if stale.
+    """
+    watchedPaths = InventoryCache.watchedPaths if kind == "installed" else availableWatchedPaths
+    names = NameList(InventoryCache.cacheDir / f"names-{kind}-{manager}.txt", watchedPaths.get(manager, ()))
+
+
+    if not names.fresh():
+        try:
+            if kind == "installed":
+                names.write(installedNames(manager))
+            else:
+                from core.search import SearchIndex
+                names.write(SearchIndex(manager).load().names)
+        except OSError:
+            pass
+
+
+    return names
+
+
+
+
+def completeMain(arguments: list) -> int:
+    """
+    pactool --complete OPTION [PREFIX]: print matching package names, one per line.
+    """
+    if not arguments or arguments[0] not in completionTargets:
+        return 1
+
+
+    manager = detectManager()
+    if not manager:
+        return 1
+
+
+    prefix = arguments[1] if len(arguments) > 1 else ""
+    print("\n".join(nameList(completionTargets[arguments[0]], manager).complete(prefix)))
+    return 0
+
+
+
+
+def completionScript(shell: str, options: dict, command: str = "pactool") -> str:
+    """
+    Shell completion script; options maps every option string to its help text.
+    """
+    targets = " ".join(option for option in completionTargets)
+    paths = "|".join(pathOptions)
+    words = " ".join(sorted(options))
+
+
+    if shell == "bash":
+        return (
+            f"_{command}() {{\n"
+            f"    local cur=\"${{COMP_WORDS[COMP_CWORD]}}\" prev=\"${{COMP_WORDS[COMP_CWORD-1]}}\"\n"
+            f"    case \"$prev\" in\n"
+            f"        {targets.replace(' ', '|')})\n"
+            f"            COMPREPLY=( $({command} --complete \"$prev\" \"$cur\" 2>/dev/null) )\n"
+            f"            return ;;\n"
+            f"        {paths})\n"
+            f"            COMPREPLY=( $(compgen -f -- \"$cur\") )\n"
+            f"            return ;;\n"
+            f"    esac\n"
+            f"    COMPREPLY=( $(compgen -W \"{words}\" -- \"$cur\") )\n"
+            f"}}\n"
+            f"complete -F _{command} {command}\n"
+        )
+
+
+    if shell == "zsh":
+        return (
+            f"#compdef {command}\n"
+            f"_{command}() {{\n"
+            f"    local previous=\"${{words[CURRENT-1]}}\"\n"
+            f"    case \"$previous\" in\n"
+            f"        {targets.replace(' ', '|')})\n"
+            f"            compadd -- ${{(f)\"$({command} --complete \"$previous\" \"${{words[CURRENT]}}\" 2>/dev/null)\"}}\n"
+            f"            return ;;\n"
+            f"        {paths})\n"
+            f"            _files\n"
+            f"            return ;;\n"
+            f"    esac\n"
+            f"    compadd -- {words}\n"
+            f"}}\n"
+            f"compdef _{command} {command}\n"
+        )
+
+
+    # ==> fish: ONE LINE PER OPTION, PACKAGE OPTIONS ASK PACTOOL FOR THEIR ARGUMENT
+    lines = [f"complete -c {command} -f"]
+    for option in sorted(options):
+        if not option.startswith("--"):
+            continue
+        description = (options[option] or "").replace("'", "\\'")
+        line = f"complete -c {command} -l {option[2:]} -d '{description}'"
+        if option in completionTargets:
+            line += f" -x -a '({command} --complete {option} (commandline -ct) 2>/dev/null)'"
+        elif option in pathOptions:
+            line += " -r -F"
+        lines.append(line)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,525 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from socket import socket, AF_UNIX, SOCK_STREAM
+from selectors import DefaultSelector, EVENT_READ
+from contextlib import redirect_stdout
+from io import StringIO
+from os import unlink, chmod, getpid, scandir
+from os.path import dirname, basename, join as pathJoin, isdir
+from time import monotonic
+from signal import signal, SIGTERM
+from json import dumps as jsonDumps, loads as jsonLoads
+
+
+# ==> PACTOOL FILES
+from core.cache import InventoryCache
+from core.formatter import Formatter
+from core.logger import logSuccess, logError
+
+
+
+
+##########################################################################
+#                                                                        #
+#                                PROTOCOL                                #
+#                                                                        #
+##########################################################################
+
+
+# ==> ONE JSON OBJECT PER LINE IN EACH DIRECTION, ONE REQUEST PER CONNECTION
+#
+#   -> {"query": "why", "args": {"packageName": "bash"}, "color": false, "columns": 120}
+#   <- {"ok": true, "output": "..."}
+#   <- {"ok": false, "error": "..."}
+#
+# "query" is one of the keys of PactoolDaemon.queries (the Packages method
+# it runs), or "ping" / "refresh". "args" are that method's keyword arguments.
+socketPath = InventoryCache.daemonSocket
+
+
+
+
+class DaemonClient:
+    """
+    Sends one query to a running daemon. Every failure (no socket, stale
+    socket, timeout, bad reply) returns None so the caller runs the query
+    itself.
+    """
+    def __init__(self, path=None, timeout: float = 30.0) -> None:
+        self.path = str(path or socketPath)
+        self.timeout = timeout
+
+
+
+
+
+    def request(self, query: str, args: dict = None, color: bool = False, columns: int = None):
+        try:
+            with socket(AF_UNIX, SOCK_STREAM) as connection:
+                connection.settimeout(self.timeout)
+                connection.connect(self.path)
+                message = {"query": query, "args": args or {}, "color": color, "columns": columns}
+                connection.sendall(jsonDumps(message).encode() + b"\n")
+
+
+                with connection.makefile("rb") as reader:
+                    reply = reader.readline()
+            return jsonLoads(reply) if reply else None
+        except (OSError, ValueError):
+            return None
+
+
+
+
+##########################################################################
+#                                                                        #
+#                                 DAEMON                                 #
+#                                                                        #
+##########################################################################
+
+
+class PactoolDaemon:
+    """
+    Keeps the package snapshot, dependency graph, search index and file
+    ownership index of one Main instance warm and answers read-only
+    queries over a Unix socket.
+    Package database changes are picked up through inotify (or by polling
+    the cache stamps and desc signatures where inotify is unavailable) and
+    trigger a refresh once the database has been quiet for a moment.
+    """
+    queries = {
+        "list": "list",
+        "stats": "stats",
+        "why": "why",
+        "search": "search",
+        "info": "info",
+        "files": "listFiles",
+        "owns": "owns",
+        "owns-glob": "ownsGlob",
+        "orphans": "orphanFiles",
+    }
+    watchedDirectories = {
+        "apt": ("/var/lib/dpkg", "/var/lib/dpkg/info", "/var/lib/apt", "/var/lib/apt/lists"),
+        "pacman": ("/var/lib/pacman/local", "/var/lib/pacman/sync"),
+    }
+
+    # ==> pacman -D REWRITES <name-version>/desc IN PLACE, WHICH A WATCH ON local/ ALONE NEVER SEES
+    packageDirectories = {
+        "pacman": "/var/lib/pacman/local",
+    }
+    settleSeconds = 1.0
+    pollSeconds = 5.0
+    requestSeconds = 5.0
+    requestBytes = 1 << 20
+
+
+
+
+    def __init__(self, Pactool=None, path=None) -> None:
+        self.pactool = Pactool
+        self.path = str(path or socketPath)
+        self.watcher = None
+        self.dirtySince = None
+        self.changed = set()
+        self.selector = None
+        self.pending = {}
+        self.polling = False
+        self._nextPoll = 0.0
+        self._stamps = None
+
+
+
+
+
+    ##########################################################################
+    #                              LIFECYCLE                                 #
+    ##########################################################################
+
+    def serve(self) -> None:
+        # ==> RENDER WITH COLORS, CLIENTS THAT DO NOT WANT THEM GET THEM STRIPPED
+        Formatter.enableColors()
+        server = self._listen()
+        if server is None:
+            logError(f"Another Pactool daemon is already listening on {self.path}")
+            return
+
+
+        self.pactool.packages.interactive = False
+        self.warm()
+        selector = self.selector = DefaultSelector()
+        selector.register(server, EVENT_READ, self._accept)
+
+
+        # ==> ctypes IS ONLY LOADED BY THE DAEMON ITSELF, NEVER BY CLIENTS
+        from core.inotify import InotifyWatcher
+        self.watcher = InotifyWatcher()
+        manager = self.pactool.manager.defaultPackageManager
+        watching = [directory for directory in self.watchedDirectories.get(manager, ()) if self.watcher.watch(directory)]
+        if watching:
+            selector.register(self.watcher, EVENT_READ, self._onChange)
+
+
+        # ==> WITHOUT inotify, OR OUT OF WATCHES FOR THE PACKAGE DIRECTORIES, CHECK STAMPS AND SIGNATURES INSTEAD
+        self.polling = not watching or not self._watchPackageDirectories()
+        if self.polling:
+            self._stamps = self._currentStamps()
+            self._nextPoll = monotonic() + self.pollSeconds
+
+
+        # ==> systemctl stop / kill: LEAVE THROUGH THE SAME CLEANUP AS CTRL+C
+        signal(SIGTERM, self._onTerminate)
+        logSuccess(f"Pactool daemon listening on {self.path} (pid {getpid()})")
+
+
+        try:
+            while True:
+                for key, _ in selector.select(self._timeout()):
+                    key.data(key.fileobj)
+                self._dropStale()
+                if self.polling and monotonic() >= self._nextPoll:
+                    self._poll()
+                self._refreshIfSettled()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for connection in list(self.pending):
+                self._finish(connection)
+            selector.close()
+            server.close()
+            self.watcher.close()
+            try:
+                unlink(self.path)
+            except OSError:
+                pass
+
+
+
+
+
+    def _onTerminate(self, signum, frame) -> None:
+        raise KeyboardInterrupt
+
+
+
+
+
+    def _listen(self):
+        InventoryCache.cacheDir.mkdir(parents=True, exist_ok=True)
+
+
+        # ==> A SOCKET NOBODY ANSWERS ON IS LEFT OVER FROM A CRASHED DAEMON
+        if DaemonClient(self.path, timeout=1.0).request("ping") is not None:
+            return None
+        try:
+            unlink(self.path)
+        except OSError:
+            pass
+
+
+        server = socket(AF_UNIX, SOCK_STREAM)
+        server.bind(self.path)
+        chmod(self.path, 0o600)
+        server.listen(16)
+        server.setblocking(False)
+        return server
+
+
+
+
+
+    def warm(self) -> None:
+        # ==> BUILD EVERYTHING A QUERY MIGHT NEED BEFORE THE FIRST ONE ARRIVES
+        try:
+            snapshot = self.pactool.snapshot
+            snapshot.packages()
+            snapshot.userPackages()
+            snapshot.dependencyGraph()
+            self.pactool.packages._searchIndex().load()
+            self.pactool.packages._ownershipIndex().load()
+        except Exception as error:
+            logError(f"Daemon warm-up failed ({error})")
+
+
+
+
+
+    def refresh(self) -> None:
+        # ==> ONLY THE PACKAGES INOTIFY NAMED ARE RE-READ (None: CHECK THEM ALL)
+        self.pactool.snapshot.invalidate(changed=self.changed)
+        self.pactool.packages.searchIndex = None
+        self.pactool.packages.ownershipIndex = None
+        self.dirtySince = None
+        self.changed = set()
+        self.warm()
+
+
+
+
+
+    ##########################################################################
+    #                            CHANGE TRACKING                             #
+    ##########################################################################
+
+    def _timeout(self):
+        # ==> WAKE FOR WHICHEVER COMES FIRST: SETTLED CHANGES, A STALLED CLIENT OR THE NEXT POLL
+        deadlines = [deadline for _, deadline in self.pending.values()]
+        if self.dirtySince is not None:
+            deadlines.append(self.dirtySince + self.settleSeconds)
+        if self.polling:
+            deadlines.append(self._nextPoll)
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - monotonic())
+
+
+
+
+
+    def _watchPackageDirectories(self) -> bool:
+        # ==> ONE WATCH PER INSTALLED PACKAGE; False WHEN THE KERNEL RAN OUT OF THEM
+        parent = self.packageDirectories.get(self.pactool.manager.defaultPackageManager)
+        if parent is None:
+            return True
+
+
+        try:
+            with scandir(parent) as entries:
+                directories = [entry.path for entry in entries if entry.is_dir()]
+        except OSError:
+            return True
+        return all([self.watcher.watch(directory) for directory in directories])
+
+
+
+
+
+    def _onChange(self, watcher) -> None:
+        events = watcher.read()
+        if not events:
+            return
+
+
+        # ==> EVERY EVENT RESTARTS THE QUIET PERIOD (dpkg REWRITES status MANY TIMES PER UPGRADE)
+        self.dirtySince = monotonic()
+        packageDirectory = self.packageDirectories.get(self.pactool.manager.defaultPackageManager)
+        for directory, name, _ in events:
+            if directory is None:
+                # ==> QUEUE OVERFLOW: WHAT CHANGED IS UNKNOWN
+                self.changed = None
+                continue
+
+
+            # ==> A NEW PACKAGE DIRECTORY GETS ITS OWN WATCH (REMOVED ONES DROP THEIRS)
+            if directory == packageDirectory and not self.polling:
+                path = pathJoin(directory, name)
+                if not self.watcher.watch(path) and isdir(path):
+                    self.polling = True
+                    self._stamps = self._currentStamps()
+                    self._nextPoll = monotonic()
+
+
+            if self.changed is None:
+                continue
+            elif directory == packageDirectory:
+                self.changed.add(name)
+            elif dirname(directory) == packageDirectory:
+                self.changed.add(basename(directory))
+            elif directory == "/var/lib/dpkg/info" and name.endswith(".list"):
+                self.changed.add(name[:-len(".list")])
+
+
+
+
+
+    def _currentStamps(self) -> tuple:
+        searchIndex = self.pactool.packages._searchIndex()
+        ownershipIndex = self.pactool.packages._ownershipIndex()
+        return (self.pactool.cache.stamp(), searchIndex.stamp(), ownershipIndex.stamp())
+
+
+
+
+
+    def _poll(self) -> None:
+        self._nextPoll = monotonic() + self.pollSeconds
+        stamps = self._currentStamps()
+        if stamps != self._stamps:
+            self._stamps = stamps
+            self.dirtySince = monotonic()
+            self.changed = None
+            return
+
+
+        # ==> IN-PLACE desc REWRITES (pacman -D) LEAVE THE STAMPS ALONE
+        if self.pactool.manager.defaultPackageManager in self.packageDirectories:
+            changed = self.pactool.snapshot.inventory().changedEntries()
+            if changed:
+                self.dirtySince = monotonic()
+                if self.changed is not None:
+                    self.changed |= changed
+
+
+
+
+
+    def _refreshIfSettled(self) -> None:
+        if self.dirtySince is not None and monotonic() - self.dirtySince >= self.settleSeconds:
+            self.refresh()
+
+
+
+
+
+    ##########################################################################
+    #                                QUERIES                                 #
+    ##########################################################################
+
+    def _accept(self, server) -> None:
+        # ==> NEVER BLOCK ON ONE CLIENT: ITS REQUEST IS COLLECTED AS IT ARRIVES
+        try:
+            connection, _ = server.accept()
+        except BlockingIOError:
+            return
+        connection.setblocking(False)
+        self.pending[connection] = (bytearray(), monotonic() + self.requestSeconds)
+        self.selector.register(connection, EVENT_READ, self._read)
+
+
+
+
+
+    def _read(self, connection) -> None:
+        buffer, _ = self.pending[connection]
+        try:
+            data = connection.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            # ==> THE CLIENT HUNG UP BEFORE FINISHING ITS REQUEST
+            self._finish(connection)
+            return
+
+
+        buffer += data
+        if b"\n" not in buffer:
+            if len(buffer) > self.requestBytes:
+                self._finish(connection, {"ok": False, "error": "bad request (too large)"})
+            return
+
+
+        try:
+            reply = self.handle(jsonLoads(buffer.partition(b"\n")[0]))
+        except ValueError as error:
+            reply = {"ok": False, "error": f"bad request ({error})"}
+        self._finish(connection, reply)
+
+
+
+
+
+    def _dropStale(self) -> None:
+        now = monotonic()
+        for connection, (_, deadline) in list(self.pending.items()):
+            if now >= deadline:
+                self._finish(connection, {"ok": False, "error": "bad request (timed out)"})
+
+
+
+
+
+    def _finish(self, connection, reply: dict = None) -> None:
+        self.selector.unregister(connection)
+        del self.pending[connection]
+
+
+        with connection:
+            if reply is None:
+                return
+            try:
+                # ==> REPLIES ARE SMALL, A CLIENT THAT STOPS READING STILL ONLY COSTS requestSeconds
+                connection.settimeout(self.requestSeconds)
+                connection.sendall(jsonDumps(reply).encode() + b"\n")
+            except OSError:
+                pass
+
+
+
+
+
+    def handle(self, request: dict) -> dict:
+        query = request.get("query")
+
+
+        if query == "ping":
+            return {"ok": True, "pid": getpid(), "manager": self.pactool.manager.defaultPackageManager}
+        if query == "refresh":
+            self.refresh()
+            return {"ok": True}
+
+
+        if query not in self.queries:
+            return {"ok": False, "error": f"unknown query '{query}'"}
+
+
+        # ==> A PENDING CHANGE IS APPLIED BEFORE ANSWERING, NEVER AFTER
+        if self.dirtySince is not None:
+            self.refresh()
+
+
+        # ==> LAY OUT FOR THE CLIENT'S TERMINAL, NOT THE DAEMON'S
+        packages = self.pactool.packages
+        packages.columns = request.get("columns") or None
+
+
+        output = StringIO()
+        try:
+            with redirect_stdout(output):
+                getattr(packages, self.queries[query])(**request.get("args", {}))
+        except Exception as error:
+            return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+        finally:
+            packages.columns = None
+
+
+        text = output.getvalue()
+        return {"ok": True, "output": text if request.get("color") else Formatter.stripColors(text)}
@@ -0,0 +1,513 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from os import scandir, access, cpu_count, R_OK
+from os.path import join as pathJoin
+from concurrent.futures import ThreadPoolExecutor
+from re import compile as reCompile
+
+
+# ==> PACTOOL FILES
+from core.record import PackageRecord
+
+
+
+
+##########################################################################
+#                                                                        #
+#                            DPKG DATABASE                               #
+#                                                                        #
+##########################################################################
+
+
+class DpkgDatabase:
+    """
+    Reads the dpkg database straight from disk instead of spawning
+    dpkg-query and stat()-ing every .list file twice.
+    """
+    statusPath = "/var/lib/dpkg/status"
+    infoDir = "/var/lib/dpkg/info"
+    recordFields = {"Installed-Size", "Architecture", "Section"}
+    dependencyFields = {"Depends", "Pre-Depends", "Recommends", "Suggests", "Provides"}
+
+    # ==> FULLY UNPACKED AND CONFIGURED; rc (config-files) AND half-* ENTRIES DEPEND ON NOTHING
+    configuredStates = ("install ok installed", "hold ok installed")
+
+
+
+
+    def __init__(self, root: str = "/") -> None:
+        # ==> ALLOW AN ALTERNATIVE ROOT (CHROOTS, FIXTURES)
+        self.statusPath = pathJoin(root, self.statusPath.lstrip("/"))
+        self.infoDir = pathJoin(root, self.infoDir.lstrip("/"))
+
+
+
+
+
+    def available(self) -> bool:
+        return access(self.statusPath, R_OK)
+
+
+
+
+
+    def readStatus(self, fields: set = None):
+        """
+        Stream the status file one stanza at a time.
+        Only top-level fields are kept (optionally just the requested ones),
+        continuation lines are skipped.
+        """
+        return self.readStanzas(self.statusPath, fields)
+
+
+
+
+
+    @staticmethod
+    def readStanzas(path: str, fields: set = None):
+        # ==> SAME DEB822 FORMAT AS THE apt LISTS (/var/lib/apt/lists/*_Packages)
+        stanza = {}
+
+
+        with open(path, "r", encoding="utf-8", errors="replace") as statusFile:
+            for line in statusFile:
+                # ==> BLANK LINE CLOSES THE CURRENT STANZA
+                if line == "\n":
+                    if stanza:
+                        yield stanza
+                        stanza = {}
+                    continue
+
+
+                # ==> SKIP MULTI-LINE CONTINUATIONS (DESCRIPTIONS, CONFFILES)
+                if line[0] in " \t":
+                    continue
+
+
+                key, sep, value = line.partition(":")
+                if sep and (fields is None or key in fields):
+                    stanza[key] = value.strip()
+
+
+        if stanza:
+            yield stanza
+
+
+
+
+
+    def scanListTimes(self) -> dict:
+        """
+        Collect (ctime, mtime) for every .list file in a single directory sweep.
+        """
+        times = {}
+
+
+        try:
+            with scandir(self.infoDir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not name.endswith(".list"):
+                        continue
+
+
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    times[name[:-5]] = (st.st_ctime, st.st_mtime)
+
+
+        except FileNotFoundError:
+            pass
+
+
+        return times
+
+
+
+
+
+    def installedPackages(self, fields: set = None):
+        # ==> SAME SELECTION AS dpkg-query -W (EVERYTHING BUT PURGED ENTRIES)
+        if fields is not None:
+            fields = fields | {"Package", "Status"}
+
+
+        for stanza in self.readStatus(fields):
+            if "Package" not in stanza:
+                continue
+            if stanza.get("Status", "").endswith("not-installed"):
+                continue
+            yield stanza
+
+
+
+
+
+    def configuredPackages(self, fields: set = None):
+        """
+        Only the packages that are really installed, for the dependency table
+        and graph: an rc package's old Depends must not keep anything alive.
+        """
+        for stanza in self.installedPackages(fields):
+            if stanza.get("Status", "") in self.configuredStates:
+                yield stanza
+
+
+
+
+
+    def collect(self) -> list:
+        """
+        Build the same package records as Packages.collectAptPackages.
+        """
+        return list(self.iterRecords())
+
+
+
+
+
+    def iterRecords(self):
+        listTimes = self.scanListTimes()
+
+
+        for stanza in self.installedPackages(self.recordFields):
+            record = self.recordFor(stanza, listTimes)
+            if record is not None:
+                yield record
+
+
+
+
+
+    @staticmethod
+    def recordFor(stanza: dict, listTimes: dict):
+        """
+        PackageRecord for one status stanza, or None for entries dpkg-query -W
+        would not list with a size (purged, half-removed).
+        """
+        sizeKb = stanza.get("Installed-Size", "")
+        if "Package" not in stanza or not sizeKb.isdigit() or stanza.get("Status", "").endswith("not-installed"):
+            return None
+
+
+        # ==> MULTI-ARCH: SAME PACKAGES KEEP THEIR LIST AS name:arch.list
+        packageName = stanza["Package"]
+        times = listTimes.get(packageName) or listTimes.get(f"{packageName}:{stanza.get('Architecture', '')}")
+
+
+        installedTs, updatedTs = times or (0.0, 0.0)
+        return PackageRecord(packageName, int(sizeKb) * 1024, installedTs, updatedTs, stanza.get("Section", ""))
+
+
+
+
+
+    @staticmethod
+    def parseStanza(text: str, fields: set = None) -> dict:
+        # ==> ONE STANZA ALREADY IN MEMORY, SAME RULES AS readStanzas
+        stanza = {}
+        for line in text.split("\n"):
+            if not line or line[0] in " \t":
+                continue
+            key, sep, value = line.partition(":")
+            if sep and (fields is None or key in fields):
+                stanza[key] = value.strip()
+        return stanza
+
+
+
+
+
+    def dependencyTable(self) -> list:
+        """
+        (name, provides, depends, optional) for every configured package.
+        depends/optional are lists of alternative groups ("a | b" -> ["a", "b"]).
+        """
+        table = []
+
+
+        for stanza in self.configuredPackages(self.dependencyFields):
+            table.append((
+                stanza["Package"],
+                [group[0] for group in self.parseRelations(stanza.get("Provides", ""))],
+                self.parseRelations(stanza.get("Pre-Depends", "")) + self.parseRelations(stanza.get("Depends", "")),
+                self.parseRelations(stanza.get("Recommends", "")) + self.parseRelations(stanza.get("Suggests", ""))
+            ))
+
+
+        return table
+
+
+
+
+
+    def essentialPackages(self) -> set:
+        # ==> apt NEVER AUTO-REMOVES THESE, SO THEY ARE ROOTS LIKE MANUAL PACKAGES
+        return {
+            stanza["Package"] for stanza in self.configuredPackages({"Essential", "Priority"})
+            if stanza.get("Essential") == "yes" or stanza.get("Priority") in ("required", "important")
+        }
+
+
+
+
+
+    @classmethod
+    def parseRelations(cls, value: str) -> list:
+        # ==> "libc6 (>= 2.34), awk | mawk:any" -> [["libc6"], ["awk", "mawk"]]
+        groups = []
+        for group in value.split(","):
+            alternatives = [alt.split("(", 1)[0].split("[", 1)[0].strip().split(":", 1)[0] for alt in group.split("|")]
+            alternatives = [alt for alt in alternatives if alt]
+            if alternatives:
+                groups.append(alternatives)
+        return groups
+
+
+
+
+
+
+##########################################################################
+#                                                                        #
+#                           PACMAN DATABASE                              #
+#                                                                        #
+##########################################################################
+
+
+class PacmanDatabase:
+    """
+    Reads pacman's local database (/var/lib/pacman/local/*/desc) directly.
+    The desc files already hold sizes in bytes and dates as epochs, so no
+    pacman -Qi output, locale handling or date parsing is involved.
+    """
+    localDir = "/var/lib/pacman/local"
+    listFields = ("%DEPENDS%", "%OPTDEPENDS%", "%PROVIDES%", "%GROUPS%")
+    batchSize = 256
+    versionConstraint = reCompile(r"[<>=]")
+
+
+
+
+    def __init__(self, root: str = "/", workers: int = None) -> None:
+        self.localDir = pathJoin(root, self.localDir.lstrip("/"))
+        self.workers = workers if workers is not None else min(8, cpu_count() or 1)
+        self._entries = None
+
+
+
+
+
+    def available(self) -> bool:
+        return access(self.localDir, R_OK)
+
+
+
+
+
+    def _entryPaths(self) -> list:
+        # ==> ONE DIRECTORY PER INSTALLED PACKAGE (name-version-release)
+        paths = []
+        with scandir(self.localDir) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    paths.append(pathJoin(entry.path, "desc"))
+        return sorted(paths)
+
+
+
+
+
+    def _readBatch(self, paths: list) -> list:
+        contents = []
+        for path in paths:
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as descFile:
+                    contents.append(descFile.read())
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        return contents
+
+
+
+
+
+    def parseDesc(self, text: str) -> dict:
+        """
+        Parse one desc file into a dict. Single-value sections become strings,
+        list sections (DEPENDS, PROVIDES, ...) become lists.
+        """
+        entry = {}
+        section = None
+        values = []
+
+
+        for line in text.split("\n"):
+            if not line:
+                if section:
+                    entry[section] = values if section in self.listFields else (values[0] if values else "")
+                section = None
+                values = []
+            elif section is None and line[0] == "%" and line[-1] == "%":
+                section = line
+            elif section:
+                values.append(line)
+
+
+        if section:
+            entry[section] = values if section in self.listFields else (values[0] if values else "")
+
+
+        return entry if "%NAME%" in entry else None
+
+
+
+
+
+    def entries(self) -> list:
+        """
+        Parsed desc entries for every installed package, read once per instance.
+        """
+        if self._entries is not None:
+            return self._entries
+
+
+        paths = self._entryPaths()
+        batches = [paths[i:i + self.batchSize] for i in range(0, len(paths), self.batchSize)]
+
+
+        # ==> FILE READS RELEASE THE GIL, SO BATCHES CAN OVERLAP THEIR I/O
+        if self.workers > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                contents = [text for batch in pool.map(self._readBatch, batches) for text in batch]
+        else:
+            contents = [text for batch in batches for text in self._readBatch(batch)]
+
+
+        self._entries = [entry for entry in map(self.parseDesc, contents) if entry]
+        return self._entries
+
+
+
+
+
+    def collect(self) -> list:
+        """
+        Build the same package records as Packages.collectPacmanPackages.
+        """
+        return list(self.iterRecords())
+
+
+
+
+
+    def iterRecords(self):
+        for entry in self.entries():
+            yield self.recordFor(entry)
+
+
+
+
+
+    @staticmethod
+    def recordFor(entry: dict) -> PackageRecord:
+        sizeBytes = entry.get("%SIZE%", "0")
+        installDate = entry.get("%INSTALLDATE%", "")
+        installedTs = float(installDate) if installDate.isdigit() else 0.0
+
+
+        return PackageRecord(
+            entry["%NAME%"],
+            int(sizeBytes) if sizeBytes.isdigit() else 0,
+            installedTs,
+            installedTs,
+            (entry.get("%GROUPS%") or [""])[0]
+        )
+
+
+
+
+
+    @staticmethod
+    def isExplicit(entry: dict) -> bool:
+        # ==> %REASON% 1 MEANS "INSTALLED AS A DEPENDENCY", ABSENT OR 0 MEANS EXPLICIT
+        return entry.get("%REASON%", "0") != "1"
+
+
+
+
+
+    def explicitPackages(self) -> set:
+        return {entry["%NAME%"] for entry in self.entries() if self.isExplicit(entry)}
+
+
+
+
+
+    def dependencyTable(self) -> list:
+        """
+        (name, provides, depends, optional) for every installed package,
+        in the same shape as DpkgDatabase.dependencyTable.
+        """
+        table = []
+
+
+        for entry in self.entries():
+            table.append((
+                entry["%NAME%"],
+                [self.stripConstraint(provided) for provided in entry.get("%PROVIDES%", [])],
+                [[self.stripConstraint(dep)] for dep in entry.get("%DEPENDS%", [])],
+                # ==> OPTDEPENDS LINES LOOK LIKE "python: for the python bindings"
+                [[self.stripConstraint(opt.split(":", 1)[0])] for opt in entry.get("%OPTDEPENDS%", [])]
+            ))
+
+
+        return table
+
+
+
+
+
+    @classmethod
+    def stripConstraint(cls, dep: str) -> str:
+        # ==> "glibc>=2.38" -> "glibc", "libfoo.so=1-64" -> "libfoo.so"
+        return cls.versionConstraint.split(dep, 1)[0].strip()
@@ -0,0 +1,177 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from functools import partial
+from os import cpu_count
+
+
+# ==> PACTOOL FILES
+from core.process import run
+
+
+
+
+##########################################################################
+#                                                                        #
+#                           PARALLEL EXECUTOR                            #
+#                                                                        #
+##########################################################################
+
+
+class ParallelExecutor:
+    """
+    Bounded worker pool for fanning out subprocess calls (or any callable).
+    Results always come back in input order, and Ctrl-C cancels every
+    call that has not started yet.
+    """
+    maxWorkers = 16
+    chunkSize = 200
+
+
+
+
+    def __init__(self, workers: int = None) -> None:
+        self.workers = workers or min(self.maxWorkers, (cpu_count() or 1) * 2)
+        self.cancelled = Event()
+
+
+
+
+
+    ##########################################################################
+    #                                 MAP                                    #
+    ##########################################################################
+
+
+    def map(self, func, items) -> list:
+        """
+        Call func on every item with at most self.workers in flight and
+        return the results in the same order as items.
+        """
+        items = list(items)
+        if not items:
+            return []
+
+
+        # ==> NO POOL FOR A SINGLE ITEM OR A SINGLE WORKER
+        if len(items) == 1 or self.workers <= 1:
+            return [func(item) for item in items]
+
+
+        pool = ThreadPoolExecutor(max_workers=min(self.workers, len(items)))
+        self.cancelled.clear()
+        futures = []
+
+
+        try:
+            for item in items:
+                futures.append(pool.submit(self._guard, func, item))
+            results = [future.result() for future in futures]
+
+
+        except BaseException:
+            # ==> CTRL-C OR A FAILING func: DROP QUEUED WORK, RUNNING CHILDREN GET THE SAME SIGINT
+            self.cancelled.set()
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False)
+            raise
+
+
+        pool.shutdown(wait=True)
+        return results
+
+
+
+
+
+    def _guard(self, func, item):
+        # ==> SKIP ITEMS THAT WERE ALREADY PICKED UP WHEN CTRL-C ARRIVED
+        if self.cancelled.is_set():
+            return None
+        return func(item)
+
+
+
+
+
+    ##########################################################################
+    #                               COMMANDS                                 #
+    ##########################################################################
+
+
+    def runAll(self, commands: list, **kwargs) -> list:
+        """
+        Run every command (argument list) through core.process.run and
+        return the CompletedProcess objects in order.
+        """
+        kwargs.setdefault("capture_output", True)
+        kwargs.setdefault("text", True)
+        kwargs.setdefault("check", False)
+        return self.map(partial(run, **kwargs), commands)
+
+
+
+
+
+    def runBatched(self, command: list, arguments: list, chunkSize: int = None, **kwargs) -> list:
+        """
+        Run "command arg1 arg2 ..." in chunks of chunkSize arguments, for tools
+        that accept many package names at once. Chunks run in parallel and
+        their results come back in order.
+        """
+        arguments = list(arguments)
+
+
+        # ==> BY DEFAULT SPLIT EVENLY ACROSS THE WORKERS, CAPPED AT self.chunkSize
+        if not chunkSize:
+            chunkSize = min(self.chunkSize, -(-len(arguments) // self.workers))
+        chunks = self.chunks(arguments, chunkSize)
+        return self.runAll([list(command) + chunk for chunk in chunks], **kwargs)
+
+
+
+
+
+    @classmethod
+    def chunks(cls, items: list, size: int) -> list:
+        items = list(items)
+        return [items[i:i + size] for i in range(0, len(items), max(1, size))]
@@ -0,0 +1,194 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from json import dumps as jsonDumps
+import sys
+
+
+
+
+##########################################################################
+#                                                                        #
+#                             RECORD WRITER                              #
+#                                                                        #
+##########################################################################
+
+
+class RecordWriter:
+    """
+    Streams records (dicts) as JSON, NDJSON or TSV for --format.
+    Records are pulled from any iterable one at a time, encoded without
+    colors and written through a single buffer in large chunks.
+    """
+    formats = ("json", "ndjson", "tsv")
+    bufferSize = 1 << 16
+
+
+
+
+    def __init__(self, outputFormat: str, stream=None) -> None:
+        self.outputFormat = outputFormat
+        self.stream = stream or sys.stdout
+        self._parts = []
+        self._pending = 0
+
+
+
+
+
+    ##########################################################################
+    #                                BUFFER                                  #
+    ##########################################################################
+
+
+    def _write(self, text: str) -> None:
+        self._parts.append(text)
+        self._pending += len(text)
+        if self._pending >= self.bufferSize:
+            self.flush()
+
+
+
+
+
+    def flush(self) -> None:
+        if self._parts:
+            self.stream.write("".join(self._parts))
+            self._parts = []
+            self._pending = 0
+        self.stream.flush()
+
+
+
+
+
+    ##########################################################################
+    #                                RECORDS                                 #
+    ##########################################################################
+
+
+    def writeRecords(self, records) -> int:
+        """
+        Write a stream of flat records. json emits one array, ndjson one object
+        per line and tsv a header row followed by one row per record.
+        """
+        count = 0
+        columns = None
+
+
+        if self.outputFormat == "json":
+            self._write("[")
+
+
+        for record in records:
+            if self.outputFormat == "json":
+                self._write(("," if count else "") + "\n  " + jsonDumps(record))
+            elif self.outputFormat == "ndjson":
+                self._write(jsonDumps(record) + "\n")
+            else:
+                # ==> THE FIRST RECORD FIXES THE COLUMNS
+                if columns is None:
+                    columns = list(record)
+                    self._write("\t".join(columns) + "\n")
+                self._write("\t".join(self.tsvValue(record.get(column)) for column in columns) + "\n")
+            count += 1
+
+
+        if self.outputFormat == "json":
+            self._write("\n]\n" if count else "]\n")
+
+
+        self.flush()
+        return count
+
+
+
+
+
+    def writeObject(self, obj: dict) -> None:
+        """
+        Write one (possibly nested) object, e.g. the --stats summary.
+        tsv flattens it into "key<TAB>value" rows with dotted keys.
+        """
+        if self.outputFormat == "json":
+            self._write(jsonDumps(obj, indent=2) + "\n")
+        elif self.outputFormat == "ndjson":
+            self._write(jsonDumps(obj) + "\n")
+        else:
+            self._write("key\tvalue\n")
+            for key, value in self.flatten(obj):
+                self._write(f"{key}\t{self.tsvValue(value)}\n")
+        self.flush()
+
+
+
+
+
+    ##########################################################################
+    #                                HELPERS                                 #
+    ##########################################################################
+
+
+    @classmethod
+    def flatten(cls, value, prefix: str = ""):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                yield from cls.flatten(item, f"{prefix}.{key}" if prefix else str(key))
+        elif isinstance(value, (list, tuple)) and any(isinstance(item, (dict, list, tuple)) for item in value):
+            for index, item in enumerate(value):
+                yield from cls.flatten(item, f"{prefix}.{index}")
+        else:
+            yield prefix, value
+
+
+
+
+
+    @classmethod
+    def tsvValue(cls, value) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, (list, tuple)):
+            value = ",".join(str(item) for item in value)
+
+
+        # ==> KEEP ONE RECORD PER LINE
+        return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
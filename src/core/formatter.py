@@ -38,6 +38,7 @@
 ##########################################################################
 from datetime import datetime
 from re import sub as reSub
+from os import environ
 
 
 
@@ -90,6 +91,8 @@ class Formatter:
     sizeColor = f"{bold}{green}"
     dateColor = f"{bold}{yellow}"
     headerColor = f"{bold}{brightYellow}"
+    colorsEnabled = True
+    _disabledCodes = {}
 
 
 
@@ -115,6 +118,26 @@ class Formatter:
 
 
 
+    @classmethod
+    def parseSize(cls, sizeStr: str) -> int:
+        """
+        Inverse of formatSize: "1.50 MiB" -> 1572864. Unknown input gives 0.
+        """
+        units = {"B": 1, "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3, "TiB": 1024 ** 4}
+        parts = sizeStr.split()
+
+
+        try:
+            value = float(parts[0].replace(",", "."))
+            return int(value * units.get(parts[1] if len(parts) > 1 else "B", 1))
+        except (IndexError, ValueError):
+            return 0
+
+
+
+
+
+
     @classmethod
     def colorText(cls, text: str, color: str = "", style: str = "") -> str:
         """
@@ -122,7 +145,55 @@ class Formatter:
         Example:
             Formatter.colorText("Hello", Formatter.red, Formatter.bold)
         """
+        if not cls.colorsEnabled:
+            return text
         return f"{style}{color}{text}{cls.reset}"
+
+
+
+
+
+
+    @classmethod
+    def configureColors(cls, stream) -> None:
+        # ==> NO ESCAPE CODES WHEN OUTPUT IS PIPED/REDIRECTED OR NO_COLOR IS SET
+        isTerminal = hasattr(stream, "isatty") and stream.isatty()
+        if not isTerminal or environ.get("NO_COLOR"):
+            cls.disableColors()
+
+
+
+
+
+
+    @classmethod
+    def disableColors(cls) -> None:
+        # ==> BLANK EVERY CODE SO INLINE f"{Formatter.bold}..." USES BECOME NO-OPS TOO
+        for name, value in list(vars(cls).items()):
+            if isinstance(value, str) and value.startswith("\033["):
+                cls._disabledCodes[name] = value
+                setattr(cls, name, "")
+        cls.colorsEnabled = False
+
+
+
+
+
+    @classmethod
+    def enableColors(cls) -> None:
+        # ==> UNDO disableColors (THE DAEMON RENDERS IN COLOR, WHATEVER IT WAS STARTED FROM)
+        for name, value in cls._disabledCodes.items():
+            setattr(cls, name, value)
+        cls._disabledCodes.clear()
+        cls.colorsEnabled = True
+
+
+
+
+
+    @classmethod
+    def stripColors(cls, text: str) -> str:
+        return reSub(r"\033\[[0-9;]*m", "", text)
     
     
     
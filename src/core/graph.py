@@ -0,0 +1,522 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from array import array
+from collections import deque
+
+
+
+
+##########################################################################
+#                                                                        #
+#                           DEPENDENCY GRAPH                             #
+#                                                                        #
+##########################################################################
+
+
+class DependencyGraph:
+    """
+    Installed-package dependency graph with integer node IDs and CSR
+    (offsets + targets) adjacency for hard and optional dependencies,
+    forward and reverse. Every query is linear in the part of the graph
+    it touches.
+    """
+
+
+
+
+    def __init__(self, names: list, forward: tuple, optional: tuple, explicit: bytes) -> None:
+        self.names = list(names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.explicit = bytearray(explicit)
+
+
+        # ==> (offsets, targets): THE NEIGHBOURS OF n ARE targets[offsets[n]:offsets[n + 1]]
+        self.forward = forward
+        self.optional = optional
+        self.reverse = self._transpose(forward)
+        self.optionalReverse = self._transpose(optional)
+
+
+
+
+
+    ##########################################################################
+    #                              CONSTRUCTION                              #
+    ##########################################################################
+
+
+    @classmethod
+    def fromTable(cls, table: list, explicitPackages: set) -> "DependencyGraph":
+        """
+        Build the graph from (name, provides, depends, optional) rows as returned
+        by DpkgDatabase/PacmanDatabase.dependencyTable(). A dependency on a
+        virtual name links to every installed provider, and an alternative
+        group ("a | b") links to every installed alternative.
+        """
+        names = [row[0] for row in table]
+        ids = {name: i for i, name in enumerate(names)}
+
+
+        # ==> REAL NAMES AND PROVIDED (VIRTUAL) NAMES BOTH RESOLVE TO NODE IDS
+        providers = {name: [i] for name, i in ids.items()}
+        for name, provides, _, _ in table:
+            for provided in provides:
+                if provided != name:
+                    providers.setdefault(provided, []).append(ids[name])
+
+
+        def resolve(groups, node):
+            targets = []
+            for group in groups:
+                for alternative in group:
+                    for target in providers.get(alternative, ()):
+                        if target != node and target not in targets:
+                            targets.append(target)
+            return targets
+
+
+        forward = [resolve(row[2], i) for i, row in enumerate(table)]
+        optional = [resolve(row[3], i) for i, row in enumerate(table)]
+        explicit = bytes(1 if name in explicitPackages else 0 for name in names)
+        return cls(names, cls._compress(forward), cls._compress(optional), explicit)
+
+
+
+
+
+    @classmethod
+    def _compress(cls, adjacency: list) -> tuple:
+        offsets = array("i", [0])
+        targets = array("i")
+        for neighbours in adjacency:
+            targets.extend(neighbours)
+            offsets.append(len(targets))
+        return offsets, targets
+
+
+
+
+
+    @classmethod
+    def _transpose(cls, csr: tuple) -> tuple:
+        # ==> COUNTING SORT OF THE EDGES BY TARGET, O(V + E)
+        offsets, targets = csr
+        count = len(offsets) - 1
+        reverseOffsets = array("i", bytes(4 * (count + 1)))
+
+
+        for target in targets:
+            reverseOffsets[target + 1] += 1
+        for i in range(count):
+            reverseOffsets[i + 1] += reverseOffsets[i]
+
+
+        cursor = array("i", reverseOffsets)
+        reverseTargets = array("i", bytes(4 * len(targets)))
+        for source in range(count):
+            for k in range(offsets[source], offsets[source + 1]):
+                target = targets[k]
+                reverseTargets[cursor[target]] = source
+                cursor[target] += 1
+
+
+        return reverseOffsets, reverseTargets
+
+
+
+
+
+    def toState(self) -> tuple:
+        """
+        Marshal-friendly form for the inventory cache (reverse edges are rebuilt on load).
+        """
+        return (
+            self.names,
+            self.forward[0].tobytes(), self.forward[1].tobytes(),
+            self.optional[0].tobytes(), self.optional[1].tobytes(),
+            bytes(self.explicit)
+        )
+
+
+
+
+
+    @classmethod
+    def fromState(cls, state: tuple) -> "DependencyGraph":
+        names, forwardOffsets, forwardTargets, optionalOffsets, optionalTargets, explicit = state
+        return cls(
+            names,
+            (array("i", forwardOffsets), array("i", forwardTargets)),
+            (array("i", optionalOffsets), array("i", optionalTargets)),
+            explicit
+        )
+
+
+
+
+
+    ##########################################################################
+    #                               NEIGHBOURS                               #
+    ##########################################################################
+
+
+    def _neighbours(self, csr: tuple, node: int):
+        offsets, targets = csr
+        return targets[offsets[node]:offsets[node + 1]]
+
+
+
+
+
+    def _lookup(self, csr: tuple, name: str) -> list:
+        node = self.ids.get(name)
+        if node is None:
+            return []
+        return [self.names[target] for target in self._neighbours(csr, node)]
+
+
+
+
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+
+
+
+
+    def dependencies(self, name: str) -> list:
+        return self._lookup(self.forward, name)
+
+
+
+
+
+    def dependents(self, name: str) -> list:
+        return self._lookup(self.reverse, name)
+
+
+
+
+
+    def optionalDependents(self, name: str) -> list:
+        return self._lookup(self.optionalReverse, name)
+
+
+
+
+
+    def markExplicit(self, explicitPackages: set) -> None:
+        self.explicit = bytearray(1 if name in explicitPackages else 0 for name in self.names)
+
+
+
+
+
+    def isExplicit(self, name: str) -> bool:
+        node = self.ids.get(name)
+        return node is not None and bool(self.explicit[node])
+
+
+
+
+
+    ##########################################################################
+    #                               QUERIES                                  #
+    ##########################################################################
+
+
+    def closure(self, names: list, reverse: bool = False) -> set:
+        """
+        Everything the given packages (transitively) depend on, or with
+        reverse=True everything that (transitively) depends on them.
+        """
+        csr = self.reverse if reverse else self.forward
+        seen = bytearray(len(self.names))
+        stack = [self.ids[name] for name in names if name in self.ids]
+        for node in stack:
+            seen[node] = 1
+        result = set()
+
+
+        while stack:
+            node = stack.pop()
+            for target in self._neighbours(csr, node):
+                if not seen[target]:
+                    seen[target] = 1
+                    result.add(self.names[target])
+                    stack.append(target)
+
+
+        return result - set(names)
+
+
+
+
+
+    def removalSet(self, name: str) -> list:
+        """
+        The package plus every dependency that would be left orphaned by
+        removing it (what "pacman -Rs" / "apt autoremove" would take along).
+        Dependencies still needed by anything outside the set, or installed
+        explicitly, are kept.
+        """
+        start = self.ids.get(name)
+        if start is None:
+            return []
+
+
+        # ==> WORK ON STRONGLY CONNECTED COMPONENTS SO DEPENDENCY CYCLES CAN GO TOO
+        componentOf = self.componentIds()
+        members = {}
+        for node, component in enumerate(componentOf):
+            members.setdefault(component, []).append(node)
+
+
+        # ==> HOW MANY EDGES FROM STILL-INSTALLED PACKAGES ENTER EACH COMPONENT
+        remaining = {}
+        removed = [start]
+        isRemoved = bytearray(len(self.names))
+        isRemoved[start] = 1
+        queue = deque([start])
+
+
+        while queue:
+            node = queue.popleft()
+            for target in (*self._neighbours(self.forward, node), *self._neighbours(self.optional, node)):
+                component = componentOf[target]
+                if isRemoved[target] or component == componentOf[node]:
+                    continue
+                if component not in remaining:
+                    remaining[component] = self._incomingEdges(component, componentOf, members)
+                remaining[component] -= 1
+
+
+                # ==> LAST DEPENDENT (HARD OR OPTIONAL) IS GOING AWAY AND NOTHING IN IT IS EXPLICIT
+                if remaining[component] == 0 and not any(self.explicit[member] for member in members[component]):
+                    for member in members[component]:
+                        isRemoved[member] = 1
+                        removed.append(member)
+                        queue.append(member)
+
+
+        return [self.names[node] for node in removed]
+
+
+
+
+
+    def _incomingEdges(self, component: int, componentOf, members: dict) -> int:
+        total = 0
+        for member in members[component]:
+            for csr in (self.reverse, self.optionalReverse):
+                total += sum(1 for source in self._neighbours(csr, member) if componentOf[source] != component)
+        return total
+
+
+
+
+
+    def whyChain(self, name: str) -> list:
+        """
+        Shortest chain explicit-package -> ... -> name, found by a breadth-first
+        walk over reverse edges. [name] if it was installed explicitly, [] if
+        nothing explicit leads to it.
+        """
+        start = self.ids.get(name)
+        if start is None:
+            return []
+
+
+        parent = {start: None}
+        queue = deque([start])
+
+
+        while queue:
+            node = queue.popleft()
+            if self.explicit[node]:
+                chain = []
+                while node is not None:
+                    chain.append(self.names[node])
+                    node = parent[node]
+                return chain
+
+
+            for dependent in self._neighbours(self.reverse, node):
+                if dependent not in parent:
+                    parent[dependent] = node
+                    queue.append(dependent)
+
+
+        return []
+
+
+
+
+
+    def stronglyConnectedComponents(self, minSize: int = 2) -> list:
+        """
+        Dependency cycles (Tarjan's algorithm, iterative so deep graphs
+        cannot hit the recursion limit).
+        """
+        count = len(self.names)
+        index = array("i", [-1]) * count
+        low = array("i", [0]) * count
+        onStack = bytearray(count)
+        stack = []
+        components = []
+        counter = 0
+
+
+        for root in range(count):
+            if index[root] != -1:
+                continue
+
+
+            work = [(root, 0)]
+            while work:
+                node, edge = work.pop()
+                if edge == 0:
+                    index[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    onStack[node] = 1
+
+
+                neighbours = self._neighbours(self.forward, node)
+                descended = False
+
+
+                # ==> RESUME THIS NODE'S EDGE LIST WHERE WE LEFT IT
+                while edge < len(neighbours):
+                    target = neighbours[edge]
+                    edge += 1
+                    if index[target] == -1:
+                        work.append((node, edge))
+                        work.append((target, 0))
+                        descended = True
+                        break
+                    if onStack[target]:
+                        low[node] = min(low[node], index[target])
+                if descended:
+                    continue
+
+
+                # ==> ROOT OF A COMPONENT: POP IT OFF THE STACK
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        onStack[member] = 0
+                        component.append(self.names[member])
+                        if member == node:
+                            break
+                    if len(component) >= minSize:
+                        components.append(sorted(component))
+
+
+                if work:
+                    parentNode = work[-1][0]
+                    low[parentNode] = min(low[parentNode], low[node])
+
+
+        return components
+
+
+
+
+
+    def componentIds(self) -> array:
+        """
+        Component number of every node (all components, including singletons).
+        """
+        componentOf = array("i", [0]) * len(self.names)
+        for number, component in enumerate(self.stronglyConnectedComponents(minSize=1)):
+            for name in component:
+                componentOf[self.ids[name]] = number
+        return componentOf
+
+
+
+
+
+    def orphans(self) -> list:
+        """
+        Non-explicit packages nothing else needs, hard or optionally. Whole
+        dependency cycles that nothing outside the cycle needs count too.
+        """
+        return self._unreferenced(includeOptional=True)
+
+
+
+
+
+    def optionalOnly(self) -> list:
+        """
+        Non-explicit packages that are only kept because something recommends,
+        suggests or optionally depends on them.
+        """
+        orphaned = set(self._unreferenced(includeOptional=True))
+        return [name for name in self._unreferenced(includeOptional=False) if name not in orphaned]
+
+
+
+
+
+    def _unreferenced(self, includeOptional: bool) -> list:
+        componentOf = self.componentIds()
+        referenced = set()
+
+
+        # ==> A COMPONENT IS NEEDED IF ANY EDGE ENTERS IT FROM ANOTHER COMPONENT
+        # ==> OR IF ANY OF ITS MEMBERS WAS INSTALLED EXPLICITLY
+        csrs = (self.forward, self.optional) if includeOptional else (self.forward,)
+        for csr in csrs:
+            offsets, targets = csr
+            for source in range(len(self.names)):
+                for k in range(offsets[source], offsets[source + 1]):
+                    if componentOf[targets[k]] != componentOf[source]:
+                        referenced.add(componentOf[targets[k]])
+        for node, flag in enumerate(self.explicit):
+            if flag:
+                referenced.add(componentOf[node])
+
+
+        return sorted(name for node, name in enumerate(self.names) if componentOf[node] not in referenced)
@@ -0,0 +1,603 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from os import stat, scandir
+from os.path import join as pathJoin, dirname, basename
+from zlib import crc32
+from datetime import datetime, timedelta
+from re import compile as reCompile
+import sqlite3
+
+
+# ==> PACTOOL FILES
+from core.cache import InventoryCache
+from core.logger import fileLogger
+
+
+
+
+##########################################################################
+#                                                                        #
+#                             HISTORY STORE                              #
+#                                                                        #
+##########################################################################
+
+
+class HistoryStore:
+    """
+    Install, upgrade and removal events from the package manager's log,
+    parsed once into SQLite under ~/.cache/pactool/. The live log is tailed
+    from the byte offset reached last time and every rotated (optionally
+    compressed) log is read once, so a query only parses what is new and
+    per-package lookups are exact and indexed.
+    """
+    schemaVersion = 3
+    logPaths = {
+        "apt": "/var/log/apt/history.log",
+        "pacman": "/var/log/pacman.log",
+    }
+    schema = (
+        "CREATE TABLE IF NOT EXISTS sources (path TEXT PRIMARY KEY, inode INTEGER, offset INTEGER)",
+        "CREATE TABLE IF NOT EXISTS archives (path TEXT, inode INTEGER, size INTEGER, mtime INTEGER, fingerprint INTEGER, PRIMARY KEY (path, inode, size, mtime))",
+        "CREATE INDEX IF NOT EXISTS archivesByFingerprint ON archives (fingerprint)",
+        "CREATE TABLE IF NOT EXISTS transactions (id INTEGER PRIMARY KEY, started INTEGER, ended INTEGER, command TEXT, requestedBy TEXT, UNIQUE (started, command))",
+        "CREATE TABLE IF NOT EXISTS events (transactionId INTEGER, time INTEGER, action TEXT, package TEXT, oldVersion TEXT, newVersion TEXT, "
+        "UNIQUE (time, action, package, oldVersion, newVersion))",
+        "CREATE INDEX IF NOT EXISTS eventsByPackage ON events (package, time)",
+        "CREATE INDEX IF NOT EXISTS eventsByTime ON events (time)",
+    )
+
+    # ==> [2024-01-02T10:11:12+0100] [ALPM] upgraded bash (5.2.015-1 -> 5.2.021-1)
+    pacmanEvent = reCompile(r"^\[([^\]]+)\] \[ALPM\] (installed|upgraded|downgraded|reinstalled|removed) (\S+) \(([^)]*)\)")
+    pacmanCommand = reCompile(r"^\[([^\]]+)\] \[PACMAN\] Running '(.*)'")
+    pacmanActions = {"installed": "install", "upgraded": "upgrade", "downgraded": "downgrade", "reinstalled": "reinstall", "removed": "remove"}
+    aptActions = {"Install": "install", "Upgrade": "upgrade", "Downgrade": "downgrade", "Reinstall": "reinstall", "Remove": "remove", "Purge": "purge"}
+
+    # ==> libc6:amd64 (2.36-9, 2.36-9+deb12u4)
+    aptPackage = reCompile(r"([^\s(),]+) \(([^)]*)\)")
+    compressedSuffixes = (".gz", ".xz", ".zst")
+    relativeUnits = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+    weekdays = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+    fingerprintBytes = 65536
+
+
+
+
+    def __init__(self, manager: str, enabled: bool = True, root: str = "/") -> None:
+        self.manager = manager
+        self.enabled = enabled
+        self.root = root
+        self.path = InventoryCache.cacheDir / f"history-{manager}.sqlite"
+        self._connection = None
+        self._refreshed = False
+
+
+
+
+
+    ##########################################################################
+    #                                DATABASE                                #
+    ##########################################################################
+
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is not None:
+            return self._connection
+
+
+        # ==> --no-cache PARSES INTO A THROWAWAY IN-MEMORY DATABASE
+        if self.enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10.0)
+        else:
+            connection = sqlite3.connect(":memory:")
+
+
+        # ==> A DIFFERENT LAYOUT IS SIMPLY REBUILT FROM THE LOGS
+        if connection.execute("PRAGMA user_version").fetchone()[0] != self.schemaVersion:
+            with connection:
+                for (table,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+                    connection.execute(f"DROP TABLE IF EXISTS {table}")
+                connection.execute(f"PRAGMA user_version = {self.schemaVersion}")
+
+
+        with connection:
+            for statement in self.schema:
+                connection.execute(statement)
+
+
+        self._connection = connection
+        return connection
+
+
+
+
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+
+
+
+    ##########################################################################
+    #                                PARSING                                 #
+    ##########################################################################
+
+    @staticmethod
+    def fromIsoformat(text: str) -> datetime:
+        """
+        datetime.fromisoformat() as of Python 3.8, plus the two spellings it
+        only learned in 3.11: a trailing Z and pacman's +HHMM offset.
+        (strptime() would accept them too, but is ten times slower per line.)
+        """
+        text = " ".join(text.split())
+        if text[-1:] in ("Z", "z"):
+            text = text[:-1] + "+00:00"
+        elif len(text) > 16 and text[-5] in "+-" and text[-4:].isdigit():
+            text = text[:-2] + ":" + text[-2:]
+        return datetime.fromisoformat(text)
+
+
+
+
+
+    @classmethod
+    def parseTime(cls, text: str):
+        # ==> EPOCH SECONDS; LOGS WITHOUT AN OFFSET ARE IN LOCAL TIME
+        try:
+            return int(cls.fromIsoformat(text).timestamp())
+        except ValueError:
+            return None
+
+
+
+
+
+    @staticmethod
+    def _newTransaction(offset: int, started, command: str = "") -> dict:
+        return {"offset": offset, "started": started, "ended": None, "command": command, "requestedBy": "", "events": []}
+
+
+
+
+
+    def _pacmanTransactions(self, lines):
+        """
+        Group pacman.log lines into transactions. A transaction starts at
+        "[PACMAN] Running '...'" (or at "transaction started" when the
+        previous one already completed) and collects the [ALPM] events after it.
+        """
+        transaction = None
+
+
+        for offset, line in lines:
+            match = self.pacmanEvent.match(line)
+            if match:
+                timestamp, action, package, versions = match.groups()
+                time = self.parseTime(timestamp)
+                if time is None:
+                    continue
+                if transaction is None:
+                    transaction = self._newTransaction(offset, time)
+                oldVersion, _, newVersion = versions.partition(" -> ")
+                if action == "removed":
+                    newVersion = ""
+                elif not newVersion:
+                    oldVersion, newVersion = "", oldVersion
+                transaction["events"].append((time, self.pacmanActions[action], package, oldVersion, newVersion))
+                continue
+
+
+            match = self.pacmanCommand.match(line)
+            if match:
+                if transaction is not None:
+                    yield transaction
+                transaction = self._newTransaction(offset, self.parseTime(match.group(1)), match.group(2))
+            elif "[ALPM] transaction started" in line and (transaction is None or transaction["ended"] is not None):
+                if transaction is not None:
+                    yield transaction
+                transaction = self._newTransaction(offset, self.parseTime(line[1:line.find("]")]))
+            elif "[ALPM] transaction completed" in line and transaction is not None:
+                transaction["ended"] = self.parseTime(line[1:line.find("]")])
+
+
+        if transaction is not None:
+            yield transaction
+
+
+
+
+
+    def _aptStanzas(self, lines):
+        # ==> (offset of the first line, {field: value}) FOR EVERY BLANK-LINE SEPARATED STANZA
+        fields = {}
+        start = 0
+
+
+        for offset, line in lines:
+            if not line.strip():
+                if fields:
+                    yield start, fields
+                fields = {}
+                continue
+
+
+            key, separator, value = line.partition(": ")
+            if not separator:
+                continue
+
+
+            # ==> AN INTERRUPTED apt RUN CAN LEAVE A STANZA WITHOUT ITS CLOSING BLANK LINE
+            if key == "Start-Date" and fields:
+                yield start, fields
+                fields = {}
+            if not fields:
+                start = offset
+            fields[key] = value.strip()
+
+
+        if fields:
+            yield start, fields
+
+
+
+
+
+    def _aptTransactions(self, lines):
+        """
+        One transaction per history.log stanza: Start-Date, Commandline,
+        Requested-By, the Install/Upgrade/Downgrade/Reinstall/Remove/Purge
+        package lists and End-Date.
+        """
+        for offset, fields in self._aptStanzas(lines):
+            started = self.parseTime(fields.get("Start-Date", ""))
+            if started is None:
+                continue
+
+
+            transaction = self._newTransaction(offset, started, fields.get("Commandline", ""))
+            transaction["requestedBy"] = fields.get("Requested-By", "")
+            transaction["ended"] = self.parseTime(fields["End-Date"]) if "End-Date" in fields else None
+
+
+            # ==> EACH LIST IS SPLIT ONCE; THE COMMAS INSIDE "(old, new)" NEVER SEPARATE PACKAGES
+            for field, action in self.aptActions.items():
+                for name, versions in self.aptPackage.findall(fields.get(field, "")):
+                    versions = [version.strip() for version in versions.split(",") if version.strip() != "automatic"] or [""]
+                    if action in ("upgrade", "downgrade"):
+                        oldVersion, newVersion = (versions + [""])[:2]
+                    elif action in ("remove", "purge"):
+                        oldVersion, newVersion = versions[0], ""
+                    else:
+                        oldVersion, newVersion = "", versions[0]
+                    transaction["events"].append((started, action, name.partition(":")[0], oldVersion, newVersion))
+
+
+            yield transaction
+
+
+
+
+
+    ##########################################################################
+    #                                TAILING                                 #
+    ##########################################################################
+
+    def rotatedLogs(self, path: str) -> list:
+        """
+        Rotated copies of the live log (history.log.1, history.log.2.gz,
+        pacman.log-20240101.xz, ...), oldest first.
+        """
+        directory, name = dirname(path), basename(path)
+        rotated = []
+
+
+        try:
+            with scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith(name) and entry.name[len(name):len(name) + 1] in (".", "-") and entry.is_file():
+                        suffix = entry.name[len(name) + 1:]
+                        for compressed in self.compressedSuffixes:
+                            if suffix.endswith(compressed):
+                                suffix = suffix[:-len(compressed)]
+                        if suffix.isdigit():
+                            rotated.append((entry.stat().st_mtime_ns, -int(suffix) if len(suffix) < 8 else int(suffix), entry.path))
+        except OSError:
+            return []
+
+
+        # ==> logrotate NEVER TOUCHES A ROTATED FILE AGAIN, SO mtime ORDER IS AGE ORDER
+        # ==> (numbered files tie-break highest first, dated ones oldest first)
+        return [rotatedPath for _, _, rotatedPath in sorted(rotated)]
+
+
+
+
+
+    @staticmethod
+    def openLog(path: str):
+        """
+        Binary stream over a plain or compressed log, decompressed on the fly
+        while it is read. None when the format needs a module that is missing.
+        """
+        if path.endswith(".gz"):
+            import gzip
+            return gzip.open(path, "rb")
+        if path.endswith(".xz"):
+            import lzma
+            return lzma.open(path, "rb")
+        if path.endswith(".zst"):
+            # ==> zstd IS ONLY IN THE STDLIB FROM PYTHON 3.14, OTHERWISE THE zstandard PACKAGE
+            try:
+                from compression import zstd
+                return zstd.open(path, "rb")
+            except ImportError:
+                pass
+            try:
+                import zstandard
+                from io import BufferedReader
+                return BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True))
+            except ImportError:
+                return None
+        return open(path, "rb")
+
+
+
+
+
+    def _readLines(self, logFile, offset: int = 0, completeOnly: bool = True):
+        # ==> (byte offset, line) FOR EVERY LINE FROM offset ON; A LIVE LOG'S UNFINISHED LAST LINE WAITS
+        if offset:
+            logFile.seek(offset)
+        for raw in logFile:
+            if completeOnly and not raw.endswith(b"\n"):
+                break
+            yield offset, raw.decode("utf-8", "replace").rstrip("\n")
+            offset += len(raw)
+
+
+
+
+
+    def _fingerprint(self, path: str):
+        # ==> THE DECOMPRESSED HEAD: history.log.1 AND ITS LATER history.log.2.gz SHARE IT
+        logFile = self.openLog(path)
+        if logFile is None:
+            return None
+        with logFile:
+            return crc32(logFile.read(self.fingerprintBytes))
+
+
+
+
+
+    def _store(self, connection: sqlite3.Connection, transaction: dict) -> None:
+        if transaction["started"] is None:
+            return
+
+
+        connection.execute(
+            "INSERT OR IGNORE INTO transactions (started, command, requestedBy) VALUES (?, ?, ?)",
+            (transaction["started"], transaction["command"], transaction["requestedBy"]),
+        )
+        (transactionId,) = connection.execute("SELECT id FROM transactions WHERE started = ? AND command = ?", (transaction["started"], transaction["command"])).fetchone()
+        if transaction["ended"] is not None:
+            connection.execute("UPDATE transactions SET ended = ? WHERE id = ?", (transaction["ended"], transactionId))
+
+
+        # ==> RE-READING AN UNFINISHED TRANSACTION ONLY ADDS ITS NEW EVENTS
+        connection.executemany(
+            "INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?)",
+            [(transactionId, *event) for event in transaction["events"]],
+        )
+
+
+
+
+
+    def _parser(self):
+        return self._aptTransactions if self.manager == "apt" else self._pacmanTransactions
+
+
+
+
+
+    def _readArchive(self, connection: sqlite3.Connection, path: str) -> None:
+        try:
+            st = stat(path)
+        except OSError:
+            return
+        key = (path, st.st_ino, st.st_size, st.st_mtime_ns)
+        if connection.execute("SELECT 1 FROM archives WHERE path = ? AND inode = ? AND size = ? AND mtime = ?", key).fetchone():
+            return
+
+
+        fingerprint = self._fingerprint(path)
+        if fingerprint is None:
+            fileLogger().warning(f"Skipping {path}: no zstd decompressor available")
+            return
+
+
+        # ==> A RENAMED OR RECOMPRESSED COPY OF A LOG THAT WAS ALREADY READ
+        if not connection.execute("SELECT 1 FROM archives WHERE fingerprint = ?", (fingerprint,)).fetchone():
+            with self.openLog(path) as logFile:
+                for transaction in self._parser()(self._readLines(logFile, completeOnly=False)):
+                    self._store(connection, transaction)
+        connection.execute("INSERT OR REPLACE INTO archives VALUES (?, ?, ?, ?, ?)", (*key, fingerprint))
+
+
+
+
+
+    def _tailLive(self, connection: sqlite3.Connection, path: str) -> None:
+        try:
+            st = stat(path)
+        except OSError:
+            return
+
+
+        row = connection.execute("SELECT inode, offset FROM sources WHERE path = ?", (path,)).fetchone()
+        offset = row[1] if row and row[0] == st.st_ino and row[1] <= st.st_size else 0
+        if offset == st.st_size:
+            return
+
+
+        # ==> THE LAST TRANSACTION MAY STILL BE OPEN, SO THE NEXT RUN RESUMES AT ITS FIRST LINE
+        resumeAt = offset
+        with open(path, "rb") as logFile:
+            for transaction in self._parser()(self._readLines(logFile, offset)):
+                self._store(connection, transaction)
+                resumeAt = transaction["offset"]
+        connection.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?)", (path, st.st_ino, resumeAt))
+
+
+
+
+
+    def refresh(self) -> None:
+        """
+        Parse rotated logs not seen before, oldest first, then whatever was
+        appended to the live log since the last run.
+        """
+        if self._refreshed or self.manager not in self.logPaths:
+            return
+        self._refreshed = True
+
+
+        path = pathJoin(self.root, self.logPaths[self.manager].lstrip("/"))
+        connection = self.connection()
+        with connection:
+            for rotatedPath in self.rotatedLogs(path):
+                self._readArchive(connection, rotatedPath)
+            self._tailLive(connection, path)
+
+
+
+
+
+    ##########################################################################
+    #                                QUERIES                                 #
+    ##########################################################################
+
+    def packageEvents(self, packageName: str) -> list:
+        """
+        (time, action, oldVersion, newVersion, command, requestedBy) for one package, oldest first.
+        """
+        self.refresh()
+        return self.connection().execute(
+            "SELECT events.time, events.action, events.oldVersion, events.newVersion, transactions.command, transactions.requestedBy "
+            "FROM events JOIN transactions ON transactions.id = events.transactionId "
+            "WHERE events.package = ? ORDER BY events.time, events.rowid",
+            (packageName,),
+        ).fetchall()
+
+
+
+
+
+    def changes(self, since: int, until: int = None) -> list:
+        """
+        Transactions with at least one event in [since, until), oldest first,
+        as (started, ended, command, requestedBy, [(action, package, oldVersion, newVersion), ...]).
+        """
+        self.refresh()
+        rows = self.connection().execute(
+            "SELECT transactions.id, transactions.started, transactions.ended, transactions.command, transactions.requestedBy, "
+            "events.action, events.package, events.oldVersion, events.newVersion "
+            "FROM events JOIN transactions ON transactions.id = events.transactionId "
+            "WHERE events.time >= ? AND events.time < ? ORDER BY events.time, events.transactionId, events.rowid",
+            (since, until if until is not None else 1 << 62),
+        )
+
+
+        transactions = {}
+        for transactionId, started, ended, command, requestedBy, *event in rows:
+            if transactionId not in transactions:
+                transactions[transactionId] = (started, ended, command, requestedBy, [])
+            transactions[transactionId][4].append(tuple(event))
+        return list(transactions.values())
+
+
+
+
+
+    @classmethod
+    def parseDate(cls, text: str, endOfRange: bool = False, now: datetime = None) -> int:
+        """
+        Epoch seconds for a --changes-since/--changes-between argument:
+        an ISO date or date-time, "today", "yesterday", a weekday name (the
+        most recent one) or an age such as "90m", "12h", "3d", "2w". A bare
+        day used as the end of a range includes that whole day.
+        """
+        now = now or datetime.now()
+        text = text.strip().lower()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+        if text[:-1].isdigit() and text[-1:] in cls.relativeUnits:
+            return int(now.timestamp()) - int(text[:-1]) * cls.relativeUnits[text[-1]]
+
+
+        weekdays = [day for day in cls.weekdays if len(text) >= 3 and day.startswith(text)]
+        if text == "today":
+            day = midnight
+        elif text == "yesterday":
+            day = midnight - timedelta(days=1)
+        elif weekdays:
+            day = midnight - timedelta(days=(now.weekday() - cls.weekdays.index(weekdays[0])) % 7)
+        else:
+            # ==> ValueError FOR ANYTHING ELSE IS LEFT TO THE CALLER
+            day = cls.fromIsoformat(text.upper())
+            if len(text) > 10:
+                return int(day.timestamp())
+
+
+        return int((day + timedelta(days=1) if endOfRange else day).timestamp())
+
+
+
+
+
+    @staticmethod
+    def timeText(time: int) -> str:
+        return datetime.fromtimestamp(time).strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,173 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from ctypes import CDLL, get_errno
+from ctypes.util import find_library
+from os import read, close, strerror
+from struct import Struct
+
+
+
+
+##########################################################################
+#                                                                        #
+#                            INOTIFY WATCHER                             #
+#                                                                        #
+##########################################################################
+
+
+class InotifyWatcher:
+    """
+    Minimal inotify binding through libc (Linux only, no third-party
+    modules). Watches directories and reports (directory, name, mask)
+    for every change. available() is False where inotify cannot be used,
+    callers then fall back to polling.
+    """
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    changeMask = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+    eventHeader = Struct("iIII")
+
+
+
+
+    def __init__(self) -> None:
+        self.fd = -1
+        self.watches = {}
+        self.lastError = ""
+
+
+        try:
+            self._libc = CDLL(find_library("c") or "libc.so.6", use_errno=True)
+            self.fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        except (OSError, AttributeError):
+            self._libc = None
+
+
+
+
+
+    def available(self) -> bool:
+        return self.fd >= 0
+
+
+
+
+
+    def fileno(self) -> int:
+        return self.fd
+
+
+
+
+
+    def watch(self, directory: str, mask: int = None) -> bool:
+        if not self.available():
+            return False
+
+
+        wd = self._libc.inotify_add_watch(self.fd, directory.encode(), (self.changeMask if mask is None else mask) | self.IN_ONLYDIR)
+        if wd < 0:
+            # ==> MISSING DIRECTORY OR OUT OF WATCHES: THE CALLER KEEPS POLLING THAT PATH
+            self.lastError = strerror(get_errno())
+            return False
+
+
+        self.watches[wd] = directory
+        return True
+
+
+
+
+
+    def read(self) -> list:
+        """
+        Drain pending events: [(directory, name, mask)]. A queue overflow is
+        reported as (None, "", IN_Q_OVERFLOW), meaning "assume everything changed".
+        """
+        events = []
+
+
+        while True:
+            try:
+                data = read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+
+
+            offset = 0
+            while offset + self.eventHeader.size <= len(data):
+                wd, mask, _, length = self.eventHeader.unpack_from(data, offset)
+                offset += self.eventHeader.size
+                name = data[offset:offset + length].split(b"\0", 1)[0].decode("utf-8", "replace")
+                offset += length
+
+
+                if mask & self.IN_IGNORED:
+                    self.watches.pop(wd, None)
+                    continue
+                events.append((self.watches.get(wd), name, mask))
+
+
+        return events
+
+
+
+
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            close(self.fd)
+            self.fd = -1
@@ -0,0 +1,340 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from os import stat, replace, getpid, scandir
+from os.path import join as pathJoin, isdir
+from hashlib import blake2b
+from marshal import dumps as marshalDumps, loads as marshalLoads
+
+
+# ==> PACTOOL FILES
+from core.cache import InventoryCache
+from core.database import DpkgDatabase, PacmanDatabase
+
+
+
+
+##########################################################################
+#                                                                        #
+#                         INCREMENTAL INVENTORY                          #
+#                                                                        #
+##########################################################################
+
+
+class IncrementalInventory:
+    """
+    Remembers every package's parse result together with a cheap signature
+    of where it came from, so a refresh only parses what changed:
+
+      pacman  one local/<name-version>/desc per package, signed by its
+              mtime and size; added, removed and upgraded directories are
+              the only ones read again. The explicit flag (%REASON%) is
+              kept with each entry, since pacman -D rewrites desc in place
+              without touching local/ itself.
+      apt     one status stanza per package, signed by its name and a
+              128-bit BLAKE2 digest of its bytes;
+              unchanged stanzas are never parsed again. .list times are
+              re-stat()ed only for the packages named in the change hint.
+
+    rows() takes an optional hint (the entry names an inotify watcher saw
+    change); without one every signature is checked, which is still just
+    a stat() or a hash per package.
+    """
+    formatVersion = 3
+    aptFields = DpkgDatabase.recordFields | {"Package", "Status"}
+
+
+
+
+    def __init__(self, manager: str, enabled: bool = True, root: str = "/") -> None:
+        self.manager = manager
+        self.enabled = enabled
+        self.root = root
+        self.path = InventoryCache.cacheDir / f"entries-{manager}.bin"
+        self.parsed = 0
+        self._entries = None
+        self._listTimes = None
+
+        # ==> pacman: PACKAGES WITH AN EXPLICIT %REASON%, SO FAR IN THE CURRENT WALK AND AS OF THE LAST COMPLETE ONE
+        self.explicitSeen = set()
+        self.explicit = None
+
+        # ==> pacman: HINTED DIRECTORIES WITHOUT A desc YET, RE-CHECKED ON EVERY WALK UNTIL ONE APPEARS
+        self.pendingNames = set()
+
+
+
+
+
+    def available(self) -> bool:
+        if self.manager == "apt":
+            return DpkgDatabase(self.root).available()
+        elif self.manager == "pacman":
+            return PacmanDatabase(self.root).available()
+        return False
+
+
+
+
+
+    ##########################################################################
+    #                              PERSISTENCE                               #
+    ##########################################################################
+
+    def _load(self) -> dict:
+        if self._entries is not None:
+            return self._entries
+
+
+        self._entries = {}
+        if not self.enabled:
+            return self._entries
+
+
+        try:
+            version, entries, listTimes = marshalLoads(self.path.read_bytes())
+            if version == self.formatVersion:
+                self._entries = entries
+                self._listTimes = listTimes
+        except (OSError, ValueError, EOFError, TypeError):
+            pass
+        return self._entries
+
+
+
+
+
+    def _save(self) -> None:
+        if not self.enabled:
+            return
+
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tempPath = self.path.with_name(f"{self.path.name}.{getpid()}.tmp")
+            tempPath.write_bytes(marshalDumps((self.formatVersion, self._entries, self._listTimes)))
+            replace(tempPath, self.path)
+        except (OSError, ValueError):
+            pass
+
+
+
+
+
+    ##########################################################################
+    #                                REFRESH                                 #
+    ##########################################################################
+
+    def rows(self, changed: set = None) -> list:
+        """
+        PackageRecord rows for the current database, in the same order as a
+        full collect; changed=None means "no hint, check every signature".
+        """
+        return list(self.iterRows(changed))
+
+
+
+
+
+    def iterRows(self, changed: set = None):
+        """
+        Same rows as rows(), yielded as soon as each one is known. The
+        signatures are only saved once the whole database has been walked.
+        """
+        self.parsed = 0
+        yield from (self._aptRows(changed) if self.manager == "apt" else self._pacmanRows(changed))
+        self._save()
+
+
+
+
+
+    def _pacmanRows(self, changed: set = None):
+        database = PacmanDatabase(self.root)
+        entries = self._load()
+
+
+        # ==> WITH A HINT ONLY THE NAMED DIRECTORIES (AND THOSE STILL PENDING) CAN HAVE CHANGED
+        if changed is not None and entries:
+            changed = set(changed) | self.pendingNames
+            names = set(entries) | changed
+        else:
+            self.pendingNames = set()
+            with scandir(database.localDir) as directory:
+                names = {entry.name for entry in directory if entry.is_dir()}
+            for name in set(entries) - names:
+                del entries[name]
+
+
+        # ==> SAME ORDER AS PacmanDatabase.entries() (SORTED BY ".../name/desc")
+        explicit = self.explicitSeen = set()
+        for name in sorted(names, key=lambda name: f"{name}/"):
+            descPath = pathJoin(database.localDir, name, "desc")
+            if changed is not None and name in entries and name not in changed:
+                yield self._pacmanRow(entries[name], explicit)
+                continue
+
+
+            try:
+                st = stat(descPath)
+            except OSError:
+                # ==> PACMAN MAY STILL BE WRITING IT; LATER WRITES INSIDE THE DIRECTORY RAISE NO HINT
+                self.pendingNames.discard(name)
+                if entries.pop(name, None) is None and changed is not None and isdir(pathJoin(database.localDir, name)):
+                    self.pendingNames.add(name)
+                continue
+
+
+            signature = (st.st_mtime_ns, st.st_size)
+            if name not in entries or entries[name][0] != signature:
+                contents = database._readBatch([descPath])
+                entry = database.parseDesc(contents[0]) if contents else None
+                if entry is None:
+                    entries.pop(name, None)
+                    continue
+                entries[name] = (signature, database.recordFor(entry).toRow(), database.isExplicit(entry))
+                self.parsed += 1
+            self.pendingNames.discard(name)
+
+
+            yield self._pacmanRow(entries[name], explicit)
+
+
+        self.explicit = explicit
+
+
+
+
+
+    def changedEntries(self) -> set:
+        """
+        pacman directory names whose desc differs from the stored signature
+        (or appeared, or vanished): a full signature pass without parsing.
+        """
+        if self.manager != "pacman":
+            return set()
+
+
+        entries = self._load()
+        localDir = PacmanDatabase(self.root).localDir
+        changed = set()
+        try:
+            with scandir(localDir) as directory:
+                names = {entry.name for entry in directory if entry.is_dir()}
+        except OSError:
+            return set()
+
+
+        for name in names:
+            try:
+                st = stat(pathJoin(localDir, name, "desc"))
+            except OSError:
+                if name in entries:
+                    changed.add(name)
+                continue
+            if name not in entries or entries[name][0] != (st.st_mtime_ns, st.st_size):
+                changed.add(name)
+        return changed | (set(entries) - names)
+
+
+
+
+
+    @staticmethod
+    def _pacmanRow(entry: tuple, explicit: set) -> tuple:
+        _, row, isExplicit = entry
+        if isExplicit:
+            explicit.add(row[0])
+        return row
+
+
+
+
+
+    def _aptListTimes(self, database: DpkgDatabase, changed: set = None) -> dict:
+        if self._listTimes is None or changed is None:
+            self._listTimes = database.scanListTimes()
+            return self._listTimes
+
+
+        # ==> RE-STAT ONLY THE .list FILES THE HINT NAMES
+        for name in changed:
+            try:
+                st = stat(pathJoin(database.infoDir, f"{name}.list"))
+                self._listTimes[name] = (st.st_ctime, st.st_mtime)
+            except OSError:
+                self._listTimes.pop(name, None)
+        return self._listTimes
+
+
+
+
+
+    def _aptRows(self, changed: set = None):
+        database = DpkgDatabase(self.root)
+        entries = self._load()
+        listTimes = self._aptListTimes(database, changed)
+
+
+        with open(database.statusPath, "rb") as statusFile:
+            chunks = statusFile.read().split(b"\n\n")
+
+
+        # ==> ENTRIES ARE KEYED BY (NAME, STANZA DIGEST), ANYTHING NOT SEEN THIS TIME IS DROPPED
+        current = {}
+        for chunk in chunks:
+            if not chunk.strip():
+                continue
+
+
+            key = (chunk.partition(b"\n")[0], blake2b(chunk, digest_size=16).digest())
+            stanza = entries.get(key)
+            if stanza is None:
+                stanza = database.parseStanza(chunk.decode("utf-8", "replace"), self.aptFields)
+                self.parsed += 1
+            current[key] = stanza
+
+
+            record = database.recordFor(stanza, listTimes)
+            if record is not None:
+                yield record.toRow()
+
+
+        self._entries = current
@@ -41,33 +41,46 @@
 
 from datetime import datetime
 from pathlib import Path
-from logging import basicConfig, info, error, INFO
 
 
 # ==> PACTOOL FILES
 from core.formatter import Formatter
 
 
-# ==> CREATE LOG DIRECTORY
+# ==> LOG DIRECTORY AND FILE ARE ONLY SET UP WHEN SOMETHING IS LOGGED
 logDir = Path.home() / ".cache" / "pactool" / "logs"
-logDir.mkdir(parents=True, exist_ok=True)
+logger = None
 
 
 
-# ==> LOG FILE NAME BASED ON TODAY'S DATE
-logFile = logDir / f"{datetime.now().strftime('%Y-%m-%d')}.log"
 
+def fileLogger():
+    """
+    Root logger writing to today's log file, configured on first use.
+    """
+    global logger
+    if logger is not None:
+        return logger
+
+
+    # ==> logging IS ONE OF THE SLOWER STDLIB IMPORTS, ONLY PAY FOR IT HERE
+    from logging import basicConfig, getLogger, INFO
+    logDir.mkdir(parents=True, exist_ok=True)
 
 
+    # ==> LOG FILE NAME BASED ON TODAY'S DATE
+    logFile = logDir / f"{datetime.now().strftime('%Y-%m-%d')}.log"
 
 
-# ==> CONFIGURE LOGGER
-basicConfig(
-    filename=logFile,
-    level=INFO,
-    format="[PACTOOL LOG] [%(asctime)s] [%(levelname)s] %(message)s",
-    datefmt="%I:%M:%S %p"
-)
+    # ==> CONFIGURE LOGGER
+    basicConfig(
+        filename=logFile,
+        level=INFO,
+        format="[PACTOOL LOG] [%(asctime)s] [%(levelname)s] %(message)s",
+        datefmt="%I:%M:%S %p"
+    )
+    logger = getLogger()
+    return logger
 
 
 
@@ -80,7 +93,7 @@ def logSuccess(message: str):
     """
     cleanString = message.replace("\n", "").replace("\r", "")
     print(Formatter.colorText(message, Formatter.green, Formatter.bold))
-    info(cleanString)
+    fileLogger().info(cleanString)
 
 
 
@@ -92,4 +105,4 @@ def logError(message: str):
     """
     cleanString = message.replace("\n", "").replace("\r", "")
     print(Formatter.colorText(message, Formatter.red, Formatter.bold))
-    error(cleanString)
+    fileLogger().error(cleanString)
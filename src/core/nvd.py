@@ -0,0 +1,303 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from os import environ
+from time import monotonic, sleep, time
+from collections import deque
+from threading import Lock, local
+from http.client import HTTPConnection, HTTPSConnection, HTTPException
+from urllib.parse import urlsplit, urlencode
+from json import loads as jsonLoads, dumps as jsonDumps
+from zlib import compress, decompress, error as ZlibError
+import sqlite3
+
+
+# ==> PACTOOL FILES
+from core.cache import InventoryCache
+
+
+
+
+##########################################################################
+#                                                                        #
+#                             RATE LIMITER                               #
+#                                                                        #
+##########################################################################
+
+
+class RateLimiter:
+    """
+    At most `limit` calls in any rolling `window` seconds, shared by every
+    thread that calls wait().
+    """
+    def __init__(self, limit: int, window: float) -> None:
+        self.limit = limit
+        self.window = window
+        self.calls = deque()
+        self.lock = Lock()
+
+
+
+
+
+    def wait(self) -> None:
+        while True:
+            with self.lock:
+                now = monotonic()
+                while self.calls and now - self.calls[0] >= self.window:
+                    self.calls.popleft()
+                if len(self.calls) < self.limit:
+                    self.calls.append(now)
+                    return
+                delay = self.window - (now - self.calls[0])
+            sleep(delay)
+
+
+
+
+##########################################################################
+#                                                                        #
+#                              NVD CLIENT                                #
+#                                                                        #
+##########################################################################
+
+
+class NvdClient:
+    """
+    Keyword searches against the NVD CVE API 2.0. Misses are fetched in
+    parallel over one kept-alive connection per worker thread, paced by
+    NVD's published rate limits, and successful responses are kept in a
+    TTL cache under ~/.cache/pactool/. PACTOOL_NVD_URL points the client
+    at another server (a mirror or a local stand-in for tests) and
+    NVD_API_KEY raises the rate limit.
+    """
+    defaultBaseUrl = "https://services.nvd.nist.gov/rest/json/cves/2.0"
+
+    # ==> NVD: 5 REQUESTS PER ROLLING 30 SECONDS WITHOUT A KEY, 50 WITH ONE
+    publicLimit = (5, 30.0)
+    keyLimit = (50, 30.0)
+    cacheTtl = 86400
+    timeout = 10.0
+    attempts = 3
+
+
+
+
+    def __init__(self, enabled: bool = True, executor=None, baseUrl: str = None, apiKey: str = None) -> None:
+        self.enabled = enabled
+        self.executor = executor
+        self.baseUrl = baseUrl or environ.get("PACTOOL_NVD_URL") or self.defaultBaseUrl
+        self.apiKey = apiKey if apiKey is not None else environ.get("NVD_API_KEY", "")
+        self.limiter = RateLimiter(*(self.keyLimit if self.apiKey else self.publicLimit))
+        self.path = InventoryCache.cacheDir / "nvd-cache.sqlite"
+        self._url = urlsplit(self.baseUrl)
+        self._threads = local()
+
+
+
+
+
+    ##########################################################################
+    #                                 HTTP                                   #
+    ##########################################################################
+
+    def _connection(self):
+        # ==> ONE PERSISTENT CONNECTION PER WORKER THREAD (http.client IS NOT THREAD-SAFE)
+        connection = getattr(self._threads, "connection", None)
+        if connection is None:
+            connectionClass = HTTPSConnection if self._url.scheme == "https" else HTTPConnection
+            connection = self._threads.connection = connectionClass(self._url.netloc, timeout=self.timeout)
+        return connection
+
+
+
+
+
+    def _dropConnection(self) -> None:
+        connection = getattr(self._threads, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._threads.connection = None
+
+
+
+
+
+    def requestPath(self, keyword: str) -> str:
+        return f"{self._url.path}?{urlencode({'keywordSearch': keyword})}"
+
+
+
+
+
+    def fetch(self, keyword: str):
+        """
+        One keyword search; the decoded JSON body, or None when the server
+        could not be reached or kept refusing.
+        """
+        headers = {"User-Agent": "Pactool", "Accept": "application/json"}
+        if self.apiKey:
+            headers["apiKey"] = self.apiKey
+
+
+        for attempt in range(self.attempts):
+            self.limiter.wait()
+            try:
+                connection = self._connection()
+                connection.request("GET", self.requestPath(keyword), headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+                if response.will_close:
+                    self._dropConnection()
+            except (OSError, HTTPException):
+                # ==> A KEPT-ALIVE CONNECTION THE SERVER ALREADY CLOSED, OR A REAL NETWORK ERROR
+                self._dropConnection()
+                continue
+
+
+            if response.status == 200:
+                try:
+                    return jsonLoads(body)
+                except ValueError:
+                    return None
+
+
+            # ==> NVD ANSWERS 403 (AND SOMETIMES 429/503) WHEN THE RATE LIMIT IS HIT
+            if response.status in (403, 429, 503) and attempt + 1 < self.attempts:
+                retryAfter = response.getheader("Retry-After", "")
+                sleep(float(retryAfter) if retryAfter.isdigit() else 2.0 * (attempt + 1))
+                continue
+            return None
+
+
+        return None
+
+
+
+
+
+    ##########################################################################
+    #                                 CACHE                                  #
+    ##########################################################################
+
+    def _cacheKey(self, keyword: str) -> str:
+        # ==> THE FULL QUERY, SO A STAND-IN SERVER NEVER SHARES ENTRIES WITH THE REAL ONE
+        return f"{self._url.scheme}://{self._url.netloc}{self.requestPath(keyword)}"
+
+
+
+
+
+    def _database(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        database = sqlite3.connect(self.path, timeout=10.0)
+        database.execute("CREATE TABLE IF NOT EXISTS responses (query TEXT PRIMARY KEY, fetched INTEGER, body BLOB)")
+        return database
+
+
+
+
+
+    def _cached(self, keywords: list) -> dict:
+        if not self.enabled:
+            return {}
+
+
+        found = {}
+        try:
+            database = self._database()
+            with database:
+                for keyword in keywords:
+                    row = database.execute("SELECT body FROM responses WHERE query = ? AND fetched >= ?", (self._cacheKey(keyword), int(time()) - self.cacheTtl)).fetchone()
+                    if row:
+                        found[keyword] = jsonLoads(decompress(row[0]))
+            database.close()
+        except (OSError, sqlite3.Error, ValueError, ZlibError):
+            pass
+        return found
+
+
+
+
+
+    def _remember(self, responses: dict) -> None:
+        if not self.enabled or not responses:
+            return
+
+
+        try:
+            database = self._database()
+            with database:
+                now = int(time())
+                database.execute("DELETE FROM responses WHERE fetched < ?", (now - self.cacheTtl,))
+                database.executemany(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                    [(self._cacheKey(keyword), now, compress(jsonDumps(data).encode())) for keyword, data in responses.items()],
+                )
+            database.close()
+        except (OSError, sqlite3.Error):
+            pass
+
+
+
+
+
+    ##########################################################################
+    #                                 SEARCH                                 #
+    ##########################################################################
+
+    def search(self, keywords: list) -> dict:
+        """
+        keyword -> decoded response (None when it could not be fetched),
+        answering from the cache first and fetching the rest concurrently.
+        """
+        keywords = list(dict.fromkeys(keywords))
+        results = self._cached(keywords)
+        misses = [keyword for keyword in keywords if keyword not in results]
+
+
+        fetched = self.executor.map(self.fetch, misses) if self.executor else [self.fetch(keyword) for keyword in misses]
+        responses = {keyword: data for keyword, data in zip(misses, fetched) if data is not None}
+        self._remember(responses)
+
+
+        results.update(zip(misses, fetched))
+        return results
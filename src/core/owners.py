@@ -0,0 +1,467 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from os import stat, replace, getpid, scandir, lstat
+from os.path import join as pathJoin, islink, realpath, abspath, normpath
+from bisect import bisect_left
+from fnmatch import translate
+from re import compile as reCompile
+from marshal import dumps as marshalDumps, loads as marshalLoads
+
+
+# ==> PACTOOL FILES
+from core.cache import InventoryCache
+from core.database import DpkgDatabase, PacmanDatabase
+
+
+
+
+##########################################################################
+#                                                                        #
+#                        FILE OWNERSHIP INDEX                            #
+#                                                                        #
+##########################################################################
+
+
+class FileOwnershipIndex:
+    """
+    Reverse path -> package index built from the dpkg .list files or the
+    pacman local files entries. Directory paths are interned once and each
+    directory keeps a sorted "name\\towner,owner" blob, decoded only when a
+    lookup lands in it. Persisted under ~/.cache/pactool/ and rebuilt when
+    the package database directory changes.
+    """
+    formatVersion = 1
+    globCharacters = "*?["
+
+
+
+
+    def __init__(self, manager: str, enabled: bool = True, root: str = "/") -> None:
+        self.manager = manager
+        self.enabled = enabled
+        self.root = root
+        self.path = InventoryCache.cacheDir / f"owners-{manager}.bin"
+
+        # ==> directories[i] IS A SORTED PATH, blobs[i] ITS ENTRIES
+        self.packages = []
+        self.directories = []
+        self.blobs = []
+        self._directoryIds = None
+        self._decoded = {}
+        self._aliases = None
+        self._loaded = False
+
+
+
+
+
+    ##########################################################################
+    #                               SOURCES                                  #
+    ##########################################################################
+
+    def _rooted(self, path: str) -> str:
+        return pathJoin(self.root, path.lstrip("/"))
+
+
+
+
+
+    def source(self) -> str:
+        if self.manager == "apt":
+            return self._rooted(DpkgDatabase.infoDir)
+        if self.manager == "pacman":
+            return self._rooted(PacmanDatabase.localDir)
+        return ""
+
+
+
+
+
+    def stamp(self) -> tuple:
+        # ==> dpkg RENAMES pkg.list-new INTO PLACE AND pacman RECREATES THE PACKAGE DIRECTORY,
+        # ==> EITHER WAY THE DIRECTORY ITSELF GETS A NEW mtime
+        try:
+            st = stat(self.source())
+            return (self.source(), st.st_mtime_ns, st.st_ino)
+        except OSError:
+            return ()
+
+
+
+
+
+    def available(self) -> bool:
+        return bool(self.stamp())
+
+
+
+
+
+    ##########################################################################
+    #                               BUILDING                                 #
+    ##########################################################################
+
+    def _aptLists(self):
+        # ==> (package, paths) FOR EVERY info/<package>[:arch].list
+        with scandir(self.source()) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".list"):
+                    continue
+                try:
+                    with open(entry.path, "r", encoding="utf-8", errors="surrogateescape") as listFile:
+                        yield entry.name[:-len(".list")], listFile.read().splitlines()
+                except OSError:
+                    continue
+
+
+
+
+
+    def _pacmanLists(self):
+        with scandir(self.source()) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                try:
+                    with open(pathJoin(entry.path, "files"), "r", encoding="utf-8", errors="surrogateescape") as filesFile:
+                        lines = filesFile.read().splitlines()
+                except OSError:
+                    continue
+
+
+                # ==> ONLY THE %FILES% SECTION, RELATIVE PATHS WITH A TRAILING / ON DIRECTORIES
+                paths = []
+                inFiles = False
+                for line in lines:
+                    if line.startswith("%"):
+                        inFiles = line == "%FILES%"
+                    elif inFiles and line:
+                        paths.append("/" + line.rstrip("/"))
+
+
+                # ==> name-version-release
+                yield entry.name.rsplit("-", 2)[0], paths
+
+
+
+
+
+    def build(self) -> None:
+        lists = self._aptLists() if self.manager == "apt" else self._pacmanLists()
+        directoryIds = {}
+        entries = []
+        packages = []
+
+
+        for package, paths in lists:
+            packageId = len(packages)
+            packages.append(package)
+
+
+            for path in paths:
+                directory, _, name = path.rpartition("/")
+                if not name or name == ".":
+                    continue
+                directory = directory or "/"
+
+
+                # ==> EVERY DIRECTORY STRING IS STORED ONCE, HOWEVER MANY FILES IT HOLDS
+                directoryId = directoryIds.get(directory)
+                if directoryId is None:
+                    directoryId = directoryIds[directory] = len(entries)
+                    entries.append({})
+                owners = entries[directoryId].get(name)
+                if owners is None:
+                    entries[directoryId][name] = [packageId]
+                elif owners[-1] != packageId:
+                    owners.append(packageId)
+
+
+        self.packages = packages
+        self.directories = sorted(directoryIds)
+        self.blobs = [
+            "\n".join(f"{name}\t{','.join(map(str, owners))}" for name, owners in sorted(entries[directoryIds[directory]].items()))
+            for directory in self.directories
+        ]
+        self._directoryIds = None
+        self._decoded = {}
+        self._loaded = True
+
+
+
+
+
+    ##########################################################################
+    #                              PERSISTENCE                               #
+    ##########################################################################
+
+    def load(self) -> "FileOwnershipIndex":
+        """
+        Load the index from disk, rebuilding (and saving) it when the package database changed.
+        """
+        if self._loaded:
+            return self
+
+
+        currentStamp = self.stamp()
+
+
+        if self.enabled:
+            try:
+                version, storedStamp, packages, directories, blobs = marshalLoads(self.path.read_bytes())
+                if version == self.formatVersion and storedStamp == currentStamp:
+                    self.packages, self.directories, self.blobs = packages, directories, blobs
+                    self._loaded = True
+                    return self
+            except (OSError, ValueError, EOFError, TypeError):
+                pass
+
+
+        self.build()
+        self.save(currentStamp)
+        return self
+
+
+
+
+
+    def save(self, currentStamp: tuple) -> None:
+        if not self.enabled:
+            return
+
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tempPath = self.path.with_name(f"{self.path.name}.{getpid()}.tmp")
+            tempPath.write_bytes(marshalDumps((self.formatVersion, currentStamp, self.packages, self.directories, self.blobs)))
+            replace(tempPath, self.path)
+        except (OSError, ValueError):
+            pass
+
+
+
+
+
+    ##########################################################################
+    #                                LOOKUPS                                 #
+    ##########################################################################
+
+    def _entries(self, directory: str) -> dict:
+        # ==> name -> "owner,owner" FOR ONE DIRECTORY, DECODED ON FIRST USE
+        if self._directoryIds is None:
+            self._directoryIds = {path: index for index, path in enumerate(self.directories)}
+
+
+        directoryId = self._directoryIds.get(directory)
+        if directoryId is None:
+            return {}
+
+
+        entries = self._decoded.get(directoryId)
+        if entries is None:
+            entries = self._decoded[directoryId] = dict(line.split("\t", 1) for line in self.blobs[directoryId].split("\n"))
+        return entries
+
+
+
+
+
+    def _ownerNames(self, owners: str) -> list:
+        return [self.packages[int(owner)] for owner in owners.split(",")]
+
+
+
+
+
+    def aliases(self) -> list:
+        """
+        (alias, target) pairs for top-level directories that are symlinks,
+        e.g. ("/bin", "/usr/bin") on merged-/usr systems where dpkg still
+        records /bin/bash.
+        """
+        if self._aliases is None:
+            self._aliases = []
+            for name in self._entries("/"):
+                rooted = self._rooted(name)
+                if islink(rooted):
+                    target = realpath(rooted)
+                    rootPrefix = realpath(self.root).rstrip("/")
+                    if target.startswith(rootPrefix + "/"):
+                        self._aliases.append((f"/{name}", target[len(rootPrefix):]))
+        return self._aliases
+
+
+
+
+
+    def spellings(self, path: str) -> list:
+        # ==> THE PATH AS GIVEN PLUS ITS OTHER NAMES THROUGH THE TOP-LEVEL SYMLINKS
+        path = normpath(path)
+        spellings = [path]
+
+
+        for alias, target in self.aliases():
+            for source, replacement in ((alias, target), (target, alias)):
+                if path == source or path.startswith(source + "/"):
+                    spellings.append(replacement + path[len(source):])
+        return spellings
+
+
+
+
+
+    def owners(self, path: str) -> list:
+        """
+        Packages owning path (a file or a directory), [] when none does.
+        """
+        self.load()
+        owners = []
+
+
+        for spelling in self.spellings(abspath(path)):
+            directory, _, name = spelling.rpartition("/")
+            found = self._entries(directory or "/").get(name)
+            if found:
+                owners += [owner for owner in self._ownerNames(found) if owner not in owners]
+        return owners
+
+
+
+
+
+    def _directoryRange(self, prefix: str) -> range:
+        # ==> prefix ITSELF AND EVERYTHING BELOW IT ARE ONE CONTIGUOUS RUN OF THE SORTED LIST
+        # ==> ("0" IS THE CHARACTER RIGHT AFTER "/")
+        if prefix == "/":
+            return range(len(self.directories))
+
+
+        start = bisect_left(self.directories, prefix)
+        end = bisect_left(self.directories, prefix + "0", start)
+        return range(start, end)
+
+
+
+
+
+    def glob(self, pattern: str):
+        """
+        Yield (path, owners) for every recorded path matching a shell pattern.
+        Only the directories below the pattern's literal leading part are
+        scanned. A relative pattern ("bin/py*") matches the end of a path.
+        """
+        self.load()
+        seen = set()
+        if not pattern.startswith("/"):
+            pattern = f"/*/{pattern}"
+
+
+        for spelling in self.spellings(pattern):
+            matcher = reCompile(translate(spelling))
+            literal = []
+            for component in spelling.split("/")[1:-1]:
+                if any(character in component for character in self.globCharacters):
+                    break
+                literal.append(component)
+            prefix = "/" + "/".join(literal)
+
+
+            for directoryId in self._directoryRange(prefix):
+                directory = self.directories[directoryId]
+                base = "" if directory == "/" else directory
+                for name, owners in self._entries(directory).items():
+                    path = f"{base}/{name}"
+                    if path not in seen and matcher.match(path):
+                        seen.add(path)
+                        yield path, self._ownerNames(owners)
+
+
+
+
+
+    def orphans(self, directory: str):
+        """
+        Yield every path below directory no package owns, without crossing
+        into other filesystems. An unowned directory is reported once (with a
+        trailing /) instead of listing everything inside it.
+        """
+        self.load()
+        start = normpath(abspath(directory))
+        try:
+            device = lstat(start).st_dev
+        except OSError:
+            return
+
+
+        pending = [start]
+        while pending:
+            current = pending.pop()
+            owned = set()
+            for spelling in self.spellings(current):
+                owned.update(self._entries(spelling))
+
+
+            try:
+                with scandir(current) as entries:
+                    children = sorted(entries, key=lambda entry: entry.name, reverse=True)
+            except OSError:
+                continue
+
+
+            subdirectories = []
+            for entry in children:
+                try:
+                    isDirectory = entry.is_dir(follow_symlinks=False)
+                    if isDirectory and entry.stat(follow_symlinks=False).st_dev != device:
+                        continue
+                except OSError:
+                    continue
+
+
+                if entry.name not in owned:
+                    yield f"{entry.path}/" if isDirectory else entry.path
+                elif isDirectory:
+                    subdirectories.append(entry.path)
+
+
+            # ==> DEPTH FIRST, IN NAME ORDER
+            pending.extend(subdirectories)
@@ -0,0 +1,313 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from shutil import get_terminal_size
+from threading import Condition, Thread, current_thread, main_thread
+import signal
+
+
+# ==> PACTOOL FILES
+from core.formatter import Formatter
+
+
+
+
+##########################################################################
+#                                                                        #
+#                                 PAGER                                  #
+#                                                                        #
+##########################################################################
+
+
+class Pager:
+    """
+    Interactive pager that pulls items lazily from any iterable.
+
+    With background=True a worker thread keeps draining the iterable while
+    the first pages are already on screen. Page boundaries are remembered so
+    the user can go back, and the page height follows terminal resizes
+    (SIGWINCH).
+
+    Keys: Enter/n = next, b/p = previous, q = quit. With allowKeyword=True
+    anything else is returned to the caller as a new search keyword, and
+    n/b/p need the commandPrefix (":b") so they can still be searched for.
+    """
+    reservedLines = 10
+    commandPrefix = ":"
+
+
+
+
+    def __init__(self, items, renderFunc, lineCount=None, header=None, allowKeyword: bool = False, promptAtEnd: bool = False, background: bool = False) -> None:
+        self.renderFunc = renderFunc
+        self.lineCount = lineCount or (lambda item: 1)
+        self.header = header
+        self.allowKeyword = allowKeyword
+        self.promptAtEnd = promptAtEnd
+
+
+        # ==> ITEMS PRODUCED SO FAR, GUARDED BY A CONDITION FOR THE BACKGROUND PRODUCER
+        self._items = []
+        self._source = iter(items)
+        self._done = False
+        self._error = None
+        self._ready = Condition()
+        self._producer = None
+
+
+        # ==> START INDEX OF EVERY PAGE SHOWN SO FAR, AND THE END INDEX CACHED FOR EACH
+        self._pageStarts = [0]
+        self._pageEnds = {}
+        self._height = self._terminalHeight()
+        self._resized = False
+
+
+        if background:
+            self._producer = Thread(target=self._produce, daemon=True)
+            self._producer.start()
+
+
+
+
+
+    ##########################################################################
+    #                                PRODUCER                                #
+    ##########################################################################
+
+
+    def _produce(self) -> None:
+        try:
+            for item in self._source:
+                with self._ready:
+                    self._items.append(item)
+                    self._ready.notify_all()
+        except Exception as error:
+            self._error = error
+        finally:
+            with self._ready:
+                self._done = True
+                self._ready.notify_all()
+
+
+
+
+
+    def _ensure(self, index: int) -> bool:
+        """
+        Make sure item[index] exists, pulling from the source (or waiting for the
+        background producer) only as far as needed. False past the end.
+        """
+        if self._producer is None:
+            while len(self._items) <= index and not self._done:
+                try:
+                    self._items.append(next(self._source))
+                except StopIteration:
+                    self._done = True
+            return index < len(self._items)
+
+
+        with self._ready:
+            while len(self._items) <= index and not self._done:
+                self._ready.wait()
+            if self._error is not None and index >= len(self._items):
+                raise self._error
+            return index < len(self._items)
+
+
+
+
+
+    ##########################################################################
+    #                                 PAGES                                  #
+    ##########################################################################
+
+
+    def _terminalHeight(self) -> int:
+        return max(1, get_terminal_size().lines - self.reservedLines)
+
+
+
+
+
+    def _onResize(self, signum, frame) -> None:
+        self._resized = True
+
+
+
+
+
+    def _pageEnd(self, start: int) -> int:
+        # ==> A RESIZE INVALIDATES EVERY CACHED BOUNDARY
+        if self._resized:
+            self._resized = False
+            self._height = self._terminalHeight()
+            self._pageEnds = {}
+
+
+        if start in self._pageEnds:
+            return self._pageEnds[start]
+
+
+        end = start
+        lines = 0
+        while self._ensure(end):
+            needed = self.lineCount(self._items[end])
+            if lines + needed > self._height and end > start:
+                break
+            lines += needed
+            end += 1
+
+
+        self._pageEnds[start] = end
+        return end
+
+
+
+
+
+    def _totalPages(self, pageNumber: int, start: int, end: int):
+        # ==> ONLY KNOWN ONCE EVERYTHING HAS BEEN PRODUCED (ESTIMATED FROM THIS PAGE'S SIZE)
+        if not self._done:
+            return None
+        remaining = len(self._items) - end
+        pageSize = max(1, end - start)
+        return pageNumber + (remaining + pageSize - 1) // pageSize
+
+
+
+
+
+    ##########################################################################
+    #                                  RUN                                   #
+    ##########################################################################
+
+
+    def run(self):
+        """
+        Show pages until the items run out or the user quits.
+        Returns a new keyword when allowKeyword is set and one was typed.
+        """
+        previousHandler = None
+        canTrapResize = hasattr(signal, "SIGWINCH") and current_thread() is main_thread()
+        if canTrapResize:
+            previousHandler = signal.signal(signal.SIGWINCH, self._onResize)
+
+
+        try:
+            return self._loop()
+        finally:
+            if canTrapResize:
+                signal.signal(signal.SIGWINCH, previousHandler or signal.SIG_DFL)
+
+
+
+
+
+    def _loop(self):
+        page = 0
+
+
+        while True:
+            start = self._pageStarts[page]
+            end = self._pageEnd(start)
+            if end == start:
+                return None
+
+
+            if self.header:
+                self.header(page + 1, self._totalPages(page + 1, start, end))
+            self.renderFunc(self._items[start:end], startIndex=start)
+
+
+            hasNext = self._ensure(end)
+            if not hasNext and not self.promptAtEnd:
+                return None
+
+
+            userInput = self._prompt(hasNext, page > 0)
+            command = self._command(userInput)
+
+
+            if command == "q":
+                return None
+            elif command in ("b", "p"):
+                page = max(0, page - 1)
+            elif command in ("", "n") or command is None and not self.allowKeyword:
+                if not hasNext:
+                    return None
+                # ==> THE NEXT PAGE STARTS WHERE THIS ONE ENDED (EVEN IF A RESIZE MOVED IT)
+                self._pageStarts[page + 1:] = [end]
+                page += 1
+            else:
+                return userInput
+            print()
+
+
+
+
+
+    def _command(self, userInput: str):
+        """
+        The navigation key the input stands for, or None for a keyword.
+        While keywords are allowed only Enter, q and prefixed keys navigate.
+        """
+        command = userInput.lower()
+        if command.startswith(self.commandPrefix):
+            command = command[len(self.commandPrefix):]
+        elif self.allowKeyword and command not in ("", "q"):
+            return None
+        return command if command in ("", "n", "b", "p", "q") else None
+
+
+
+
+
+    def _prompt(self, hasNext: bool, hasPrevious: bool) -> str:
+        options = []
+        if hasNext:
+            options.append("Press enter to continue")
+        if hasPrevious:
+            options.append(f"'{self.commandPrefix if self.allowKeyword else ''}B' to go back")
+        options.append("'Q' to quit")
+        if self.allowKeyword:
+            options.append("or type a new keyword")
+
+
+        print(f"{Formatter.headerColor}\n{' | '.join(options)}\n")
+        return input(Formatter.colorText("--> ", Formatter.headerColor)).strip()
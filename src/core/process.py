@@ -0,0 +1,107 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from subprocess import run as subprocessRun
+from shlex import join as shlexJoin
+from threading import Lock
+
+
+# ==> PACTOOL FILES
+from core.formatter import Formatter
+
+
+
+
+##########################################################################
+#                                                                        #
+#                            SPAWN COUNTER                               #
+#                                                                        #
+##########################################################################
+
+
+class SpawnCounter:
+    """
+    Counts every subprocess Pactool starts during one invocation.
+    """
+    count = 0
+    commands = []
+    _lock = Lock()
+
+
+
+
+    @classmethod
+    def record(cls, command) -> None:
+        if isinstance(command, (list, tuple)):
+            command = shlexJoin(str(part) for part in command)
+
+
+        with cls._lock:
+            cls.count += 1
+            cls.commands.append(str(command))
+
+
+
+
+
+    @classmethod
+    def report(cls) -> None:
+        print()
+        print(Formatter.colorText(f"Spawned {cls.count} subprocess(es)", Formatter.headerColor, Formatter.bold))
+        for command in cls.commands:
+            print(f"{Formatter.tab4}{command}")
+
+
+
+
+
+
+##########################################################################
+#                                                                        #
+#                                  RUN                                   #
+#                                                                        #
+##########################################################################
+
+
+def run(*args, **kwargs):
+    """
+    Drop-in replacement for subprocess.run that feeds the SpawnCounter.
+    """
+    SpawnCounter.record(args[0] if args else kwargs.get("args"))
+    return subprocessRun(*args, **kwargs)
@@ -0,0 +1,174 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from datetime import datetime
+
+
+# ==> PACTOOL FILES
+from core.formatter import Formatter
+
+
+
+
+##########################################################################
+#                                                                        #
+#                            PACKAGE RECORD                              #
+#                                                                        #
+##########################################################################
+
+
+class PackageRecord:
+    """
+    One installed package. Sizes are kept as integer bytes and dates as
+    float timestamps, text is only produced when something is rendered.
+    """
+    __slots__ = ("name", "sizeBytes", "installedTs", "updatedTs", "section", "isUser")
+    dateFormat = "%a %d %b %Y %I:%M:%S %p %z"
+    _dateCache = {}
+
+
+
+
+    def __init__(self, name: str, sizeBytes: int = 0, installedTs: float = 0.0, updatedTs: float = 0.0, section: str = "", isUser: bool = False) -> None:
+        self.name = name
+        self.sizeBytes = sizeBytes
+        self.installedTs = installedTs
+        self.updatedTs = updatedTs
+        self.section = section
+        self.isUser = isUser
+
+
+
+
+
+    def __repr__(self) -> str:
+        return f"PackageRecord({self.name!r}, {self.sizeBytes}, {self.installedTs}, {self.updatedTs}, {self.section!r}, {self.isUser})"
+
+
+
+
+
+    ##########################################################################
+    #                             SERIALIZATION                              #
+    ##########################################################################
+
+
+    def toRow(self) -> tuple:
+        # ==> COMPACT FORM FOR THE INVENTORY CACHE (isUser IS RECOMPUTED ON LOAD)
+        return (self.name, self.sizeBytes, self.installedTs, self.updatedTs, self.section)
+
+
+
+
+
+    @classmethod
+    def fromRow(cls, row: tuple, isUser: bool = False) -> "PackageRecord":
+        name, sizeBytes, installedTs, updatedTs, section = row
+        return cls(name, sizeBytes, installedTs, updatedTs, section, isUser)
+
+
+
+
+
+    def toDict(self) -> dict:
+        # ==> MACHINE-READABLE FORM FOR --format (BYTES, ISO-8601 DATES)
+        return {
+            "name": self.name,
+            "sizeBytes": self.sizeBytes,
+            "installed": self.isoDate(self.installedTs),
+            "updated": self.isoDate(self.updatedTs),
+            "user": self.isUser,
+            "section": self.section,
+        }
+
+
+
+
+
+    @classmethod
+    def isoDate(cls, timestamp: float):
+        if not timestamp:
+            return None
+        return datetime.fromtimestamp(timestamp).astimezone().isoformat(timespec="seconds")
+
+
+
+
+
+    ##########################################################################
+    #                               RENDERING                                #
+    ##########################################################################
+
+
+    def sizeParts(self) -> tuple:
+        # ==> ("1.50", "MiB")
+        value, _, unit = Formatter.formatSize(self.sizeBytes).partition(" ")
+        return value, unit
+
+
+
+
+
+    def installedText(self) -> str:
+        return self.formatDate(self.installedTs)
+
+
+
+
+
+    def updatedText(self) -> str:
+        return self.formatDate(self.updatedTs)
+
+
+
+
+
+    @classmethod
+    def formatDate(cls, timestamp: float) -> str:
+        if not timestamp:
+            return "N/A"
+
+
+        # ==> MANY PACKAGES SHARE THE SAME SECOND (ONE TRANSACTION), FORMAT EACH ONCE
+        second = int(timestamp)
+        formatted = cls._dateCache.get(second)
+        if formatted is None:
+            formatted = datetime.fromtimestamp(second).strftime(cls.dateFormat)
+            cls._dateCache[second] = formatted
+        return formatted
@@ -0,0 +1,175 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from io import StringIO
+import sys
+
+
+# ==> PACTOOL FILES
+from core.formatter import Formatter
+
+
+
+
+##########################################################################
+#                                                                        #
+#                            TABLE RENDERER                              #
+#                                                                        #
+##########################################################################
+
+
+class TableRenderer:
+    """
+    Builds a whole page of output in memory and writes it with one call.
+    Row layouts are compiled once into a str.format template, so each row
+    costs a single format() instead of several colorText() calls and a
+    print().
+
+    Example:
+        table = TableRenderer([
+            TableRenderer.column(4, style=Formatter.bold),
+            TableRenderer.column(nameWidth, dynamicStyle=True),
+        ])
+        table.addRow(1, Formatter.userPackageColor, "vim")
+        table.flush()
+    """
+
+
+
+
+    def __init__(self, columns: list = (), separator: str = "  ", stream=None) -> None:
+        self.template = self.compile(columns, separator) if columns else ""
+        self.stream = stream or sys.stdout
+        self.buffer = StringIO()
+
+
+
+
+
+    ##########################################################################
+    #                                LAYOUT                                  #
+    ##########################################################################
+
+
+    @classmethod
+    def column(cls, width: int = 0, align: str = "<", style: str = "", dynamicStyle: bool = False, prefix: str = "", suffix: str = "", span: tuple = ()) -> dict:
+        """
+        One column of a row. With dynamicStyle=True the row supplies the
+        style (e.g. user vs system color) as an extra value before the text.
+        span lists the widths of further values that share the same colored
+        span, space separated (e.g. a size value and its unit).
+        """
+        return {"width": width, "align": align, "style": style, "dynamicStyle": dynamicStyle, "prefix": prefix, "suffix": suffix, "span": span}
+
+
+
+
+
+    @classmethod
+    def compile(cls, columns: list, separator: str = "  ") -> str:
+        parts = []
+        field = 0
+        reset = Formatter.reset if Formatter.colorsEnabled else ""
+
+
+        for column in columns:
+            prefix = cls._escape(column["prefix"])
+            suffix = cls._escape(column["suffix"])
+
+
+            # ==> COLORS ARE BAKED INTO THE TEMPLATE (OR DROPPED WHEN DISABLED)
+            if column["dynamicStyle"]:
+                style = f"{{{field}}}"
+                field += 1
+            else:
+                style = cls._escape(column["style"]) if Formatter.colorsEnabled else ""
+
+
+            # ==> THE COLUMN'S OWN VALUE PLUS ANY SPANNED ONES, ALL INSIDE ONE STYLE ... RESET
+            fields = []
+            for width in (column["width"],) + tuple(column["span"]):
+                spec = f":{column['align']}{width}" if width else ""
+                fields.append(f"{{{field}{spec}}}")
+                field += 1
+            closing = reset if style else ""
+            parts.append(f"{prefix}{style}{' '.join(fields)}{closing}{suffix}")
+
+
+        return separator.join(parts)
+
+
+
+
+
+    @classmethod
+    def _escape(cls, text: str) -> str:
+        return text.replace("{", "{{").replace("}", "}}")
+
+
+
+
+
+    ##########################################################################
+    #                                OUTPUT                                  #
+    ##########################################################################
+
+
+    def addRow(self, *values) -> None:
+        self.buffer.write(self.template.format(*values))
+        self.buffer.write("\n")
+
+
+
+
+
+    def addLine(self, text: str = "") -> None:
+        self.buffer.write(text)
+        self.buffer.write("\n")
+
+
+
+
+
+    def flush(self) -> None:
+        # ==> ONE WRITE FOR THE WHOLE PAGE
+        text = self.buffer.getvalue()
+        if text:
+            self.stream.write(text)
+            self.stream.flush()
+        self.buffer = StringIO()
@@ -0,0 +1,613 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from os import stat, replace, getpid, scandir
+from os.path import join as pathJoin
+from array import array
+from collections import Counter
+from marshal import dumps as marshalDumps, loads as marshalLoads
+
+
+# ==> PACTOOL FILES
+from core.cache import InventoryCache
+from core.database import DpkgDatabase, PacmanDatabase
+
+
+
+
+##########################################################################
+#                                                                        #
+#                             SEARCH INDEX                               #
+#                                                                        #
+##########################################################################
+
+
+class SearchIndex:
+    """
+    Offline replacement for apt search / pacman -Ss.
+    Names and short descriptions from the sync databases are kept in a
+    trigram index under ~/.cache/pactool/, rebuilt only when one of the
+    source files changes.
+    """
+    formatVersion = 2
+    aptListsDir = "/var/lib/apt/lists"
+    pacmanSyncDir = "/var/lib/pacman/sync"
+    aptFields = {"Package", "Version", "Architecture", "Description", "Status"}
+
+
+
+
+    def __init__(self, manager: str, enabled: bool = True, root: str = "/") -> None:
+        self.manager = manager
+        self.enabled = enabled
+        self.root = root
+        self.path = InventoryCache.cacheDir / f"search-{manager}.bin"
+
+        # ==> PARALLEL COLUMNS, ONE ROW PER PACKAGE
+        self.names = []
+        self.lines = []
+        self.descriptions = []
+        self.installed = []
+        self.postings = {}
+        self.namePostings = {}
+        self._haystacks = None
+        self._lowerNames = None
+        self._namesByLength = None
+        self._loaded = False
+
+
+
+
+
+    ##########################################################################
+    #                               SOURCES                                  #
+    ##########################################################################
+
+    def _rooted(self, path: str) -> str:
+        return pathJoin(self.root, path.lstrip("/"))
+
+
+
+
+
+    def sources(self) -> list:
+        """
+        Files the index is built from, in the order they are read.
+        """
+        if self.manager == "apt":
+            # ==> INSTALLED STATE COMES FROM dpkg, REPOSITORIES FROM THE LISTS
+            paths = [self._rooted(DpkgDatabase.statusPath)]
+            directory = self._rooted(self.aptListsDir)
+            suffix = "_Packages"
+        elif self.manager == "pacman":
+            paths = [self._rooted(PacmanDatabase.localDir)]
+            directory = self._rooted(self.pacmanSyncDir)
+            suffix = ".db"
+        else:
+            return []
+
+
+        try:
+            with scandir(directory) as entries:
+                paths += sorted(entry.path for entry in entries if entry.name.endswith(suffix) and entry.is_file())
+        except OSError:
+            pass
+
+
+        return paths
+
+
+
+
+
+    def stamp(self) -> tuple:
+        stamps = []
+        for path in self.sources():
+            try:
+                st = stat(path)
+                stamps.append((path, st.st_mtime_ns, st.st_ino, st.st_size))
+            except OSError:
+                continue
+        return tuple(stamps)
+
+
+
+
+
+    def available(self) -> bool:
+        # ==> THE INSTALLED DATABASE ALONE IS ENOUGH (apt SEARCH SHOWS THE SAME WITHOUT LISTS)
+        return bool(self.stamp())
+
+
+
+
+
+    ##########################################################################
+    #                               BUILDING                                 #
+    ##########################################################################
+
+    def _aptEntries(self):
+        # ==> (name, version, architecture, repository, description, installed)
+        sources = self.sources()
+        installed = {}
+
+
+        for stanza in DpkgDatabase(self.root).installedPackages(self.aptFields):
+            if stanza.get("Status", "").endswith(" installed"):
+                installed[stanza["Package"]] = stanza
+
+
+        seen = set()
+        for path in sources[1:]:
+            # ==> deb.debian.org_debian_dists_bookworm_main_binary-amd64_Packages -> bookworm
+            fileName = path.rsplit("/", 1)[-1]
+            repository = fileName.split("_dists_", 1)[-1].split("_", 1)[0] if "_dists_" in fileName else fileName.split("_", 1)[0]
+
+
+            for stanza in DpkgDatabase.readStanzas(path, self.aptFields):
+                name = stanza.get("Package")
+                if not name or name in seen:
+                    continue
+                seen.add(name)
+                yield (name, stanza.get("Version", ""), stanza.get("Architecture", ""), repository, stanza.get("Description", ""), name in installed)
+
+
+        # ==> LOCALLY INSTALLED PACKAGES NO REPOSITORY KNOWS ABOUT (apt SHOWS THEM AS "now")
+        for name, stanza in installed.items():
+            if name not in seen:
+                yield (name, stanza.get("Version", ""), stanza.get("Architecture", ""), "now", stanza.get("Description", ""), True)
+
+
+
+
+
+    def _pacmanEntries(self):
+        import tarfile
+        sources = self.sources()
+        database = PacmanDatabase(self.root)
+        installed = {entry["%NAME%"] for entry in database.entries()} if database.available() else set()
+
+
+        for path in sources[1:]:
+            repository = path.rsplit("/", 1)[-1][:-len(".db")]
+
+
+            try:
+                with tarfile.open(path, "r:*") as archive:
+                    for member in archive:
+                        if not member.isfile() or not member.name.endswith("/desc"):
+                            continue
+                        entry = database.parseDesc(archive.extractfile(member).read().decode("utf-8", "replace"))
+                        if entry:
+                            name = entry["%NAME%"]
+                            yield (name, entry.get("%VERSION%", ""), "", repository, entry.get("%DESC%", ""), name in installed)
+            except (OSError, tarfile.TarError, EOFError):
+                continue
+
+
+
+
+
+    def _formatLine(self, name, version, architecture, repository, isInstalled) -> str:
+        # ==> SAME FIRST LINE AS THE PACKAGE MANAGER'S OWN SEARCH OUTPUT
+        if self.manager == "apt":
+            line = f"{name}/{repository} {version} {architecture}"
+        else:
+            line = f"{repository}/{name} {version}"
+        return f"{line} [installed]" if isInstalled else line
+
+
+
+
+
+    @staticmethod
+    def trigrams(text: str) -> set:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+
+
+
+    @staticmethod
+    def bigrams(text: str) -> set:
+        return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+
+
+
+    def build(self) -> None:
+        entries = self._aptEntries() if self.manager == "apt" else self._pacmanEntries()
+        self.names, self.lines, self.descriptions, self.installed = [], [], [], []
+        postings = {}
+        namePostings = {}
+
+
+        for index, (name, version, architecture, repository, description, isInstalled) in enumerate(entries):
+            self.names.append(name)
+            self.lines.append(self._formatLine(name, version, architecture, repository, isInstalled))
+            self.descriptions.append(description)
+            self.installed.append(isInstalled)
+
+
+            for gram in self.trigrams(f"{name}\n{description}".lower()):
+                bucket = postings.get(gram)
+                if bucket is None:
+                    postings[gram] = bucket = array("i")
+                bucket.append(index)
+
+
+            # ==> NAME-ONLY BIGRAMS FEED THE FUZZY PREFILTER
+            for gram in self.bigrams(name.lower()):
+                bucket = namePostings.get(gram)
+                if bucket is None:
+                    namePostings[gram] = bucket = array("i")
+                bucket.append(index)
+
+
+        self.postings = postings
+        self.namePostings = namePostings
+        self._haystacks = None
+        self._lowerNames = None
+        self._namesByLength = None
+        self._loaded = True
+
+
+
+
+
+    ##########################################################################
+    #                              PERSISTENCE                               #
+    ##########################################################################
+
+    def load(self) -> "SearchIndex":
+        """
+        Load the index from disk, rebuilding (and saving) it when any source changed.
+        """
+        if self._loaded:
+            return self
+
+
+        currentStamp = self.stamp()
+
+
+        if self.enabled:
+            try:
+                version, storedStamp, columns, postings, namePostings = marshalLoads(self.path.read_bytes())
+                if version == self.formatVersion and storedStamp == currentStamp:
+                    self.names, self.lines, self.descriptions, self.installed = columns
+                    self.postings = postings
+                    self.namePostings = namePostings
+                    self._loaded = True
+                    return self
+            except (OSError, ValueError, EOFError, TypeError):
+                pass
+
+
+        self.build()
+        self.save(currentStamp)
+        return self
+
+
+
+
+
+    def save(self, currentStamp: tuple) -> None:
+        if not self.enabled:
+            return
+
+
+        # ==> POSTINGS ARE STORED AS RAW int32 BYTES, MARSHAL HANDLES THOSE IN ONE COPY
+        postings = {gram: bucket.tobytes() for gram, bucket in self.postings.items()}
+        namePostings = {gram: bucket.tobytes() for gram, bucket in self.namePostings.items()}
+        columns = (self.names, self.lines, self.descriptions, self.installed)
+
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tempPath = self.path.with_name(f"{self.path.name}.{getpid()}.tmp")
+            tempPath.write_bytes(marshalDumps((self.formatVersion, currentStamp, columns, postings, namePostings)))
+            replace(tempPath, self.path)
+        except (OSError, ValueError):
+            pass
+
+
+        self.postings = postings
+        self.namePostings = namePostings
+
+
+
+
+
+    ##########################################################################
+    #                                QUERIES                                 #
+    ##########################################################################
+
+    def _posting(self, gram: str, postings: dict = None) -> array:
+        bucket = (self.postings if postings is None else postings).get(gram, b"")
+        if isinstance(bucket, array):
+            return bucket
+        decoded = array("i")
+        decoded.frombytes(bucket)
+        return decoded
+
+
+
+
+
+    def candidates(self, terms: list):
+        """
+        Row ids that contain every trigram of every term (a superset of the
+        real matches). None means "no trigram to filter on", i.e. every row.
+        """
+        grams = set()
+        for term in terms:
+            grams |= self.trigrams(term)
+        if not grams:
+            return None
+
+
+        # ==> INTERSECT SMALLEST POSTING LISTS FIRST
+        buckets = sorted((self._posting(gram) for gram in grams), key=len)
+        result = set(buckets[0])
+        for bucket in buckets[1:]:
+            if not result:
+                break
+            result.intersection_update(bucket)
+        return result
+
+
+
+
+
+    def haystacks(self) -> list:
+        if self._haystacks is None:
+            self._haystacks = [f"{name}\n{description}".lower() for name, description in zip(self.names, self.descriptions)]
+        return self._haystacks
+
+
+
+
+
+    def lowerNames(self) -> list:
+        if self._lowerNames is None:
+            self._lowerNames = [name.lower() for name in self.names]
+        return self._lowerNames
+
+
+
+
+
+    def rank(self, index: int, terms: list, userPackages=()) -> tuple:
+        # ==> EXACT NAME, NAME PREFIX, NAME SUBSTRING, THEN DESCRIPTION ONLY
+        name = self.lowerNames()[index]
+        score = 0
+        for term in terms:
+            if name == term:
+                continue
+            elif name.startswith(term):
+                score += 1
+            elif term in name:
+                score += 2
+            else:
+                score += 3
+        return (score, not self.installed[index], self.names[index] not in userPackages, len(name), name)
+
+
+
+
+
+    def search(self, keyword: str, userPackages=()) -> list:
+        """
+        (line, description) pairs for every package whose name or description
+        contains all words of the keyword, best matches first.
+        """
+        self.load()
+        terms = keyword.lower().split()
+        if not terms:
+            return []
+
+
+        candidates = self.candidates(terms)
+        rows = range(len(self.names)) if candidates is None else candidates
+        haystacks = self.haystacks()
+        matches = [index for index in rows if all(term in haystacks[index] for term in terms)]
+        matches.sort(key=lambda index: self.rank(index, terms, userPackages))
+
+
+        return [(self.lines[index], self.descriptions[index]) for index in matches]
+
+
+
+
+
+    ##########################################################################
+    #                             FUZZY QUERIES                              #
+    ##########################################################################
+
+    @staticmethod
+    def maxDistance(term: str) -> int:
+        # ==> SHORT WORDS WOULD MATCH HALF THE REPOSITORY WITH ANY TYPO ALLOWED
+        if len(term) < 4:
+            return 0
+        return 1 if len(term) < 8 else 2
+
+
+
+
+
+    @staticmethod
+    def distances(term: str, name: str, limit: int) -> tuple:
+        """
+        Bounded optimal-string-alignment distance (a swap counts as one typo)
+        from term to the whole name and to the closest prefix of the name.
+        Anything above the limit comes back as limit + 1.
+        """
+        termLength = len(term)
+        target = name[:termLength + limit]
+        over = limit + 1
+        previous = None
+        row = list(range(len(target) + 1))
+
+
+        for i in range(1, termLength + 1):
+            current = [i] + [over] * len(target)
+            low = max(1, i - limit)
+            high = min(len(target), i + limit)
+            for j in range(low, high + 1):
+                cost = 0 if term[i - 1] == target[j - 1] else 1
+                value = min(row[j] + 1, current[j - 1] + 1, row[j - 1] + cost)
+                if cost and i > 1 and j > 1 and term[i - 1] == target[j - 2] and term[i - 2] == target[j - 1]:
+                    value = min(value, previous[j - 2] + 1)
+                current[j] = value
+
+
+            # ==> THE BEST POSSIBLE RESULT IS ALREADY OUT OF BOUNDS
+            if min(current[low:high + 1], default=over) > limit and i > limit:
+                return over, over
+            previous, row = row, current
+
+
+        prefix = min(row[max(0, termLength - limit):min(len(target), termLength + limit) + 1], default=over)
+        full = row[len(name)] if len(name) <= len(target) else over
+        return min(full, over), min(prefix, over)
+
+
+
+
+
+    def _fuzzyCandidates(self, term: str, limit: int) -> set:
+        # ==> q-GRAM LEMMA: A NAME (OR PREFIX) WITHIN limit EDITS KEEPS MOST BIGRAMS OF THE TERM
+        grams = self.bigrams(term)
+        threshold = len(grams) - 3 * limit
+        candidates = set()
+
+
+        if threshold >= 1:
+            counts = Counter()
+            for gram in grams:
+                counts.update(self._posting(gram, self.namePostings))
+            candidates.update(index for index, count in counts.items() if count >= threshold)
+        else:
+            # ==> TOO FEW BIGRAMS TO FILTER ON: ONLY NAMES OF A SIMILAR LENGTH CAN BE CLOSE
+            if self._namesByLength is None:
+                self._namesByLength = {}
+                for index, name in enumerate(self.names):
+                    self._namesByLength.setdefault(len(name), []).append(index)
+            for length in range(len(term) - limit, len(term) + limit + 1):
+                candidates.update(self._namesByLength.get(length, ()))
+
+
+        return candidates
+
+
+
+
+
+    def _fuzzyTerm(self, term: str) -> dict:
+        """
+        {row: (matchClass, distance)} for one word. Classes: 0 exact name,
+        1 name prefix, 2 name substring, 3 name within the typo limit,
+        4 name prefix within the typo limit, 5 description only.
+        """
+        names = self.lowerNames()
+        haystacks = self.haystacks()
+        matches = {}
+
+
+        # ==> EXACT OCCURRENCES FIRST (THE SAME MATCHES AS A PLAIN SEARCH)
+        candidates = self.candidates([term])
+        for index in (range(len(names)) if candidates is None else candidates):
+            name = names[index]
+            if name == term:
+                matches[index] = (0, 0)
+            elif name.startswith(term):
+                matches[index] = (1, 0)
+            elif term in name:
+                matches[index] = (2, 0)
+            elif term in haystacks[index]:
+                matches[index] = (5, 0)
+
+
+        # ==> THEN TYPOS, VERIFIED WITH A BANDED EDIT DISTANCE
+        limit = self.maxDistance(term)
+        if limit:
+            for index in self._fuzzyCandidates(term, limit):
+                if matches.get(index, (5,))[0] < 5:
+                    continue
+                full, prefix = self.distances(term, names[index], limit)
+                if full <= limit:
+                    matches[index] = (3, full)
+                elif prefix <= limit:
+                    matches[index] = (4, prefix)
+
+
+        return matches
+
+
+
+
+
+    def fuzzySearch(self, keyword: str, userPackages=()) -> list:
+        """
+        Typo-tolerant variant of search(): every word must occur in the name
+        or description, or be within a few edits of the name or its prefix.
+        Ranked by name match, description match, installed, then user packages.
+        """
+        self.load()
+        terms = keyword.lower().split()
+        if not terms:
+            return []
+
+
+        scores = None
+        for term in terms:
+            termMatches = self._fuzzyTerm(term)
+            if scores is None:
+                scores = termMatches
+            else:
+                scores = {index: (max(scores[index][0], match[0]), scores[index][1] + match[1]) for index, match in termMatches.items() if index in scores}
+            if not scores:
+                return []
+
+
+        names = self.lowerNames()
+        ranked = sorted(scores, key=lambda index: (scores[index], not self.installed[index], self.names[index] not in userPackages, len(names[index]), names[index]))
+        return [(self.lines[index], self.descriptions[index]) for index in ranked]
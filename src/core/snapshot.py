@@ -0,0 +1,554 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+
+# ==> PACTOOL FILES
+from core.process import run
+from core.record import PackageRecord
+from core.graph import DependencyGraph
+from core.database import DpkgDatabase, PacmanDatabase
+from core.inventory import IncrementalInventory
+
+
+
+
+##########################################################################
+#                                                                        #
+#                           PACKAGE SNAPSHOT                             #
+#                                                                        #
+##########################################################################
+
+
+class PackageSnapshot:
+    """
+    Per-invocation view of the installed packages. Every piece of data is
+    computed at most once (and persisted in the inventory cache), so
+    commands can ask for it as often as they like.
+    """
+
+
+
+    def __init__(self, Pactool=None) -> None:
+        self.pactool = Pactool
+        self._inventory = None
+        self._signedEntries = None
+        self._changedHint = None
+        self.invalidate(refreshCache=False)
+
+
+
+
+
+    def invalidate(self, refreshCache: bool = True, changed: set = None) -> None:
+        # ==> FORGET EVERYTHING (E.G. AFTER AN INSTALL OR UPGRADE CHANGED THE SYSTEM)
+        self._packages = None
+        self._rows = None
+        self._packageNames = None
+        self._userPackages = None
+        self._reverseDependencies = None
+        self._reverseDependencyNodes = None
+        self._optionalDependencies = None
+        self._dependencyGraph = None
+
+
+        # ==> CHANGE HINTS ADD UP UNTIL THE NEXT COLLECT; ONE UNKNOWN CHANGE MEANS "CHECK EVERYTHING"
+        if changed is None or self._changedHint is None:
+            self._changedHint = None
+        else:
+            self._changedHint = self._changedHint | set(changed)
+
+
+        if refreshCache:
+            self.pactool.cache.refresh()
+
+
+
+
+
+    def _cached(self, section: str, builder):
+        value = self.pactool.cache.get(section)
+        if value is None:
+            value = builder()
+            self.pactool.cache.put(section, value)
+        return value
+
+
+
+
+
+    ##########################################################################
+    #                               INVENTORY                                #
+    ##########################################################################
+
+
+    def packages(self) -> list:
+        """
+        Installed package records, tagged with "isUser".
+        The list is shared, so callers must not modify it in place.
+        """
+        if self._packages is None:
+            rows = self._signedRows() if self.signedEntries() else self._cached("packages", self._collectRows)
+            userPkgs = self.userPackages()
+            self._packages = [PackageRecord.fromRow(row, row[0] in userPkgs) for row in rows]
+        return self._packages
+
+
+
+
+
+    def streamPackages(self):
+        """
+        Yield the same records as packages(), but as soon as each one is read
+        when nothing is loaded or cached yet. The finished list is kept (and
+        cached) exactly as packages() would.
+        """
+        signed = self.signedEntries()
+        if self._packages is not None or (not signed and self.pactool.cache.get("packages") is not None):
+            yield from self.packages()
+            return
+
+
+        # ==> SIGNED ENTRIES CARRY THE EXPLICIT FLAG, WHICH IS KNOWN AS SOON AS EACH ROW IS
+        userPkgs = None if signed else self.userPackages()
+        inventory = self.inventory()
+        records = []
+
+
+        # ==> THE INCREMENTAL INVENTORY STREAMS TOO (UNCHANGED PACKAGES COME STRAIGHT FROM MEMORY)
+        if inventory.available():
+            source = (PackageRecord.fromRow(row) for row in inventory.iterRows(self._changedHint))
+        else:
+            source = self.pactool.packages.iterPackages()
+
+
+        for record in source:
+            record.isUser = record.name in (inventory.explicitSeen if signed else userPkgs)
+            records.append(record)
+            yield record
+
+
+        if inventory.available():
+            self._changedHint = set()
+        if signed:
+            self._rows = [record.toRow() for record in records]
+            self._userPackages = inventory.explicit
+        else:
+            self.pactool.cache.put("packages", [record.toRow() for record in records])
+        self._packages = records
+
+
+
+
+
+    def packageNames(self) -> set:
+        if self._packageNames is None:
+            self._packageNames = {pkg.name for pkg in self.packages()}
+        return self._packageNames
+
+
+
+
+
+    def signedEntries(self) -> bool:
+        """
+        True on pacman with a readable local database: %REASON% lives in the
+        desc files, which pacman -D rewrites in place without changing the
+        cache stamp, so rows and the explicit set always come from the
+        inventory's per-desc signatures instead of the inventory cache.
+        """
+        if self._signedEntries is None:
+            self._signedEntries = self.pactool.manager.defaultPackageManager == "pacman" and self.inventory().available()
+        return self._signedEntries
+
+
+
+
+
+    def _signedRows(self) -> list:
+        if self._rows is None:
+            self._rows = self._collectRows()
+        return self._rows
+
+
+
+
+
+    def inventory(self) -> IncrementalInventory:
+        if self._inventory is None:
+            self._inventory = IncrementalInventory(self.pactool.manager.defaultPackageManager, self.pactool.cache.enabled)
+        return self._inventory
+
+
+
+
+
+    def _collectRows(self) -> list:
+        # ==> REUSE EVERY PACKAGE THAT DID NOT CHANGE SINCE THE LAST COLLECT
+        inventory = self.inventory()
+        if inventory.available():
+            rows = inventory.rows(self._changedHint)
+            self._changedHint = set()
+            return rows
+
+
+        if self.pactool.manager.defaultPackageManager == "apt":
+            packages = self.pactool.packages.collectAptPackages()
+        elif self.pactool.manager.defaultPackageManager == "pacman":
+            packages = self.pactool.packages.collectPacmanPackages()
+        else:
+            return []
+
+
+        return [pkg.toRow() for pkg in packages]
+
+
+
+
+
+    ##########################################################################
+    #                             USER PACKAGES                              #
+    ##########################################################################
+
+
+    def userPackages(self) -> set:
+        if self._userPackages is None and self.signedEntries():
+            self._signedRows()
+            self._userPackages = self.inventory().explicit
+        elif self._userPackages is None:
+            self._userPackages = set(self._cached("userPackages", lambda: sorted(self._queryUserPackages())))
+        return self._userPackages
+
+
+
+
+
+    def isUserPackage(self, packageName: str) -> bool:
+        return packageName in self.userPackages()
+
+
+
+
+
+    def _queryUserPackages(self) -> set:
+        pacmanDatabase = self.pactool.packages.pacmanDatabase
+
+
+        if self.pactool.manager.defaultPackageManager == "pacman" and pacmanDatabase.available():
+            return pacmanDatabase.explicitPackages()
+
+
+        elif self.pactool.manager.defaultPackageManager == "pacman":
+            result = run(["pacman", "-Qe"], capture_output=True, text=True)
+            return {line.split()[0] for line in result.stdout.strip().splitlines() if line}
+
+
+        elif self.pactool.manager.defaultPackageManager == "apt":
+            result = run(["apt-mark", "showmanual"], capture_output=True, text=True)
+            return {line.strip() for line in result.stdout.strip().splitlines() if line}
+
+
+        return set()
+
+
+
+
+
+    ##########################################################################
+    #                         REVERSE DEPENDENCIES                           #
+    ##########################################################################
+
+
+    def reverseDependencies(self) -> dict:
+        if self._reverseDependencies is None:
+            self._reverseDependencies = self._cached("reverseDependencies", self._buildReverseDependencies)
+        return self._reverseDependencies
+
+
+
+
+
+    def _buildReverseDependencies(self) -> dict:
+        return self._resolveReverseDependencies(sorted(self.packageNames()))
+
+
+
+
+
+    def reverseDependenciesOf(self, packageNames: list) -> dict:
+        """
+        Reverse dependencies of just the given packages. Each node is resolved
+        on first use, memoised and persisted in the inventory cache, so the work
+        scales with what is asked for rather than with the whole system.
+        """
+        # ==> THE DEPENDENCY GRAPH ALREADY HOLDS EVERY NODE, NOTHING TO MEMOISE
+        graph = self.dependencyGraph()
+        if graph is not None:
+            return {pkg: graph.dependents(pkg) for pkg in packageNames}
+
+
+        if self._reverseDependencyNodes is None:
+            # ==> A FULL MAP BUILT BY AN EARLIER COMMAND ALREADY ANSWERS EVERYTHING
+            fullMap = self._reverseDependencies or self.pactool.cache.get("reverseDependencies")
+            self._reverseDependencyNodes = fullMap if fullMap is not None else self.pactool.cache.get("reverseDependencyNodes", {})
+
+
+        nodes = self._reverseDependencyNodes
+        missing = [pkg for pkg in dict.fromkeys(packageNames) if pkg not in nodes]
+
+
+        if missing:
+            # ==> ONLY INSTALLED PACKAGES HAVE DEPENDENTS WORTH ASKING ABOUT
+            installed = self.packageNames()
+            nodes.update({pkg: [] for pkg in missing if pkg not in installed})
+            nodes.update(self._resolveReverseDependencies([pkg for pkg in missing if pkg in installed]))
+            self.pactool.cache.put("reverseDependencyNodes", nodes)
+
+
+        return {pkg: nodes.get(pkg, []) for pkg in packageNames}
+
+
+
+
+
+    def _resolveReverseDependencies(self, packageNames: list) -> dict:
+        reverseMap = {}
+
+
+        if not packageNames:
+            return reverseMap
+
+
+
+        # ==> THE DEPENDENCY GRAPH ANSWERS EVERY NODE IN-PROCESS
+        graph = self.dependencyGraph()
+        if graph is not None:
+            reverseMap = {pkg: graph.dependents(pkg) for pkg in packageNames}
+
+
+        elif self.pactool.manager.defaultPackageManager == "pacman":
+            results = self.pactool.executor.runBatched(["pacman", "-Qi"], packageNames)
+            currentPkg = None
+
+
+            # ==> ITERATE OVER EACH LINE OF OUTPUT
+            for line in "\n".join(result.stdout for result in results).splitlines():
+                if line.startswith("Name            :"):
+                    currentPkg = line.split(":", 1)[1].strip()
+
+
+                # ==> DETECT "Required By" LINE FOR THE CURRENT PACKAGE
+                elif line.startswith("Required By     :") and currentPkg:
+                    deps = line.split(":", 1)[1].strip()
+                    reverseMap[currentPkg] = [] if deps == "None" else deps.split()
+
+
+
+        elif self.pactool.manager.defaultPackageManager == "apt":
+            # ==> BATCHED "apt-cache rdepends pkg1 pkg2 ..." CALLS, RUN IN PARALLEL
+            reverseMap = {pkg: [] for pkg in packageNames}
+            results = self.pactool.executor.runBatched(["apt-cache", "rdepends"], packageNames)
+
+
+            for result in results:
+                currentPkg = None
+                for line in result.stdout.splitlines():
+                    # ==> UNINDENTED LINES NAME THE PACKAGE, INDENTED ONES ARE ITS DEPENDENTS
+                    if not line.strip() or line.startswith("Reverse Depends:"):
+                        continue
+                    if line[0] not in " |":
+                        currentPkg = line.strip()
+                        continue
+                    if currentPkg in reverseMap and line.strip() != currentPkg:
+                        reverseMap[currentPkg].append(line.strip())
+
+
+        return reverseMap
+
+
+
+
+
+    ##########################################################################
+    #                            DEPENDENCY GRAPH                            #
+    ##########################################################################
+
+
+    def dependencyGraph(self):
+        """
+        DependencyGraph of the installed packages, or None when the local
+        package database cannot be read directly.
+        """
+        if self._dependencyGraph is None:
+            state = self._cached("dependencyGraph", self._buildDependencyGraph)
+            self._dependencyGraph = DependencyGraph.fromState(state) if state else False
+
+
+            # ==> THE CACHED GRAPH MAY PREDATE A pacman -D, SO ITS ROOTS ARE RE-MARKED FROM THE SIGNED SET
+            if self._dependencyGraph and self.signedEntries():
+                self._dependencyGraph.markExplicit(self.userPackages())
+        return self._dependencyGraph or None
+
+
+
+
+
+    def _buildDependencyGraph(self) -> tuple:
+        pacmanDatabase = self.pactool.packages.pacmanDatabase
+        dpkgDatabase = DpkgDatabase()
+
+
+        if self.pactool.manager.defaultPackageManager == "pacman" and pacmanDatabase.available():
+            table = pacmanDatabase.dependencyTable()
+            roots = self.userPackages()
+        elif self.pactool.manager.defaultPackageManager == "apt" and dpkgDatabase.available():
+            table = dpkgDatabase.dependencyTable()
+            roots = self.userPackages() | dpkgDatabase.essentialPackages()
+        else:
+            # ==> CACHED AS "NO GRAPH" SO THE CHECK IS NOT REPEATED
+            return ()
+
+
+        return DependencyGraph.fromTable(table, roots).toState()
+
+
+
+
+
+    ##########################################################################
+    #                         OPTIONAL DEPENDENCIES                          #
+    ##########################################################################
+
+
+    def optionalDependencies(self) -> dict:
+        """
+        Packages that declare optional dependencies, mapped to the package
+        names they declare (pacman optdepends, apt Recommends/Suggests).
+        """
+        if self._optionalDependencies is None:
+            self._optionalDependencies = self._cached("optionalDependencies", self._buildOptionalDependencies)
+        return self._optionalDependencies
+
+
+
+
+
+    def _buildOptionalDependencies(self) -> dict:
+        # ==> ONLY NEEDED WHEN THERE IS NO DEPENDENCY GRAPH (LOCAL DB UNREADABLE)
+        optionalMap = {}
+
+
+        if self.pactool.manager.defaultPackageManager == "pacman":
+            result = run(["pacman", "-Qi"], capture_output=True, text=True, check=False)
+            currentPkg = None
+            inOptional = False
+
+
+            # ==> "Optional Deps   : name: reason [installed]", ONE PER LINE, FURTHER ONES INDENTED
+            for line in result.stdout.splitlines():
+                if line.startswith("Name"):
+                    currentPkg = line.split(":", 1)[1].strip()
+                    inOptional = False
+                    continue
+                if line.startswith("Optional Deps"):
+                    inOptional = True
+                    value = line.split(":", 1)[1].strip()
+                elif inOptional and line[:1].isspace():
+                    value = line.strip()
+                else:
+                    inOptional = False
+                    continue
+
+
+                if currentPkg and value and value != "None":
+                    name = PacmanDatabase.stripConstraint(value.split(":", 1)[0].split(" [", 1)[0])
+                    optionalMap.setdefault(currentPkg, []).append(name)
+
+
+        elif self.pactool.manager.defaultPackageManager == "apt":
+            results = self.pactool.executor.runBatched(["apt-cache", "show"], sorted(self.packageNames()))
+            seen = set()
+
+
+            for result in results:
+                for stanza in result.stdout.split("\n\n"):
+                    fields = dict(line.split(":", 1) for line in stanza.splitlines() if ":" in line and not line[0].isspace())
+                    pkg = fields.get("Package", "").strip()
+
+
+                    # ==> ONLY LOOK AT THE FIRST (CANDIDATE) STANZA OF EACH PACKAGE
+                    if not pkg or pkg in seen:
+                        continue
+                    seen.add(pkg)
+
+
+                    for key in ("Recommends", "Suggests"):
+                        for group in DpkgDatabase.parseRelations(fields.get(key, "")):
+                            optionalMap.setdefault(pkg, []).extend(group)
+
+
+        return optionalMap
+
+
+
+
+
+    def optionalOnly(self) -> dict:
+        """
+        DependencyGraph.optionalOnly() without a graph: non-explicit installed
+        packages that something optionally wants and nothing hard-depends on,
+        mapped to the packages that want them.
+        """
+        installed = self.packageNames()
+        userPkgs = self.userPackages()
+        wantedBy = {}
+
+
+        for declarer, targets in self.optionalDependencies().items():
+            for target in targets:
+                if target in installed and target not in userPkgs and target != declarer:
+                    wantedBy.setdefault(target, set()).add(declarer)
+
+
+        # ==> apt-cache rdepends ALSO LISTS RECOMMENDS/SUGGESTS AND UNINSTALLED PACKAGES, NEITHER IS A HARD DEPENDENT
+        dependents = self.reverseDependenciesOf(sorted(wantedBy))
+        return {
+            name: sorted(wanters)
+            for name, wanters in sorted(wantedBy.items())
+            if not any(dependent in installed and dependent not in wanters for dependent in dependents.get(name, []))
+        }
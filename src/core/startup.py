@@ -0,0 +1,157 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from subprocess import run as subprocessRun, PIPE
+from time import perf_counter
+import sys
+
+
+# ==> PACTOOL FILES
+from core.formatter import Formatter
+from core.render import TableRenderer
+
+
+
+
+##########################################################################
+#                                                                        #
+#                            STARTUP PROFILER                            #
+#                                                                        #
+##########################################################################
+
+
+class StartupProfiler:
+    """
+    Re-runs a pactool command under python -X importtime and reports where
+    startup time went, so import regressions show up as numbers.
+    The command's own output is left untouched on stdout; the report goes
+    to stderr.
+    """
+    flag = "--profile-startup"
+    pactoolPrefixes = ("core.", "operations.")
+
+
+
+
+    def __init__(self, script: str, arguments: list, limit: int = 15, stream=None) -> None:
+        self.script = script
+        self.arguments = [argument for argument in arguments if argument != self.flag]
+        self.limit = limit
+        self.stream = stream or sys.stderr
+
+
+
+
+
+    @staticmethod
+    def parse(output: str) -> tuple:
+        """
+        ([(module, selfUs, cumulativeUs, depth)], untouched lines) from -X importtime stderr.
+        """
+        imports = []
+        otherLines = []
+
+
+        for line in output.splitlines():
+            if not line.startswith("import time:"):
+                otherLines.append(line)
+                continue
+
+
+            selfTime, cumulative, name = line[len("import time:"):].split("|", 2)
+            if not selfTime.strip().isdigit():
+                continue
+            module = name.strip()
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            imports.append((module, int(selfTime), int(cumulative), depth))
+
+
+        return imports, otherLines
+
+
+
+
+
+    def run(self) -> int:
+        started = perf_counter()
+        result = subprocessRun([sys.executable, "-X", "importtime", self.script, *self.arguments], stderr=PIPE, text=True)
+        elapsed = perf_counter() - started
+
+
+        imports, otherLines = self.parse(result.stderr)
+        if otherLines:
+            self.stream.write("\n".join(otherLines) + "\n")
+        self.report(imports, elapsed)
+        return result.returncode
+
+
+
+
+
+    def report(self, imports: list, elapsed: float) -> None:
+        Formatter.configureColors(self.stream)
+        totalImports = sum(selfTime for _, selfTime, _, _ in imports)
+        pactoolImports = sum(selfTime for module, selfTime, _, _ in imports if module.startswith(self.pactoolPrefixes))
+
+
+        table = TableRenderer([
+            TableRenderer.column(12, align=">"),
+            TableRenderer.column(10, align=">"),
+            TableRenderer.column(0, dynamicStyle=True),
+        ], stream=self.stream)
+
+
+        table.addLine()
+        table.addLine(Formatter.colorText("Startup profile (python -X importtime)", Formatter.headerColor, Formatter.bold))
+        table.addLine(f"{Formatter.tab4}Wall time:          {elapsed * 1000:8.1f} ms")
+        table.addLine(f"{Formatter.tab4}All imports:        {totalImports / 1000:8.1f} ms ({len(imports)} modules)")
+        table.addLine(f"{Formatter.tab4}Pactool modules:    {pactoolImports / 1000:8.1f} ms (self time)")
+        table.addLine()
+        table.addRow("cumulative", "self", "", "module")
+
+
+        # ==> SLOWEST FIRST; NESTING IS KEPT AS INDENTATION
+        slowest = sorted(imports, key=lambda entry: entry[2], reverse=True)[:self.limit]
+        for module, selfTime, cumulative, depth in slowest:
+            color = Formatter.yellow if module.startswith(self.pactoolPrefixes) else Formatter.white
+            table.addRow(f"{cumulative / 1000:.1f} ms", f"{selfTime / 1000:.1f} ms", color, f"{'  ' * depth}{module}")
+
+
+        table.flush()
@@ -0,0 +1,273 @@
+# ==============================================================================
+#
+#  Pactool - A Cross-Distro Package Management Helper
+#  Copyright 2025 The Linux Utils (https://github.com/LinuxUtils/pactool)
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  This software is provided for free and open use, but attribution is
+#  REQUIRED when redistributing or modifying this code. Any derivative
+#  works must include this license header and must clearly indicate all
+#  modifications that have been made.
+#
+#  For third-party code integrations, ensure you comply with both the
+#  Pactool license and the license of the third-party code.
+#
+#  DISCLAIMER:
+#  Pactool is provided "as is," without any warranties of any kind,
+#  whether express or implied, including but not limited to warranties
+#  of merchantability or fitness for a particular purpose.
+#
+# ==============================================================================
+
+
+##########################################################################
+#                                                                        #
+#                                MODULES                                 #
+#                                                                        #
+##########################################################################
+
+from collections import deque
+import sys
+
+
+# ==> PACTOOL FILES
+from core.formatter import Formatter
+
+
+
+
+##########################################################################
+#                                                                        #
+#                             TREE RENDERER                              #
+#                                                                        #
+##########################################################################
+
+
+class TreeRenderer:
+    """
+    Renders a dependency tree without recursion, so chains of any depth are
+    safe. Output is buffered and written in large chunks, and the walk can be
+    capped by depth and by number of nodes.
+
+    Modes:
+        tree  indented tree; a package reached again through another parent
+              is still listed there (marked "*") but not expanded twice
+        flat  every reachable package once, with its distance from the root
+        dot   Graphviz digraph (dependent -> dependency)
+    """
+    modes = ("tree", "flat", "dot")
+    flushLines = 512
+
+
+
+
+    def __init__(self, children, mode: str = "tree", maxDepth: int = None, maxNodes: int = None, stream=None) -> None:
+        self.children = children
+        self.mode = mode if mode in self.modes else "tree"
+        self.maxDepth = maxDepth if maxDepth is not None and maxDepth >= 0 else None
+        self.maxNodes = maxNodes if maxNodes else None
+        self.stream = stream or sys.stdout
+        self._buffer = []
+        self.emitted = 0
+        self.truncated = False
+
+
+
+
+
+    def render(self, root: str) -> int:
+        """
+        Render the tree below root and return the number of nodes written.
+        """
+        self.emitted = 0
+        self.truncated = False
+
+
+        if self.mode == "flat":
+            self._renderFlat(root)
+        elif self.mode == "dot":
+            self._renderDot(root)
+        else:
+            self._renderTree(root)
+
+
+        if self.truncated and self.mode != "dot":
+            self._write(Formatter.colorText(f"... stopped after {self.emitted} nodes (raise --max-nodes to see more)", Formatter.yellow))
+        self._flush()
+        return self.emitted
+
+
+
+
+
+    ##########################################################################
+    #                                OUTPUT                                  #
+    ##########################################################################
+
+
+    def _write(self, line: str) -> None:
+        self._buffer.append(line)
+        if len(self._buffer) >= self.flushLines:
+            self._flush()
+
+
+
+
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self.stream.write("\n".join(self._buffer) + "\n")
+            self.stream.flush()
+            self._buffer = []
+
+
+
+
+
+    def _full(self) -> bool:
+        if self.maxNodes is not None and self.emitted >= self.maxNodes:
+            self.truncated = True
+            return True
+        return False
+
+
+
+
+
+    def _canDescend(self, depth: int) -> bool:
+        return self.maxDepth is None or depth < self.maxDepth
+
+
+
+
+
+    ##########################################################################
+    #                                 MODES                                  #
+    ##########################################################################
+
+
+    def _renderTree(self, root: str) -> None:
+        # ==> EXPLICIT STACK OF (NODE, DEPTH); path HOLDS THE CURRENT BRANCH FOR CYCLE CHECKS
+        stack = [(root, 0)]
+        path = []
+        onPath = set()
+        expanded = set()
+
+
+        while stack:
+            if self._full():
+                return
+
+
+            node, depth = stack.pop()
+            while len(path) > depth:
+                onPath.discard(path.pop())
+
+
+            prefix = "  " * depth + ("└─ " if depth > 0 else "")
+            name = Formatter.colorText(node, Formatter.green)
+            self.emitted += 1
+
+
+            # ==> A CYCLE BACK INTO THE CURRENT BRANCH
+            if node in onPath:
+                self._write(f"{prefix}{name} {Formatter.colorText('(cycle)', Formatter.dim)}")
+                continue
+
+
+            # ==> DIAMOND: SHOW THE EDGE, BUT THE SUBTREE WAS ALREADY PRINTED
+            children = self.children(node)
+            if node in expanded and children:
+                self._write(f"{prefix}{name} {Formatter.colorText('*', Formatter.dim)}")
+                continue
+
+
+            if children and not self._canDescend(depth):
+                self._write(f"{prefix}{name} {Formatter.colorText(f'(+{len(children)} more)', Formatter.dim)}")
+                continue
+
+
+            self._write(f"{prefix}{name}")
+            expanded.add(node)
+            path.append(node)
+            onPath.add(node)
+            stack.extend((child, depth + 1) for child in reversed(children))
+
+
+
+
+
+    def _renderFlat(self, root: str) -> None:
+        # ==> BREADTH-FIRST, SO EACH PACKAGE IS LISTED AT ITS SHORTEST DISTANCE
+        queue = deque([(root, 0)])
+        seen = {root}
+
+
+        while queue:
+            if self._full():
+                return
+
+
+            node, depth = queue.popleft()
+            self._write(f"{str(depth).rjust(3)}  {Formatter.colorText(node, Formatter.green)}")
+            self.emitted += 1
+
+
+            if not self._canDescend(depth):
+                continue
+            for child in self.children(node):
+                if child not in seen:
+                    seen.add(child)
+                    queue.append((child, depth + 1))
+
+
+
+
+
+    def _renderDot(self, root: str) -> None:
+        queue = deque([(root, 0)])
+        seen = {root}
+
+
+        self._write(f"digraph {self._quote('why ' + root)} {{")
+        self._write(f"    {self._quote(root)};")
+        self.emitted += 1
+
+
+        while queue:
+            node, depth = queue.popleft()
+            if not self._canDescend(depth):
+                continue
+
+
+            for child in self.children(node):
+                # ==> EDGES POINT FROM THE DEPENDENT TO WHAT IT DEPENDS ON
+                if child not in seen:
+                    if self._full():
+                        break
+                    seen.add(child)
+                    queue.append((child, depth + 1))
+                    self.emitted += 1
+                self._write(f"    {self._quote(child)} -> {self._quote(node)};")
+
+
+        self._write("}")
+
+
+
+
+
+    @classmethod
+    def _quote(cls, text: str) -> str:
+        return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
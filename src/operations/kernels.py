@@ -37,11 +37,12 @@
 #                                                                        #
 ##########################################################################
 
-from subprocess import run
+from os import uname
 from os.path import exists as pathExists
 
 
 # ==> PACTOOL FILES
+from core.process import run
 from core.logger import logError
 from core.formatter import Formatter
 
@@ -69,7 +70,7 @@ class Kernels:
 
 
             # ==> GET CURRENTLY RUNNING KERNEL
-            currentKernel = run(["uname", "-r"], capture_output=True, text=True, check=False).stdout.strip()
+            currentKernel = uname().release
             currentKernelPkg = f"linux{currentKernel.split('-')[0]}"
 
 
@@ -79,8 +80,7 @@ class Kernels:
                     kernels = ["linux", "linux-lts", "linux-zen", "linux-hardened"]
                 else:
                     # ==> GET INSTALLED KERNEL PACKAGES
-                    result = run(["pacman", "-Qq", "linux"], capture_output=True, text=True, check=False)
-                    kernels = [k for k in result.stdout.splitlines() if k.startswith("linux")]
+                    kernels = ["linux"] if "linux" in self.pactool.snapshot.packageNames() else []
 
 
 
@@ -133,7 +133,7 @@ class Kernels:
 
 
             # ==> GET CURRENT KERNEL VERSION
-            currentKernel = run(["uname", "-r"], capture_output=True, text=True, check=False).stdout.strip()
+            currentKernel = uname().release
 
 
             # ==> DETERMINE KERNEL IMAGE
@@ -148,8 +148,7 @@ class Kernels:
 
 
             # ==> VERIFY KERNEL IMAGE
-            result = run(["ls", kernelImage], capture_output=True, text=True, check=False)
-            if result.returncode != 0:
+            if not pathExists(kernelImage):
                 print(Formatter.colorText("Error -> No kernel image found in /boot.", Formatter.red))
                 return
 
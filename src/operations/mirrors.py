@@ -38,7 +38,7 @@
 from os import makedirs, listdir
 from os.path import expanduser, join, isdir, getctime
 from datetime import datetime
-from subprocess import run, PIPE
+from subprocess import PIPE
 from shutil import copy, which
 from sys import stdout
 from time import sleep, perf_counter
@@ -47,6 +47,7 @@ from threading import Event
 
 
 # ==> PACTOOL FILES
+from core.process import run
 from core.logger import logError
 from core.formatter import Formatter
 from core.thread import SafeThread
@@ -38,21 +38,28 @@
 ##########################################################################
 
 from shutil import get_terminal_size
-from subprocess import run, CalledProcessError, DEVNULL, PIPE
+from subprocess import CalledProcessError, DEVNULL, PIPE
 from datetime import datetime
 from os import stat
 from re import search
-from urllib.request import urlopen, Request
-from urllib.parse import quote
-from json import loads as jsonLoads
+from itertools import islice, chain
 from time import sleep as timeSleep
 from sys import stdout as sysStdout
 
 
 # ==> PACTOOL FILES
+from core.process import run
 from core.logger import logError
 from core.formatter import Formatter
 from core.thread import SafeThread
+from core.database import DpkgDatabase, PacmanDatabase
+from core.record import PackageRecord
+from core.aggregate import PackageAggregator
+from core.tree import TreeRenderer
+from core.export import RecordWriter
+from core.render import TableRenderer
+from core.pager import Pager
+from core.search import SearchIndex
 
 
 
@@ -64,81 +71,77 @@ from core.thread import SafeThread
 ##########################################################################
 
 class Packages:
-    def __init__(self, Pactool=None) -> None:
-        self.pactool = Pactool
+    historyActions = {
+        "install": "Installed",
+        "upgrade": "Upgraded",
+        "downgrade": "Downgraded",
+        "reinstall": "Reinstalled",
+        "remove": "Removed",
+        "purge": "Purged",
+    }
 
 
 
 
+    def __init__(self, Pactool=None) -> None:
+        self.pactool = Pactool
+        self.pacmanDatabase = PacmanDatabase()
+        self.searchIndex = None
+        self.ownershipIndex = None
+        self.historyStore = None
+        self.nvdClient = None
 
-    def _paginate(self, items, renderFunc, limit: int = None):
-        # ==> APPLY LIMIT IF PROVIDED
-        if limit is not None:
-            if limit > 0:
-                items = items[:limit]
-            elif limit == 0:
-                Formatter.displayPackageLegend()
-                print()
-                renderFunc(items, startIndex=0)
-                return
+        # ==> FALSE WHEN NOBODY CAN ANSWER A PROMPT (THE DAEMON): PRINT INSTEAD OF PAGING
+        self.interactive = True
 
+        # ==> WIDTH TO LAY OUT FOR (THE DAEMON SETS ITS CLIENT'S), None ASKS THIS TERMINAL
+        self.columns = None
 
-        # ==> DETERMINE TERMINAL HEIGHT
-        terminalHeight = get_terminal_size().lines - 10
-        index = 0
 
 
-        while index < len(items):
-            # ==> RENDER CURRENT CHUNK
-            endIndex = index
-            lineCount = 0
-            
-            
-            while endIndex < len(items):
-                # ==> ESTIMATE LINES FOR CURRENT ITEM (NAME + DESCRIPTION)
-                pkg = items[endIndex]
-                pkgLines = 1
-                
-                
-                # ==> NAME & DESCRIPTION
-                if isinstance(pkg, tuple) and pkg[1]:
-                    pkgLines += 2
-                if lineCount + pkgLines > terminalHeight:
-                    break
-                
-                
-                lineCount += pkgLines
-                endIndex += 1
 
 
+    def _paginate(self, items, renderFunc, limit: int = None, background: bool = False):
+        # ==> -n 0 SHOWS EVERYTHING AT ONCE
+        if limit == 0 or not self.interactive:
+            Formatter.displayPackageLegend()
+            print()
+            renderFunc(list(self._limitItems(items, limit)), startIndex=0)
+            return
 
+
+        def header(pageNumber, totalPages):
             Formatter.displayPackageLegend()
             print()
-            renderFunc(items[index:endIndex], startIndex=index)
-            index = endIndex
+
+
+        # ==> PAGES ARE PULLED LAZILY (OPTIONALLY WHILE A THREAD KEEPS COLLECTING)
+        Pager(self._limitItems(items, limit), renderFunc, self._itemLines, header, background=background).run()
+
+
+
+
+
+    def _itemLines(self, item) -> int:
+        # ==> NAME, PLUS TWO LINES FOR A DESCRIPTION
+        if isinstance(item, tuple) and item[1]:
+            return 3
+        return 1
+
+
+
+
+
+    def _limitItems(self, items, limit: int = None):
+        # ==> SAME MEANING OF -n AS _paginate (NONE OR 0 = EVERYTHING), BUT LAZY
+        if limit is not None and limit > 0:
+            return islice(items, limit)
+        return iter(items)
+
+
 
 
 
-            if index < len(items):
-                print(f"{Formatter.headerColor}\nPress enter to continue | 'Q' to quit\n")
-                userInput = input(
-                    Formatter.colorText(
-                        "--> ",
-                        Formatter.headerColor
-                    )
-                ).strip()
-                if userInput == "q":
-                    break
-                print()
-                
-                
-                
-                
-                
-                
-    
-    
-    
     def _paginateSearch(self, packages, keyword, renderFunc, limit: int = None):
         # ==> APPLY LIMIT IF PROVIDED
         if limit is not None:
@@ -167,113 +170,26 @@ class Packages:
                 return userInput if userInput and userInput != "q" else None
 
 
-        # ==> CALCULATE TERMINAL HEIGHT (NUMBER OF LINES THAT FIT)
-        terminalHeight = get_terminal_size().lines - 10
-
-
-        # ==> TOTAL PACKAGES AND PAGE CALCULATION
-        totalPackages = len(packages)
-        pageSize = 0
-        index = 0
-        pageNumber = 1
-
-
-        # ==> CALCULATE TOTAL PAGES (APPROX) BY SIMULATING A SINGLE PAGE
-        tempIndex = 0
-        tempLines = 0
-        
-        
-        while tempIndex < totalPackages:
-            pkg = packages[tempIndex]
-            pkgLines = 1
-            if isinstance(pkg, tuple) and pkg[1]:
-                pkgLines += 2
-            if tempLines + pkgLines > terminalHeight:
-                break
-            
-            
-            tempLines += pkgLines
-            tempIndex += 1
-            
-        
-        pageSize = max(1, tempIndex)
-        totalPages = (totalPackages + pageSize - 1) // pageSize
-
-
-
-        # ==> PAGINATION LOOP
-        while index < totalPackages:
-            endIndex = index
-            lineCount = 0
-
 
-            # ==> DETERMINE HOW MANY PACKAGES FIT IN THIS PAGE
-            while endIndex < totalPackages:
-                pkg = packages[endIndex]
-                pkgLines = 1
-                
-                
-                if isinstance(pkg, tuple) and pkg[1]:
-                    pkgLines += 2
-                if lineCount + pkgLines > terminalHeight:
-                    break
-                
-                
-                lineCount += pkgLines
-                endIndex += 1
-
-
-
-            # ==> DISPLAY PAGE HEADER
-            print(f'\n{Formatter.headerColor}Showing results for "{keyword}" - Page {pageNumber} of {totalPages}{Formatter.reset}\n')
+        # ==> PAGE HEADER (TOTAL IS KNOWN ONCE ALL RESULTS ARE IN)
+        def header(pageNumber, totalPages):
+            pageText = f"Page {pageNumber} of {totalPages}" if totalPages else f"Page {pageNumber}"
+            print(f'\n{Formatter.headerColor}Showing results for "{keyword}" - {pageText}{Formatter.reset}\n')
             Formatter.displayPackageLegend()
             print()
 
 
 
-            # ==> RENDER CURRENT PAGE
-            renderFunc(packages[index:endIndex], keyword, startIndex=index)
-
-
-
-            # ==> UPDATE INDEX AND PAGE NUMBER
-            index = endIndex
-            pageNumber += 1
-
-
-
-            # ==> ASK USER FOR INPUT IF THERE ARE MORE PAGES
-            if index < totalPackages:
-                print(f"{Formatter.headerColor}\nPress enter to continue | 'Q' to quit | or type a new keyword\n")
-                userInput = input(
-                    Formatter.colorText(
-                        "--> ",
-                        Formatter.headerColor
-                    )
-                ).strip()
-
-
-
-                # ==> HANDLE USER INPUT
-                if userInput.lower() == "q":
-                    return None
-                elif userInput:
-                    return userInput
-                print()
-
-
-
-        # ==> ASK USER FOR A NEW KEYWORD EVEN IF RESULTS FIT ON ONE PAGE
-        print(f"{Formatter.headerColor}\nPress enter to continue | 'Q' to quit | or type a new keyword\n")
-        userInput = input(
-            Formatter.colorText(
-                "--> ",
-                Formatter.headerColor
-            )
-        ).strip().lower()
-        
-        
-        return userInput if userInput and userInput != "q" else None
+        # ==> PAGINATION, THEN ASK FOR A NEW KEYWORD EVEN AFTER THE LAST PAGE
+        pager = Pager(
+            packages,
+            lambda chunk, startIndex=0: renderFunc(chunk, keyword, startIndex=startIndex),
+            self._itemLines,
+            header,
+            allowKeyword=True,
+            promptAtEnd=True
+        )
+        return pager.run()
 
 
 
@@ -282,46 +198,42 @@ class Packages:
 
 
 
-    def list(self, limit: int = None, sortBy: str = None, showUser: bool = False, showSystem: bool = False, reverseSort: bool = False) -> None:
+    def list(self, limit: int = None, sortBy: str = None, showUser: bool = False, showSystem: bool = False, reverseSort: bool = False, outputFormat: str = None) -> None:
         try:
-            packageList = self.collectAptPackages() if self.pactool.manager.defaultPackageManager == "apt" else self.collectPacmanPackages()
-            if not packageList:
-                print(Formatter.colorText("No packages found.", Formatter.red, Formatter.bold))
+            # ==> MACHINE-READABLE EXPORT: NO WIDTHS, COLORS OR PAGINATION; BUFFERED ONLY TO SORT
+            if outputFormat:
+                if sortBy:
+                    packageList = self._sortPackages(self._filterPackages(self.pactool.snapshot.packages(), showUser, showSystem), sortBy, reverseSort)
+                else:
+                    packageList = self._filterPackages(self.pactool.snapshot.streamPackages(), showUser, showSystem)
+                RecordWriter(outputFormat).writeRecords(pkg.toDict() for pkg in self._limitItems(packageList, limit))
                 return
 
 
-            # ==> GET ALL USER PACKAGES ONCE
-            userPkgs = self._getUserPackages()
-
-
-            # ==> TAG EACH PACKAGE AS USER OR SYSTEM
-            for pkg in packageList:
-                pkg["isUser"] = pkg["name"] in userPkgs
-
-
-            # ==> FILTER IF USER OR SYSTEM FLAGS ARE SET
-            packageList = self._filterPackages(packageList, showUser, showSystem)
-
-
-            # ==> SORT
-            packageList = self._sortPackages(packageList, sortBy, reverseSort)
+            # ==> SORTING NEEDS EVERYTHING; OTHERWISE STREAM SO PAGE ONE SHOWS WHILE COLLECTION CONTINUES
+            if sortBy:
+                packages = iter(self._sortPackages(self._filterPackages(self.pactool.snapshot.packages(), showUser, showSystem), sortBy, reverseSort))
+            else:
+                packages = self._filterPackages(self.pactool.snapshot.streamPackages(), showUser, showSystem)
 
 
-            # ==> WIDTH CALCULATION
-            nameWidth = max(len(pkg["name"]) for pkg in packageList)
-            sizeValWidth = max(len(pkg["sizeValue"]) for pkg in packageList) + 2
-            sizeUnitWidth = max(len(pkg["sizeUnit"]) for pkg in packageList)
-            dateWidth = max(
-                max(len(pkg["installed"]) for pkg in packageList),
-                max(len(pkg["updated"]) for pkg in packageList)
-            )
+            first = next(packages, None)
+            if first is None:
+                print(Formatter.colorText("No packages found.", Formatter.red, Formatter.bold))
+                return
 
 
             def renderChunk(chunk, startIndex=0):
+                # ==> WIDTH CALCULATION (PER PAGE, THE REST MAY NOT BE COLLECTED YET)
+                sizeParts = [pkg.sizeParts() for pkg in chunk]
+                nameWidth = max(len(pkg.name) for pkg in chunk)
+                sizeValWidth = max(len(value) for value, _ in sizeParts) + 2
+                sizeUnitWidth = max(len(unit) for _, unit in sizeParts)
+                dateWidth = max(max(len(pkg.installedText()), len(pkg.updatedText())) for pkg in chunk)
                 self._printPackages(chunk, nameWidth, sizeValWidth, sizeUnitWidth, dateWidth, startIndex=startIndex)
 
 
-            self._paginate(packageList, renderChunk, limit)
+            self._paginate(chain([first], packages), renderChunk, limit, background=not sortBy)
 
 
 
@@ -342,15 +254,15 @@ class Packages:
 
 
         if sortBy == "name":
-            key = lambda p: p["name"].lower()
+            key = lambda p: p.name.lower()
         elif sortBy == "size":
-            key = lambda p: float(p["sizeValue"])
+            key = lambda p: p.sizeBytes
         elif sortBy == "install-date":
-            key = lambda p: p.get("installedTs", 0)
+            key = lambda p: p.installedTs
         elif sortBy == "update-date":
-            key = lambda p: p.get("updatedTs", 0)
+            key = lambda p: p.updatedTs
         elif sortBy == "type":
-            key = lambda p: (0 if p.get("isUser", False) else 1, p["name"].lower())
+            key = lambda p: (0 if p.isUser else 1, p.name.lower())
 
 
         return sorted(pkgs, key=key, reverse=reverse) if key else pkgs
@@ -363,36 +275,13 @@ class Packages:
 
 
 
-    def _filterPackages(self, packageList, showUser: bool, showSystem: bool):
-        if not (showUser or showSystem):
-            return packageList
-
-
-        userPkgs = self._getUserPackages()
+    def _filterPackages(self, packages, showUser: bool, showSystem: bool):
+        # ==> LAZY, SO IT WORKS ON STREAMED PACKAGES TOO
         if showUser:
-            return [pkg for pkg in packageList if pkg["name"] in userPkgs]
+            return (pkg for pkg in packages if pkg.isUser)
         elif showSystem:
-            return [pkg for pkg in packageList if pkg["name"] not in userPkgs]
-        return packageList
-
-
-
-
-
-
-
-    def _getUserPackages(self):
-        if self.pactool.manager.defaultPackageManager == "pacman":
-            result = run(["pacman", "-Qe"], capture_output=True, text=True)
-            return {line.split()[0] for line in result.stdout.strip().splitlines() if line}
-        
-        
-        elif self.pactool.manager.defaultPackageManager == "apt":
-            result = run(["apt-mark", "showmanual"], capture_output=True, text=True)
-            return {line.strip() for line in result.stdout.strip().splitlines() if line}
-        
-        
-        return set()
+            return (pkg for pkg in packages if not pkg.isUser)
+        return iter(packages)
 
 
 
@@ -400,8 +289,6 @@ class Packages:
 
 
 
-
-    
     def _parseDate(self, dateStr: str) -> datetime:
         """
         Parse package date strings from both APT and pacman.
@@ -447,26 +334,33 @@ class Packages:
 
 
     def _printPackages(self, pkgList, nameWidth, sizeValWidth, sizeUnitWidth, dateWidth, startIndex=0):
-        for i, pkg in enumerate(pkgList, start=startIndex + 1):
-            nameText = f"{pkg['name']:<{nameWidth}}"
-            sizeText = f"{pkg['sizeValue']:<{sizeValWidth}} {pkg['sizeUnit']:<{sizeUnitWidth}}"
-            installedText = f"{pkg['installed']:<{dateWidth}}"
-            updatedText = f"{pkg['updated']:<{dateWidth}}"
+        # ==> ROW LAYOUT IS COMPILED ONCE, THE PAGE IS WRITTEN IN ONE GO
+        table = TableRenderer([
+            TableRenderer.column(4, style=Formatter.bold, suffix=" "),
+            TableRenderer.column(nameWidth, dynamicStyle=True, suffix="  "),
+            TableRenderer.column(sizeValWidth, style=Formatter.sizeColor, span=(sizeUnitWidth,)),
+            TableRenderer.column(dateWidth, style=Formatter.dateColor, prefix="  Installed "),
+            TableRenderer.column(dateWidth, style=Formatter.dateColor, prefix="  Updated "),
+        ], separator="")
 
 
-            # ==> DETERMINE COLOR BASED ON USER VS SYSTEM
-            packageColor = Formatter.userPackageColor if pkg.get("isUser", False) else Formatter.systemPackageColor
+        userColor = Formatter.userPackageColor
+        systemColor = Formatter.systemPackageColor
 
 
-            print(
-                f"{Formatter.bold}{i:<4}{Formatter.reset} "
-                f"{Formatter.colorText(nameText, packageColor)}  "
-                f"{Formatter.colorText(sizeText, Formatter.sizeColor)}  "
-                f"Installed {Formatter.colorText(installedText, Formatter.dateColor)}  "
-                f"Updated {Formatter.colorText(updatedText, Formatter.dateColor)}"
+        for i, pkg in enumerate(pkgList, start=startIndex + 1):
+            sizeValue, sizeUnit = pkg.sizeParts()
+            table.addRow(
+                i,
+                userColor if pkg.isUser else systemColor, pkg.name,
+                sizeValue, sizeUnit,
+                pkg.installedText(), pkg.updatedText()
             )
 
 
+        table.flush()
+
+
 
 
 
@@ -476,9 +370,24 @@ class Packages:
 
 
 
-    def search(self, name: str, limit: int = None) -> None:
+    def search(self, name: str, limit: int = None, fuzzy: bool = False) -> None:
         try:
             while True:
+                # ==> ANSWER FROM THE LOCAL INDEX, THE PACKAGE MANAGER IS ONLY A FALLBACK
+                searchIndex = self._searchIndex()
+                if searchIndex.available():
+                    userPackages = self.pactool.snapshot.userPackages()
+                    if fuzzy:
+                        packages = searchIndex.fuzzySearch(name, userPackages)
+                    else:
+                        packages = searchIndex.search(name, userPackages)
+                    newKeyword = self._showSearchResults(packages, name, limit)
+                    if newKeyword:
+                        name = newKeyword
+                        continue
+                    break
+
+
                 result = ""
                 if self.pactool.manager.defaultPackageManager == "apt":
                     result = run(["apt", "search", name], capture_output=True, text=True, check=True).stdout
@@ -507,22 +416,7 @@ class Packages:
 
 
 
-                # ==> APPLY LIMIT AFTER PAIRING
-                if limit is not None and limit > 0:
-                    packages = packages[:limit]
-                elif limit == 0:
-                    self._printSearchResults(packages, name, startIndex=0)
-                    return
-
-
-                # ==> APPLY PAGINATION
-                newKeyword = self._paginateSearch(
-                    packages,
-                    name,
-                    lambda chunk, keyword, startIndex=0: self._printSearchResults(chunk, keyword, startIndex),
-                    None
-                )
-
+                newKeyword = self._showSearchResults(packages, name, limit)
                 if newKeyword:
                     name = newKeyword
                     continue
@@ -541,10 +435,41 @@ class Packages:
 
 
 
+    def _searchIndex(self) -> SearchIndex:
+        if self.searchIndex is None:
+            self.searchIndex = SearchIndex(self.pactool.manager.defaultPackageManager, self.pactool.cache.enabled)
+        return self.searchIndex
+
+
+
+
+
+    def _showSearchResults(self, packages, keyword, limit: int = None):
+        # ==> APPLY LIMIT AFTER PAIRING
+        if limit is not None and limit > 0:
+            packages = packages[:limit]
+        if limit == 0 or not self.interactive:
+            self._printSearchResults(packages, keyword, startIndex=0)
+            return None
+
+
+        # ==> APPLY PAGINATION (RETURNS A NEW KEYWORD WHEN THE USER REFINES THE SEARCH)
+        return self._paginateSearch(
+            packages,
+            keyword,
+            lambda chunk, keyword, startIndex=0: self._printSearchResults(chunk, keyword, startIndex),
+            None
+        )
+
+
+
+
+
     def _printSearchResults(self, packages, keyword, startIndex=0):
         # ==> DETERMINE TERMINAL WIDTH AND DESCRIPTION MAX WIDTH
-        terminalWidth = get_terminal_size().columns - 10
+        terminalWidth = (self.columns or get_terminal_size().columns) - 10
         maxDescWidth = terminalWidth - 8
+        page = TableRenderer()
 
 
         # ==> START PACKAGE INDEXING FROM startIndex + 1
@@ -561,12 +486,12 @@ class Packages:
             pkgColor = Formatter.userPackageColor if self._isUserPackage(pkgName) else Formatter.systemPackageColor
 
 
-            # ==> PRINT PACKAGE NAME WITH COLOR AND INDEX
-            print(f"({index}) {Formatter.colorText(highlightedName, pkgColor, Formatter.bold)}")
+            # ==> PACKAGE NAME WITH COLOR AND INDEX
+            page.addLine(f"({index}) {Formatter.colorText(highlightedName, pkgColor, Formatter.bold)}")
             index += 1
 
 
-            # ==> PRINT DESCRIPTION IF AVAILABLE
+            # ==> DESCRIPTION IF AVAILABLE
             if pkgDesc:
                 # ==> TRUNCATE DESCRIPTION IF IT EXCEEDS TERMINAL WIDTH
                 if len(pkgDesc) > maxDescWidth:
@@ -577,9 +502,12 @@ class Packages:
                 highlightedDesc = self._highlightKeyword(pkgDesc, keyword)
 
 
-                # ==> PRINT DESCRIPTION WITH INDENTATION AND COLOR
-                print(f"{Formatter.tab8}Description:")
-                print(f"{Formatter.tab8}{Formatter.tab4}{Formatter.colorText(highlightedDesc, Formatter.white)}")
+                # ==> DESCRIPTION WITH INDENTATION AND COLOR
+                page.addLine(f"{Formatter.tab8}Description:")
+                page.addLine(f"{Formatter.tab8}{Formatter.tab4}{Formatter.colorText(highlightedDesc, Formatter.white)}")
+
+
+        page.flush()
 
 
 
@@ -620,123 +548,65 @@ class Packages:
     
     
     
-    def why(self, packageName: str) -> None:
+    def why(self, packageName: str, mode: str = "tree", maxDepth: int = None, maxNodes: int = None) -> None:
         try:
             if not self._packageExists(packageName):
                 print(Formatter.colorText(f"Package '{packageName}' not found.", Formatter.red))
                 return
 
-            # ==> PRELOAD ALL REVERSE DEPENDENCIES ONCE
-            reverseMap = self._buildReverseDepMap()
-
+            # ==> RESOLVE ONLY THE SUBTREE BELOW THE PACKAGE, ONE BATCHED LOOKUP PER LEVEL
+            reverseMap = {}
+            frontier = [packageName]
+            level = 0
+            while frontier and (maxDepth is None or level <= maxDepth):
+                resolved = self.pactool.snapshot.reverseDependenciesOf(frontier)
+                reverseMap.update(resolved)
+                frontier = list(dict.fromkeys(dep for deps in resolved.values() for dep in deps if dep not in reverseMap))
+                level += 1
 
-            self._drawTree(packageName, reverseMap)
-            
-            
-        except Exception as error:
-            logError(f"Failed to check reverse dependencies ({error})")
 
+            renderer = TreeRenderer(lambda pkg: reverseMap.get(pkg, []), mode, maxDepth, maxNodes)
+            renderer.render(packageName)
 
 
+            # ==> FLAT AND DOT OUTPUT STAY MACHINE-FRIENDLY
+            if renderer.mode != "tree":
+                return
 
 
 
-
-    def _buildReverseDepMap(self) -> dict:
-        reverseMap = {}
-        
-        
-        
-        # ==> HANDLE PACMAN PACKAGE MANAGER
-        if self.pactool.manager.defaultPackageManager == "pacman":
-            result = run(["pacman", "-Qi"], capture_output=True, text=True, check=False).stdout
-            currentPkg = None
-            
-            
-            # ==> ITERATE OVER EACH LINE OF OUTPUT
-            for line in result.splitlines():
-                if line.startswith("Name            :"):
-                    currentPkg = line.split(":", 1)[1].strip()
-                
-                
-                # ==> DETECT "Required By" LINE FOR THE CURRENT PACKAGE
-                elif line.startswith("Required By     :") and currentPkg:
-                    deps = line.split(":", 1)[1].strip()
-                    reverseMap[currentPkg] = [] if deps == "None" else deps.split()
-                    
-                    
-                    
-                    
-        elif self.pactool.manager.defaultPackageManager == "apt":
-            # ==> GET A LIST OF INSTALLED PACKAGES
-            pkgListResult = run(
-                ["dpkg-query", "-W", "-f=${Package}\n"],
-                capture_output=True, text=True, check=False
-            ).stdout.splitlines()
-
-
-
-            # ==> BUILD REVERSE DEPENDENCY MAP FOR EACH PACKAGE
-            for pkg in pkgListResult:
-                rdependsResult = run(
-                    ["apt-cache", "rdepends", pkg],
-                    capture_output=True, text=True, check=False
-                ).stdout.splitlines()
-
-
-
-                deps = []
-                for line in rdependsResult:
-                    line = line.strip()
-                    
-                    
-                    # ==> SKIP HEADERS
-                    if not line or line.startswith("Reverse Depends:") or line == pkg:
-                        continue
-                    
-                    
-                    # ==> ADD VALID DEPENDENCIES
-                    deps.append(line)
-                
-                
-                reverseMap[pkg] = deps
-            
-        
-        return reverseMap
-
-
+            # ==> SHORTEST CHAIN FROM AN EXPLICITLY INSTALLED PACKAGE, AND WHAT REMOVAL WOULD TAKE ALONG
+            graph = self.pactool.snapshot.dependencyGraph()
+            if graph is not None and packageName in graph:
+                whyPath = graph.whyChain(packageName)
+                print()
+                if whyPath:
+                    pathText = " -> ".join(Formatter.colorText(pkg, Formatter.green) for pkg in whyPath)
+                    print(f"{Formatter.tab4}Installed because  ->  {pathText}")
+                else:
+                    print(f"{Formatter.tab4}Installed because  ->  {Formatter.colorText('nothing explicit needs it', Formatter.yellow)}")
 
 
-    
-    
-    
-    
-    
-    def _drawTree(self, pkg: str, reverseMap: dict, depth: int = 0, visited=None) -> None:
-        if visited is None:
-            visited = set()
+                alongside = graph.removalSet(packageName)[1:]
+                if alongside:
+                    print(f"{Formatter.tab4}Removing it also removes ({len(alongside)})  ->  {Formatter.colorText(' '.join(alongside), Formatter.yellow)}")
             
             
-        if pkg in visited:
-            return
-        visited.add(pkg)
-
-
-        prefix = "  " * depth + ("└─ " if depth > 0 else "")
-        print(f"{prefix}{Formatter.colorText(pkg, Formatter.green)}")
+        except Exception as error:
+            logError(f"Failed to check reverse dependencies ({error})")
 
 
-        for dep in reverseMap.get(pkg, []):
-            self._drawTree(dep, reverseMap, depth + 1, visited)
-                
 
 
 
 
 
+    def _packageExists(self, pkg: str) -> bool:
+        # ==> MOST LOOKUPS ARE ANSWERED BY THE (CACHED) INVENTORY WITHOUT SPAWNING ANYTHING
+        if pkg in self.pactool.snapshot.packageNames():
+            return True
 
 
-    def _packageExists(self, pkg: str) -> bool:
         if self.pactool.manager.defaultPackageManager == "pacman":
             return run(["pacman", "-Qi", pkg], capture_output=True, text=True, check=False).returncode == 0
         
@@ -753,10 +623,13 @@ class Packages:
 
 
 
-    def stats(self, limit: int = None, headerText: str = "Package Statistics") -> None:
+    def stats(self, limit: int = None, headerText: str = "Package Statistics", groupBy: list = None, outputFormat: str = None) -> None:
         try:
             # ==> COLLECT PACKAGE LIST FROM APT OR PACMAN
-            packageList = self.collectAptPackages() if self.pactool.manager.defaultPackageManager == "apt" else self.collectPacmanPackages()
+            packageList = self.pactool.snapshot.packages()
+            if not packageList and outputFormat:
+                RecordWriter(outputFormat).writeObject({})
+                return
             if not packageList:
                 print(Formatter.colorText("No packages found.", Formatter.red, Formatter.bold))
                 return
@@ -769,89 +642,46 @@ class Packages:
 
 
 
-            # ==> FIND LARGEST AND SMALLEST PACKAGE BY SIZE
-            largest = max(packageList, key=lambda p: float(p["sizeValue"]))
-            smallest = min(packageList, key=lambda p: float(p["sizeValue"]))
-
-
-
-            # ==> HELPER FUNCTION TO CONVERT DATE STRING TO DATETIME OBJECT
-            def parseDate(dateStr):
-                try:
-                    return datetime.strptime(dateStr, "%a %d %b %Y %I:%M:%S %p %z")
-                except ValueError:
-                    return datetime.min
+            # ==> REJECT UNKNOWN GROUP-BY KEYS
+            unknownKeys = [key for key in (groupBy or ()) if key not in PackageAggregator.groupKeys]
+            if unknownKeys:
+                logError(f"Unknown --group-by key(s): {', '.join(unknownKeys)} (use {'/'.join(PackageAggregator.groupKeys)})")
+                return
 
 
 
-            # ==> FIND OLDEST AND LATEST INSTALL DATES
-            oldestInstalled = min(packageList, key=lambda p: parseDate(p["installed"]))
-            latestInstalled = max(packageList, key=lambda p: parseDate(p["installed"]))
+            # ==> ONE AGGREGATION PASS FOR EVERY FIGURE BELOW
+            result = PackageAggregator(packageList, groupBy=tuple(groupBy or ())).run()
+            largest, smallest = result["largest"], result["smallest"]
+            oldestInstalled, latestInstalled = result["oldestInstalled"], result["latestInstalled"]
+            oldestUpdated, latestUpdated = result["oldestUpdated"], result["latestUpdated"]
 
 
 
-            # ==> FIND OLDEST AND LATEST UPDATE DATES
-            oldestUpdated = min(packageList, key=lambda p: parseDate(p["updated"]))
-            latestUpdated = max(packageList, key=lambda p: parseDate(p["updated"]))
+            if outputFormat:
+                RecordWriter(outputFormat).writeObject(self._exportStats(result))
+                return
 
 
 
             # ==> CALCULATE WIDTHS FOR CLEAN COLUMN ALIGNMENT
-            nameWidth = max(len(pkg["name"]) for pkg in [largest, smallest, oldestInstalled, latestInstalled, oldestUpdated, latestUpdated])
-            sizeValueWidth = max(len(pkg["sizeValue"]) for pkg in [largest, smallest])
-            sizeUnitWidth = max(len(pkg["sizeUnit"]) for pkg in [largest, smallest])
-            
-            
-            
-            # ==> PRINT HEADER AND COUNTS
-            totalCount = len(packageList)
+            nameWidth = max(len(pkg.name) for pkg in [largest, smallest, oldestInstalled, latestInstalled, oldestUpdated, latestUpdated])
+            largestValue, largestUnit = largest.sizeParts()
+            smallestValue, smallestUnit = smallest.sizeParts()
+            sizeValueWidth = max(len(largestValue), len(smallestValue))
+            sizeUnitWidth = max(len(largestUnit), len(smallestUnit))
 
 
-            # ==> SYSTEM/USER CLASSIFICATION
-            userCount = 0
-            systemCount = 0
 
-
-            if self.pactool.manager.defaultPackageManager == "pacman":
-                result = run(["pacman", "-Qe"], capture_output=True, text=True)
-                userPkgs = {line.split()[0] for line in result.stdout.strip().splitlines() if line}
-                for pkg in packageList:
-                    if pkg["name"] in userPkgs:
-                        userCount += 1
-                    else:
-                        systemCount += 1
-
-
-            elif self.pactool.manager.defaultPackageManager == "apt":
-                result = run(["apt-mark", "showmanual"], capture_output=True, text=True)
-                userPkgs = {line.strip() for line in result.stdout.strip().splitlines() if line}
-                for pkg in packageList:
-                    if pkg["name"] in userPkgs:
-                        userCount += 1
-                    else:
-                        systemCount += 1
-                        
-                        
-                        
-                        
-            # ==> CALCULATE TOTAL, USER, AND SYSTEM SIZES
-            def parseSize(pkg):
-                try:
-                    return float(pkg["sizeValue"])
-                except ValueError:
-                    return 0.0
-
-
-
-            totalSize = sum(parseSize(pkg) for pkg in packageList)
-            userSize = sum(parseSize(pkg) for pkg in packageList if pkg["name"] in userPkgs)
-            systemSize = totalSize - userSize
+            # ==> COUNTS AND SIZES
+            totalCount, userCount, systemCount = result["count"], result["userCount"], result["systemCount"]
+            totalSize, userSize, systemSize = result["totalSize"], result["userSize"], result["systemSize"]
 
 
 
             # ==> SPLIT FORMATTED SIZES INTO VALUE + UNIT
             def splitFormattedSize(sizeBytes):
-                formatted = Formatter.formatSize(int(sizeBytes * 1024))
+                formatted = Formatter.formatSize(sizeBytes)
                 parts = formatted.split()
                 if len(parts) == 2:
                     return parts[0], parts[1]
@@ -879,7 +709,7 @@ class Packages:
 
             # ==> FUNCTION TO GET PACKAGE COLOR BASED ON TYPE
             def getPackageColor(pkg):
-                return Formatter.userPackageColor if pkg.get("isUser", False) else Formatter.systemPackageColor
+                return Formatter.userPackageColor if pkg.isUser else Formatter.systemPackageColor
 
 
 
@@ -918,11 +748,11 @@ class Packages:
             # ==> PRINT SIZE STATISTICS
             print(f"{Formatter.tab4}{Formatter.bold}Size:{Formatter.reset}")
             
-            largestName = f"{largest['name']:<{nameWidth}}"
-            smallestName = f"{smallest['name']:<{nameWidth}}"
+            largestName = f"{largest.name:<{nameWidth}}"
+            smallestName = f"{smallest.name:<{nameWidth}}"
 
-            largestSize = f"{largest['sizeValue']:<{sizeValueWidth}} {largest['sizeUnit']:<{sizeUnitWidth}}"
-            smallestSize = f"{smallest['sizeValue']:<{sizeValueWidth}} {smallest['sizeUnit']:<{sizeUnitWidth}}"
+            largestSize = f"{largestValue:<{sizeValueWidth}} {largestUnit:<{sizeUnitWidth}}"
+            smallestSize = f"{smallestValue:<{sizeValueWidth}} {smallestUnit:<{sizeUnitWidth}}"
 
             print(f"{Formatter.tab8}Largest package  ->  "
                 f"{Formatter.colorText(largestName, getPackageColor(largest), Formatter.bold)}  "
@@ -937,90 +767,265 @@ class Packages:
 
 
 
-            # ==> PRINT INSTALLATION DATES
-            print(f"{Formatter.tab4}{Formatter.bold}Installation Dates:{Formatter.reset}")
-            
-            oldestName = f"{oldestInstalled['name']:<{nameWidth}}"
-            latestName = f"{latestInstalled['name']:<{nameWidth}}"
+            # ==> PRINT INSTALLATION DATES
+            print(f"{Formatter.tab4}{Formatter.bold}Installation Dates:{Formatter.reset}")
+            
+            oldestName = f"{oldestInstalled.name:<{nameWidth}}"
+            latestName = f"{latestInstalled.name:<{nameWidth}}"
+
+            print(f"{Formatter.tab8}Oldest installed ->  "
+                f"{Formatter.colorText(oldestName, getPackageColor(oldestInstalled), Formatter.bold)}  "
+                f"({Formatter.colorText(oldestInstalled.installedText(), Formatter.dateColor)})")
+
+            print(f"{Formatter.tab8}Latest installed ->  "
+                f"{Formatter.colorText(latestName, getPackageColor(latestInstalled), Formatter.bold)}  "
+                f"({Formatter.colorText(latestInstalled.installedText(), Formatter.dateColor)})")
+            print()
+
+
+
+
+
+            # ==> PRINT UPDATE DATES
+            print(f"{Formatter.tab4}{Formatter.bold}Update Dates:{Formatter.reset}")
+            
+            oldestUpdName = f"{oldestUpdated.name:<{nameWidth}}"
+            latestUpdName = f"{latestUpdated.name:<{nameWidth}}"
+
+            print(f"{Formatter.tab8}Oldest updated   ->  "
+                f"{Formatter.colorText(oldestUpdName, getPackageColor(oldestUpdated), Formatter.bold)}  "
+                f"({Formatter.colorText(oldestUpdated.updatedText(), Formatter.dateColor)})")
+
+            print(f"{Formatter.tab8}Latest updated   ->  "
+                f"{Formatter.colorText(latestUpdName, getPackageColor(latestUpdated), Formatter.bold)}  "
+                f"({Formatter.colorText(latestUpdated.updatedText(), Formatter.dateColor)})")
+            print()
+
+
+
+
+
+            # ==> PRINT SIZE DISTRIBUTION
+            print(f"{Formatter.tab4}{Formatter.bold}Size Distribution:{Formatter.reset}")
+
+            percentileText = "   ".join(f"p{p} {Formatter.colorText(Formatter.formatSize(size), Formatter.sizeColor)}" for p, size in result["percentiles"].items())
+            print(f"{Formatter.tab8}Percentiles      ->  {percentileText}")
+
+            labelWidth = max(len(label) for label, _, _ in result["histogram"])
+            countWidth = max(len(str(count)) for _, count, _ in result["histogram"])
+            for label, count, size in result["histogram"]:
+                print(f"{Formatter.tab8}{label:<{labelWidth}}  ->  "
+                    f"{Formatter.colorText(str(count).rjust(countWidth), Formatter.white, Formatter.bold)} packages  "
+                    f"{Formatter.colorText(Formatter.formatSize(size), Formatter.sizeColor)}")
+            print()
+
+
+
+
+
+            # ==> PRINT GROUP-BY BREAKDOWNS
+            for key, rows in result["groups"].items():
+                print(f"{Formatter.tab4}{Formatter.bold}By {key.capitalize()}:{Formatter.reset}")
+
+                labelWidth = max(len(label) for label, _, _ in rows)
+                countWidth = max(len(str(count)) for _, count, _ in rows)
+                for label, count, size in rows:
+                    print(f"{Formatter.tab8}{label:<{labelWidth}}  ->  "
+                        f"{Formatter.colorText(str(count).rjust(countWidth), Formatter.white, Formatter.bold)} packages  "
+                        f"{Formatter.colorText(Formatter.formatSize(size), Formatter.sizeColor)}")
+                print()
+
+
+
+        except Exception as error:
+            logError(f"Failed to fetch package statistics ({error})")
+
+    
+    
+    
+    
+    
+    
+    
+    def _exportStats(self, result: dict) -> dict:
+        def named(pkg, value):
+            return {"name": pkg.name, **value}
+
+
+        return {
+            "packages": result["count"],
+            "userPackages": result["userCount"],
+            "systemPackages": result["systemCount"],
+            "totalSize": result["totalSize"],
+            "userSize": result["userSize"],
+            "systemSize": result["systemSize"],
+            "largest": named(result["largest"], {"sizeBytes": result["largest"].sizeBytes}),
+            "smallest": named(result["smallest"], {"sizeBytes": result["smallest"].sizeBytes}),
+            "oldestInstalled": named(result["oldestInstalled"], {"installed": PackageRecord.isoDate(result["oldestInstalled"].installedTs)}),
+            "latestInstalled": named(result["latestInstalled"], {"installed": PackageRecord.isoDate(result["latestInstalled"].installedTs)}),
+            "oldestUpdated": named(result["oldestUpdated"], {"updated": PackageRecord.isoDate(result["oldestUpdated"].updatedTs)}),
+            "latestUpdated": named(result["latestUpdated"], {"updated": PackageRecord.isoDate(result["latestUpdated"].updatedTs)}),
+            "percentiles": {f"p{p}": size for p, size in result["percentiles"].items()},
+            "histogram": [{"bucket": label, "packages": count, "sizeBytes": size} for label, count, size in result["histogram"]],
+            "groups": {key: [{"name": label, "packages": count, "sizeBytes": size} for label, count, size in rows] for key, rows in result["groups"].items()},
+        }
+
+
+
+
+
+
+
+    def listFiles(self, packageName: str) -> None:
+        try:
+            # ==> CHECK IF PACKAGE EXISTS
+            if not self._packageExists(packageName):
+                print(Formatter.colorText(f"Package '{packageName}' not found.", Formatter.red))
+                return
+
+
+
+            print(Formatter.colorText(f"\nFiles installed by '{packageName}':", Formatter.headerColor, Formatter.bold))
+            print()
+
+
+
+            if self.pactool.manager.defaultPackageManager == "pacman":
+                result = run(["pacman", "-Ql", packageName], capture_output=True, text=True, check=False)
+                files = [line.split(maxsplit=1)[1] for line in result.stdout.splitlines()]
+            elif self.pactool.manager.defaultPackageManager == "apt":
+                result = run(["dpkg", "-L", packageName], capture_output=True, text=True, check=False)
+                files = result.stdout.splitlines()
+            else:
+                print(Formatter.colorText("No supported package manager found.", Formatter.red))
+                return
+
+
+
+            if not files or all(f.strip() == "" for f in files):
+                print(Formatter.colorText(f"No files found for package '{packageName}'.", Formatter.yellow))
+                return
+
+
+
+            for f in files:
+                print(f"{Formatter.tab4}{f}")
+
+
+        except Exception as error:
+            logError(f"Failed to list files for '{packageName}' ({error})")
+
+
+
+
+
+
+
+
+
+
+    def _ownershipIndex(self):
+        # ==> ONLY THE OWNERSHIP COMMANDS NEED IT, SO IT IS IMPORTED ON FIRST USE
+        if self.ownershipIndex is None:
+            from core.owners import FileOwnershipIndex
+            self.ownershipIndex = FileOwnershipIndex(self.pactool.manager.defaultPackageManager, self.pactool.cache.enabled)
+        return self.ownershipIndex
+
+
+
+
+
+    def _historyStore(self):
+        # ==> sqlite3 AND THE LOG PARSERS ONLY LOAD FOR THE HISTORY COMMANDS
+        if self.historyStore is None:
+            from core.history import HistoryStore
+            self.historyStore = HistoryStore(self.pactool.manager.defaultPackageManager, self.pactool.cache.enabled)
+        return self.historyStore
+
+
+
+
+
+    def owns(self, path: str) -> None:
+        try:
+            ownershipIndex = self._ownershipIndex()
+            if not ownershipIndex.available():
+                print(Formatter.colorText("No supported package database found.", Formatter.red))
+                return
+
+
+            owners = ownershipIndex.owners(path)
+            if not owners:
+                print(Formatter.colorText(f"No package owns '{path}'.", Formatter.yellow))
+                return
+
 
-            print(f"{Formatter.tab8}Oldest installed ->  "
-                f"{Formatter.colorText(oldestName, getPackageColor(oldestInstalled), Formatter.bold)}  "
-                f"({Formatter.colorText(oldestInstalled['installed'], Formatter.dateColor)})")
+            ownerNames = ", ".join(Formatter.colorText(owner, Formatter.userPackageColor if self._isUserPackage(owner) else Formatter.systemPackageColor, Formatter.bold) for owner in owners)
+            print(f"{path} is owned by {ownerNames}")
 
-            print(f"{Formatter.tab8}Latest installed ->  "
-                f"{Formatter.colorText(latestName, getPackageColor(latestInstalled), Formatter.bold)}  "
-                f"({Formatter.colorText(latestInstalled['installed'], Formatter.dateColor)})")
-            print()
 
+        except Exception as error:
+            logError(f"Failed to look up the owner of '{path}' ({error})")
 
 
 
 
-            # ==> PRINT UPDATE DATES
-            print(f"{Formatter.tab4}{Formatter.bold}Update Dates:{Formatter.reset}")
-            
-            oldestUpdName = f"{oldestUpdated['name']:<{nameWidth}}"
-            latestUpdName = f"{latestUpdated['name']:<{nameWidth}}"
 
-            print(f"{Formatter.tab8}Oldest updated   ->  "
-                f"{Formatter.colorText(oldestUpdName, getPackageColor(oldestUpdated), Formatter.bold)}  "
-                f"({Formatter.colorText(oldestUpdated['updated'], Formatter.dateColor)})")
+    def ownsGlob(self, pattern: str, limit: int = None) -> None:
+        try:
+            ownershipIndex = self._ownershipIndex()
+            if not ownershipIndex.available():
+                print(Formatter.colorText("No supported package database found.", Formatter.red))
+                return
 
-            print(f"{Formatter.tab8}Latest updated   ->  "
-                f"{Formatter.colorText(latestUpdName, getPackageColor(latestUpdated), Formatter.bold)}  "
-                f"({Formatter.colorText(latestUpdated['updated'], Formatter.dateColor)})")
-            print()
 
+            page = TableRenderer()
+            count = 0
+            for path, owners in self._limitItems(ownershipIndex.glob(pattern), limit):
+                page.addLine(f"{path}  {Formatter.colorText(', '.join(owners), Formatter.systemPackageColor)}")
+                count += 1
+            page.flush()
 
 
-        except Exception as error:
-            logError(f"Failed to fetch package statistics ({error})")
+            if not count:
+                print(Formatter.colorText(f"No packaged path matches '{pattern}'.", Formatter.yellow))
 
-    
-    
-    
-    
-    
-    
-    
-    def listFiles(self, packageName: str) -> None:
-        try:
-            # ==> CHECK IF PACKAGE EXISTS
-            if not self._packageExists(packageName):
-                print(Formatter.colorText(f"Package '{packageName}' not found.", Formatter.red))
-                return
 
+        except Exception as error:
+            logError(f"Failed to match '{pattern}' against packaged files ({error})")
 
 
-            print(Formatter.colorText(f"\nFiles installed by '{packageName}':", Formatter.headerColor, Formatter.bold))
-            print()
 
 
 
-            if self.pactool.manager.defaultPackageManager == "pacman":
-                result = run(["pacman", "-Ql", packageName], capture_output=True, text=True, check=False)
-                files = [line.split(maxsplit=1)[1] for line in result.stdout.splitlines()]
-            elif self.pactool.manager.defaultPackageManager == "apt":
-                result = run(["dpkg", "-L", packageName], capture_output=True, text=True, check=False)
-                files = result.stdout.splitlines()
-            else:
-                print(Formatter.colorText("No supported package manager found.", Formatter.red))
+    def orphanFiles(self, directory: str, limit: int = None) -> None:
+        try:
+            ownershipIndex = self._ownershipIndex()
+            if not ownershipIndex.available():
+                print(Formatter.colorText("No supported package database found.", Formatter.red))
                 return
 
 
+            print(Formatter.colorText(f"\nFiles under '{directory}' no package owns:", Formatter.headerColor, Formatter.bold))
+            print()
 
-            if not files or all(f.strip() == "" for f in files):
-                print(Formatter.colorText(f"No files found for package '{packageName}'.", Formatter.yellow))
-                return
 
+            page = TableRenderer()
+            count = 0
+            for path in self._limitItems(ownershipIndex.orphans(directory), limit):
+                page.addLine(f"{Formatter.tab4}{path}")
+                count += 1
+            page.flush()
 
 
-            for f in files:
-                print(f"{Formatter.tab4}{f}")
+            if count:
+                print(Formatter.colorText(f"\n{count} unowned path(s).", Formatter.yellow))
+            else:
+                print(Formatter.colorText("Every file is owned by a package.", Formatter.green))
 
 
         except Exception as error:
-            logError(f"Failed to list files for '{packageName}' ({error})")
+            logError(f"Failed to look for orphan files under '{directory}' ({error})")
 
 
 
@@ -1057,6 +1062,7 @@ class Packages:
             
             
             # ==> DISPLAY UPDATED STATS
+            self.pactool.snapshot.invalidate()
             self.stats(headerText="Updated Package Statistics")
 
 
@@ -1097,6 +1103,7 @@ class Packages:
 
 
             # ==> DISPLAY UPDATED STATS
+            self.pactool.snapshot.invalidate()
             self.stats(headerText="Updated Package Statistics")
 
 
@@ -1138,6 +1145,7 @@ class Packages:
 
 
             # ==> DISPLAY UPDATED STATS
+            self.pactool.snapshot.invalidate()
             self.stats(headerText="Updated Package Statistics")
 
 
@@ -1179,6 +1187,7 @@ class Packages:
 
 
             # ==> DISPLAY UPDATED STATS
+            self.pactool.snapshot.invalidate()
             self.stats(headerText="Updated Package Statistics")
 
 
@@ -1194,44 +1203,65 @@ class Packages:
 
 
 
+    def iterPackages(self):
+        """
+        Yield installed PackageRecords as they are read, for streaming consumers.
+        """
+        if self.pactool.manager.defaultPackageManager == "apt":
+            database = DpkgDatabase()
+            return database.iterRecords() if database.available() else iter(self._queryAptPackages())
+        elif self.pactool.manager.defaultPackageManager == "pacman":
+            return self.pacmanDatabase.iterRecords() if self.pacmanDatabase.available() else iter(self._queryPacmanPackages())
+        return iter(())
+
+
+
+
+
+
+
+
+
     def collectAptPackages(self) -> list:
+        # ==> READ /var/lib/dpkg DIRECTLY WHEN POSSIBLE
+        database = DpkgDatabase()
+        if database.available():
+            return database.collect()
+
+
+        return self._queryAptPackages()
+
+
+
+
+
+
+
+
+
+    def _queryAptPackages(self) -> list:
         result = run(
-            ["dpkg-query", "-W", "-f=${Package} ${Installed-Size}\n"],
+            ["dpkg-query", "-W", "-f=${Package}\t${Installed-Size}\t${Section}\n"],
             capture_output=True, text=True, check=True
         )
 
 
         packages = []
         for line in result.stdout.strip().split("\n"):
-            parts = line.split()
-            if len(parts) < 2:
+            parts = line.split("\t")
+            if len(parts) < 3 or not parts[1].isdigit():
                 continue
 
 
-            packageName = parts[0]
-            sizeKb = int(parts[1])
-
-
-            # ==> SPLIT SIZE INTO VALUE AND UNIT
-            sizeVal, sizeUnit = self.splitSize(Formatter.formatSize(sizeKb * 1024))
+            packageName, sizeKb, section = parts[0], int(parts[1]), parts[2]
 
 
             # ==> GET INSTALL AND UPDATE DATES
-            infoFile = f"/var/lib/dpkg/info/{packageName}.list"
-            installedTime, installedTs = self.getFileDate(infoFile, returnTimestamp=True)
-            updatedTime, updatedTs = self.getFileDate(infoFile, updated=True, returnTimestamp=True)
+            installedTs, updatedTs = self.getFileTimes(f"/var/lib/dpkg/info/{packageName}.list")
 
 
             # ==> APPEND PACKAGE DATA
-            packages.append({
-                "name": packageName,
-                "sizeValue": sizeVal,
-                "sizeUnit": sizeUnit,
-                "installed": installedTime,
-                "updated": updatedTime,
-                "installedTs": installedTs,
-                "updatedTs": updatedTs
-            })
+            packages.append(PackageRecord(packageName, sizeKb * 1024, installedTs, updatedTs, section))
 
 
         return packages
@@ -1246,6 +1276,22 @@ class Packages:
     
 
     def collectPacmanPackages(self) -> list:
+        # ==> READ /var/lib/pacman/local DIRECTLY WHEN POSSIBLE
+        if self.pacmanDatabase.available():
+            return self.pacmanDatabase.collect()
+
+
+        return self._queryPacmanPackages()
+
+
+
+
+
+
+
+
+
+    def _queryPacmanPackages(self) -> list:
         result = run(["pacman", "-Qi"], capture_output=True, text=True, check=True)
         blocks = result.stdout.strip().split("\n\n")
 
@@ -1266,26 +1312,27 @@ class Packages:
 
 
 
-    def parsePacmanBlock(self, block: str) -> dict:
+    def parsePacmanBlock(self, block: str) -> PackageRecord:
         lines = block.split("\n")
-        info = {}
+        record = None
 
 
         for line in lines:
             if line.startswith("Name"):
-                info["name"] = line.split(":", 1)[1].strip()
+                record = PackageRecord(line.split(":", 1)[1].strip())
                 
                 
-            elif line.startswith("Installed Size"):
-                sizeStr = line.split(":", 1)[1].strip()
-                sizeVal, sizeUnit = self.splitSize(sizeStr)
-                info["sizeValue"] = sizeVal
-                info["sizeUnit"] = sizeUnit
+            elif line.startswith("Installed Size") and record:
+                record.sizeBytes = Formatter.parseSize(line.split(":", 1)[1].strip())
                 
                 
-            elif line.startswith("Install Date"):
+            elif line.startswith("Groups") and record:
+                groups = line.split(":", 1)[1].split()
+                record.section = groups[0] if groups and groups[0] != "None" else ""
+                
+                
+            elif line.startswith("Install Date") and record:
                 dateStr = line.split(":", 1)[1].strip()
-                info["installed"] = info["updated"] = dateStr
 
 
                 # ==> CONVERT PARSED DATE TO TIMESTAMP (FALL BACK TO 0)
@@ -1293,14 +1340,12 @@ class Packages:
                 try:
                     ts = dt.timestamp()
                 except (OverflowError, ValueError, OSError):
-                    ts = 0
-
-                info["installedTs"] = info["updatedTs"] = ts
-
+                    ts = 0.0
 
-        return info if "name" in info else None
+                record.installedTs = record.updatedTs = ts
 
 
+        return record
 
 
 
@@ -1308,26 +1353,15 @@ class Packages:
 
 
 
-    def splitSize(self, sizeStr: str):
-        parts = sizeStr.split()
-        return (parts[0], parts[1]) if len(parts) == 2 else (sizeStr, "")
 
 
-
-
-
-
-
-
-
-    def getFileDate(self, path: str, *, updated=False, returnTimestamp=False):
+    def getFileTimes(self, path: str) -> tuple:
+        # ==> (INSTALLED, UPDATED) AS (ctime, mtime), (0, 0) WHEN MISSING
         try:
             st = stat(path)
-            ts = st.st_mtime if updated else st.st_ctime
-            nice = datetime.fromtimestamp(ts).strftime("%a %d %b %Y %I:%M:%S %p %z")
-            return (nice, ts) if returnTimestamp else nice
+            return st.st_ctime, st.st_mtime
         except FileNotFoundError:
-            return ("N/A", 0) if returnTimestamp else "N/A"
+            return 0.0, 0.0
 
 
 
@@ -1340,21 +1374,12 @@ class Packages:
         
         
     def _isUserPackage(self, packageName: str) -> bool:
-        if not hasattr(self, "_cachedUserPkgs"):
-            self._cachedUserPkgs = set()
-            
-            
-            if self.pactool.manager.defaultPackageManager == "pacman":
-                result = run(["pacman", "-Qe"], capture_output=True, text=True)
-                self._cachedUserPkgs = {line.split()[0] for line in result.stdout.strip().splitlines() if line}
-                
-                
-            elif self.pactool.manager.defaultPackageManager == "apt":
-                result = run(["apt-mark", "showmanual"], capture_output=True, text=True)
-                self._cachedUserPkgs = {line.strip() for line in result.stdout.strip().splitlines() if line}
-                
-                
-        return packageName.split()[0] in self._cachedUserPkgs
+        # ==> SEARCH LINES CARRY THE REPOSITORY: name/suite (apt) OR repo/name (pacman)
+        name = packageName.split()[0]
+        if "/" in name:
+            first, _, second = name.partition("/")
+            name = first if self.pactool.manager.defaultPackageManager == "apt" else second
+        return self.pactool.snapshot.isUserPackage(name)
     
     
     
@@ -1389,6 +1414,7 @@ class Packages:
             
         # ==> SHOW THE NEW STATS
         print()
+        self.pactool.snapshot.invalidate()
         self.stats()
 
 
@@ -1478,54 +1504,40 @@ class Packages:
 
 
     # ==> FIND UNUSED OPTIONAL DEPENDENCIES (BLOAT)
-    def bloat(self, limit: int = None) -> None:
+    def bloat(self, limit: int = None, outputFormat: str = None) -> None:
         try:
             # ==> PRINT HEADER
-            print(Formatter.colorText("\nAnalyzing for bloat (unused optional dependencies) [...]\n", Formatter.headerColor, Formatter.bold))
-
+            if not outputFormat:
+                print(Formatter.colorText("\nAnalyzing for bloat (packages only kept by optional dependencies) [...]\n", Formatter.headerColor, Formatter.bold))
 
 
-            bloatList = []
-            userPkgs = set(self._getUserPackages())
 
-
-
-            # ==> PACMAN IMPLEMENTATION
-            if self.pactool.manager.defaultPackageManager == "pacman":
-                result = run(["pacman", "-Qi"], capture_output=True, text=True, check=False)
-                currentPkg = None
-
-                for line in result.stdout.splitlines():
-                    if line.startswith("Name"):
-                        currentPkg = line.split(":", 1)[1].strip()
-                    elif line.startswith("Optional Deps") and currentPkg:
-                        if "None" not in line:
-                            bloatList.append(currentPkg)
-
-
-
-            # ==> APT IMPLEMENTATION
-            elif self.pactool.manager.defaultPackageManager == "apt":
-                installedPkgs = run(
-                    ["dpkg-query", "-f", "${binary:Package}\n", "-W"],
-                    capture_output=True,
-                    text=True
-                ).stdout.splitlines()
+            # ==> NON-EXPLICIT PACKAGES THAT ONLY OPTIONAL DEPENDENCIES KEEP AROUND
+            graph = self.pactool.snapshot.dependencyGraph()
+            if graph is not None:
+                bloatList = graph.optionalOnly()
+                wantedBy = graph.optionalDependents
+            else:
+                optionalOnly = self.pactool.snapshot.optionalOnly()
+                bloatList = list(optionalOnly)
+                wantedBy = optionalOnly.get
+            userPkgs = self.pactool.snapshot.userPackages()
 
 
 
-                for pkg in installedPkgs:
-                    info = run(["apt-cache", "show", pkg], capture_output=True, text=True).stdout
-                    for line in info.splitlines():
-                        if line.startswith("Recommends:") or line.startswith("Suggests:"):
-                            bloatList.append(pkg)
-                            break
+            if outputFormat:
+                records = (
+                    {"name": pkg, "user": pkg in userPkgs, "wantedBy": wantedBy(pkg)}
+                    for pkg in self._limitItems(bloatList, limit)
+                )
+                RecordWriter(outputFormat).writeRecords(records)
+                return
 
 
 
             # ==> DISPLAY RESULTS
             if bloatList:
-                print(Formatter.colorText("Packages with unused optional dependencies:\n", Formatter.yellow))
+                print(Formatter.colorText("Packages only kept by optional dependencies:\n", Formatter.yellow))
                 
                 
                 # ==> WIDTH OF THE INDEX COLUMN
@@ -1559,14 +1571,21 @@ class Packages:
 
 
     # ==> FIND UNUSED ORPHANED PACKAGES
-    def unused(self, limit: int = None) -> None:
+    def unused(self, limit: int = None, outputFormat: str = None) -> None:
         try:
             # ==> PRINT HEADER
-            print(Formatter.colorText("\nFinding unused (Orphan) packages [...]\n", Formatter.headerColor, Formatter.bold))
+            if not outputFormat:
+                print(Formatter.colorText("\nFinding unused (Orphan) packages [...]\n", Formatter.headerColor, Formatter.bold))
+
+
+            # ==> NOTHING NEEDS THEM, NOT EVEN OPTIONALLY (ORPHANED CYCLES INCLUDED)
+            graph = self.pactool.snapshot.dependencyGraph()
+            if graph is not None:
+                orphaned = graph.orphans()
 
 
             # ==> CHECK FOR PACMAN PACKAGE MANAGER
-            if self.pactool.manager.defaultPackageManager == "pacman":
+            elif self.pactool.manager.defaultPackageManager == "pacman":
                 result = run(["pacman", "-Qdtq"], capture_output=True, text=True, check=False)
                 orphaned = result.stdout.splitlines()
 
@@ -1581,6 +1600,12 @@ class Packages:
                 orphaned = []
 
 
+            if outputFormat:
+                userPkgs = self.pactool.snapshot.userPackages()
+                RecordWriter(outputFormat).writeRecords({"name": pkg, "user": pkg in userPkgs} for pkg in self._limitItems(orphaned, limit))
+                return
+
+
             # ==> HANDLE NO UNUSED PACKAGES FOUND
             if not orphaned:
                 print(Formatter.colorText("No unused packages found.", Formatter.green))
@@ -1618,51 +1643,24 @@ class Packages:
             
             
     # ==> LIST ALL OUTDATED PACKAGES
-    def outdated(self, limit: int = None) -> None:
+    def outdated(self, limit: int = None, outputFormat: str = None) -> None:
         try:
-            # ==> PRINT HEADER
-            print(Formatter.colorText("\nChecking for outdated packages [...]\n", Formatter.headerColor, Formatter.bold))
-
-
-            outdatedPkgs = []
-            userPkgs = set(self._getUserPackages())
-
-
-            # ==> PACMAN IMPLEMENTATION
-            if self.pactool.manager.defaultPackageManager == "pacman":
-                # ==> RUN PACMAN SYNC TO LIST OUTDATED PACKAGES
-                result = run(["pacman", "-Qu"], capture_output=True, text=True, check=False)
-
-
-                for line in result.stdout.splitlines():
-                    # ==> FORMAT (packageName currentVersion -> newVersion)
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        outdatedPkgs.append((parts[0], parts[1], parts[3]))
-
-
-            # ==> APT IMPLEMENTATION
-            elif self.pactool.manager.defaultPackageManager == "apt":
-                # ==> UPDATE PACKAGE INFO
-                run(["sudo", "apt", "update"], stdout=PIPE, stderr=PIPE, text=True)
+            userPkgs = self.pactool.snapshot.userPackages()
 
 
-                # ==> CHECK OUTDATED PACKAGES USING APT LIST
-                result = run(["apt", "list", "--upgradable"], capture_output=True, text=True, check=False)
+            # ==> STREAM STRAIGHT FROM THE PACKAGE MANAGER'S OUTPUT
+            if outputFormat:
+                records = (
+                    {"name": pkg, "current": current, "new": new, "user": pkg in userPkgs}
+                    for pkg, current, new in self._limitItems(self._outdatedPackages(), limit)
+                )
+                RecordWriter(outputFormat).writeRecords(records)
+                return
 
 
-                for line in result.stdout.splitlines():
-                    # ==> SKIP HEADERS
-                    if "Listing [...]" in line:
-                        continue
-                    
-                    
-                    parts = line.split()
-                    if len(parts) >= 3:
-                        pkg = parts[0].split("/")[0]
-                        current = parts[1]
-                        newVersion = parts[2] if len(parts) > 2 else "?"
-                        outdatedPkgs.append((pkg, current, newVersion))
+            # ==> PRINT HEADER
+            print(Formatter.colorText("\nChecking for outdated packages [...]\n", Formatter.headerColor, Formatter.bold))
+            outdatedPkgs = list(self._outdatedPackages())
 
 
             # ==> HANDLE EMPTY RESULT
@@ -1678,10 +1676,6 @@ class Packages:
             newWidth = max(len(pkg[2]) for pkg in outdatedPkgs) + 2
 
 
-            # ==> GET USER PACKAGES TO DETERMINE COLOR
-            userPkgs = self._getUserPackages()
-
-
             # ==> DISPLAY OUTDATED PACKAGES HEADER
             print(Formatter.colorText("Outdated Packages:\n", Formatter.headerColor, Formatter.bold))
 
@@ -1714,6 +1708,51 @@ class Packages:
 
 
 
+    def _outdatedPackages(self):
+        """
+        Yield (packageName, currentVersion, newVersion) for every upgradable package.
+        """
+        # ==> PACMAN IMPLEMENTATION
+        if self.pactool.manager.defaultPackageManager == "pacman":
+            # ==> RUN PACMAN SYNC TO LIST OUTDATED PACKAGES
+            result = run(["pacman", "-Qu"], capture_output=True, text=True, check=False)
+
+
+            for line in result.stdout.splitlines():
+                # ==> FORMAT (packageName currentVersion -> newVersion)
+                parts = line.split()
+                if len(parts) >= 4:
+                    yield parts[0], parts[1], parts[3]
+
+
+        # ==> APT IMPLEMENTATION
+        elif self.pactool.manager.defaultPackageManager == "apt":
+            # ==> UPDATE PACKAGE INFO
+            run(["sudo", "apt", "update"], stdout=PIPE, stderr=PIPE, text=True)
+
+
+            # ==> CHECK OUTDATED PACKAGES USING APT LIST
+            result = run(["apt", "list", "--upgradable"], capture_output=True, text=True, check=False)
+
+
+            for line in result.stdout.splitlines():
+                # ==> SKIP HEADERS
+                if line.startswith("Listing"):
+                    continue
+
+
+                # ==> FORMAT (name/suite newVersion arch [upgradable from: currentVersion])
+                parts = line.split()
+                if len(parts) >= 3:
+                    pkg = parts[0].split("/")[0]
+                    newVersion = parts[1]
+                    current = parts[-1].rstrip("]") if "from:" in line else "?"
+                    yield pkg, current, newVersion
+
+
+
+
+
     def history(self, packageName: str) -> None:
         try:
             # ==> CHECK IF PACKAGE EXISTS
@@ -1730,65 +1769,24 @@ class Packages:
             print(Formatter.colorText(f"\nPackage Version History for '{packageName}':\n", Formatter.headerColor, Formatter.bold))
 
 
-            # ==> LIST TO STORE EVENTS
-            events = []
-            commandUsed = None
-
-
-            ################################################################################
-            # ==> PACMAN                                                                   #
-            ################################################################################
-            if self.pactool.manager.defaultPackageManager == "pacman":
-                logData = run(["grep", packageName, "/var/log/pacman.log"], capture_output=True, text=True).stdout.splitlines()
-                if not logData:
-                    print(Formatter.colorText("No version history found.", Formatter.yellow))
-                    return
-
-
-                for line in logData:
-                    if "[PACMAN]" in line and packageName in line:
-                        commandUsed = line.split("]")[-1].strip().replace("Running '", "").replace("'", "")
-                    
-                    
-                    elif "[ALPM]" in line and ("installed" in line or "upgraded" in line):
-                        timestamp = line.split()[0].strip("[]")
-
-                        # ==> DETERMINE ACTION AND VERSION INFO
-                        if "upgraded" in line:
-                            oldVer = line.split("from")[-1].split()[0].strip("()")
-                            newVer = line.split("to")[-1].split()[0].strip("()")
-                            version = f"{oldVer} -> {newVer}"
-                            action = " Upgraded"
-                        else:
-                            version = line.split(packageName)[-1].strip().strip("()")
-                            action = "Installed"
-
-                        timeStr = Formatter.formatHistoryTime(timestamp)
-                        events.append((action, version, timeStr))
-
+            # ==> EXACT PER-PACKAGE EVENTS FROM THE INDEXED LOG STORE
+            historyStore = self._historyStore()
+            storedEvents = historyStore.packageEvents(packageName)
+            if not storedEvents:
+                print(Formatter.colorText("No version history found.", Formatter.yellow))
+                return
 
 
-            ################################################################################
-            # ==> APT                                                                      #
-            ################################################################################
-            elif self.pactool.manager.defaultPackageManager == "apt":
-                logData = run(["grep", "-i", packageName, "/var/log/apt/history.log"], capture_output=True, text=True).stdout.splitlines()
-                if not logData:
-                    print(Formatter.colorText("No version history found.", Formatter.yellow))
-                    return
+            labelWidth = max(len(self.historyActions[event[1]]) for event in storedEvents)
+            events = []
+            for time, action, oldVersion, newVersion, _, _ in storedEvents:
+                version = f"{oldVersion} -> {newVersion}" if oldVersion and newVersion else oldVersion or newVersion
+                timeStr = Formatter.formatHistoryTime(historyStore.timeText(time))
+                events.append((self.historyActions[action].rjust(labelWidth), version, timeStr))
 
 
-                for line in logData:
-                    if "Commandline:" in line:
-                        commandUsed = line.split("Commandline:")[-1].strip()
-                    
-                    
-                    elif "Install" in line or "Upgrade" in line:
-                        action = "Installed" if "Install" in line else " Upgraded"
-                        version = line.split()[-1]
-                        dateStr = self._extractAptDate()
-                        timeStr = Formatter.formatHistoryTime(dateStr)
-                        events.append((action, version, timeStr))
+            # ==> THE MOST RECENT TRANSACTION THAT TOUCHED THE PACKAGE
+            commandUsed, requestedBy = storedEvents[-1][4:]
 
 
 
@@ -1823,6 +1821,8 @@ class Packages:
                 print(f"\n{Formatter.tab4}{Formatter.colorText('Command used:', Formatter.brightWhite, Formatter.bold)}")
                 highlightedCommand = self._highlightCommandPackage(commandUsed, packageName, pkgColor)
                 print(f"{Formatter.tab8}{highlightedCommand}")
+                if requestedBy:
+                    print(f"{Formatter.tab8}{Formatter.colorText('Requested by', Formatter.white)} {Formatter.colorText(requestedBy, Formatter.cyan)}")
 
 
 
@@ -1856,27 +1856,22 @@ class Packages:
         ################################################################################
         if self.pactool.manager.defaultPackageManager == "pacman":
             currentVer = run(["pacman", "-Q", packageName], capture_output=True, text=True).stdout.split()[1]
-            logData = run(["grep", packageName, "/var/log/pacman.log"], capture_output=True, text=True).stdout.splitlines()
 
 
 
-            # ==> COLLECT VERSIONS
-            for line in logData:
-                if "[ALPM]" in line:
-                    if "upgraded" in line:
-                        parts = line.split()
-                        oldVer = parts[-3].strip("()")
-                        newVer = parts[-1].strip("()")
-                        versions.append((oldVer, newVer))
-                        
-                        
-                    elif "installed" in line:
-                        ver = line.split(packageName)[-1].strip().strip("()")
-                        versions.append((ver, None))
+            # ==> COLLECT VERSIONS FROM THE SAME EVENTS history() PRINTED
+            for _, action, oldVer, newVer, _, _ in self._historyStore().packageEvents(packageName):
+                if action in ("upgrade", "downgrade"):
+                    versions.append((oldVer, newVer))
+                elif action in ("install", "reinstall"):
+                    versions.append((newVer, None))
 
 
 
             versions = list(dict.fromkeys(versions))
+            if not versions:
+                print(f"{Formatter.tab8}{Formatter.colorText('No recorded versions.', Formatter.yellow)}")
+                return
 
 
             # ==> FIND MAX LENGTHS FOR LEFT AND RIGHT VERSIONS
@@ -1930,6 +1925,12 @@ class Packages:
 
 
 
+            if not versions:
+                print(f"{Formatter.tab8}{Formatter.colorText('No recorded versions.', Formatter.yellow)}")
+                return
+
+
+
             leftMax = max(len(v[0]) for v in versions)
 
 
@@ -1968,6 +1969,99 @@ class Packages:
 
 
 
+    def changes(self, since: str, until: str = None, outputFormat: str = None) -> None:
+        try:
+            # ==> PARSE THE WINDOW (A BARE END DAY IS INCLUDED WHOLE)
+            historyStore = self._historyStore()
+            bounds = []
+            for text, endOfRange in ((since, False), (until, True)):
+                try:
+                    bounds.append(historyStore.parseDate(text, endOfRange) if text else None)
+                except ValueError:
+                    print(Formatter.colorText(f"Unrecognised date '{text}' (use YYYY-MM-DD[ HH:MM], today, yesterday, a weekday or 3d/12h/2w).", Formatter.red))
+                    return
+            start, end = bounds
+
+
+            transactions = historyStore.changes(start, end)
+            sizes = {pkg.name: pkg.sizeBytes for pkg in self.pactool.snapshot.packages()}
+
+
+            ################################################################################
+            # ==> MACHINE-READABLE: ONE FLAT RECORD PER EVENT                              #
+            ################################################################################
+            if outputFormat:
+                RecordWriter(outputFormat).writeRecords(
+                    {
+                        "transaction": PackageRecord.isoDate(started),
+                        "ended": PackageRecord.isoDate(ended),
+                        "command": command,
+                        "requestedBy": requestedBy,
+                        "action": action,
+                        "name": name,
+                        "oldVersion": oldVersion,
+                        "newVersion": newVersion,
+                        "sizeBytes": sizes.get(name),
+                    }
+                    for started, ended, command, requestedBy, events in transactions
+                    for action, name, oldVersion, newVersion in events
+                )
+                return
+
+
+            window = f"between {historyStore.timeText(start)} and {historyStore.timeText(end)}" if end else f"since {historyStore.timeText(start)}"
+            print(Formatter.colorText(f"\nPackage changes {window}:\n", Formatter.headerColor, Formatter.bold))
+            if not transactions:
+                print(Formatter.colorText("No package changes recorded in this window.", Formatter.yellow))
+                return
+
+
+            ################################################################################
+            # ==> ONE BLOCK PER TRANSACTION                                                #
+            ################################################################################
+            page = TableRenderer()
+            userPkgs = self.pactool.snapshot.userPackages()
+            counts = {}
+            for started, ended, command, requestedBy, events in transactions:
+                details = [f"{ended - started}s"] if ended is not None else []
+                if requestedBy:
+                    details.append(f"requested by {requestedBy}")
+                suffix = f" ({', '.join(details)})" if details else ""
+                page.addLine(f"{Formatter.tab4}{Formatter.colorText(Formatter.formatHistoryTime(historyStore.timeText(started)).strip(), Formatter.dateColor)}  "
+                             f"{Formatter.colorText(command or 'unknown command', Formatter.brightWhite, Formatter.bold)}{suffix}")
+
+
+                labelWidth = max(len(self.historyActions[event[0]]) for event in events)
+                nameWidth = max(len(event[1]) for event in events)
+                versions = [f"{oldVersion} -> {newVersion}" if oldVersion and newVersion else oldVersion or newVersion for _, _, oldVersion, newVersion in events]
+                versionWidth = max(len(version) for version in versions)
+                for (action, name, _, _), version in zip(events, versions):
+                    counts[action] = counts.get(action, 0) + 1
+                    size = Formatter.formatSize(sizes[name]) if name in sizes else "-"
+                    pkgColor = Formatter.userPackageColor if name in userPkgs else Formatter.systemPackageColor
+                    page.addLine(f"{Formatter.tab8}{Formatter.colorText(self.historyActions[action].ljust(labelWidth), Formatter.white, Formatter.bold)}  "
+                                 f"{Formatter.colorText(name.ljust(nameWidth), pkgColor)}  "
+                                 f"{Formatter.colorText(version.ljust(versionWidth), Formatter.cyan)}  {size}")
+                page.addLine("")
+            page.flush()
+
+
+            summary = ", ".join(f"{count} {self.historyActions[action].lower()}" for action, count in counts.items())
+            print(Formatter.colorText(f"{len(transactions)} transaction(s): {summary}", Formatter.yellow))
+
+
+        except Exception as error:
+            logError(f"Failed to list package changes ({error})")
+
+
+
+
+
+
+
+
+
+
     def versions(self, packageName: str, assessRisk: bool = False) -> None:
         try:
             # ==> CHECK IF PACKAGE EXISTS
@@ -2057,14 +2151,16 @@ class Packages:
 
 
 
-                # ==> PERFORM RISK CALCULATIONS
-                for v in versions:
-                    riskLevel, vulnCount = self._getVulnerabilityInfo(packageName, v)
-                    riskInfo.append((v, riskLevel, vulnCount))
+                # ==> PERFORM RISK CALCULATIONS (ALL VERSIONS AT ONCE, CACHED AND RATE LIMITED)
+                try:
+                    for v, (riskLevel, vulnCount) in zip(versions, self._getVulnerabilityInfo(packageName, versions)):
+                        riskInfo.append((v, riskLevel, vulnCount))
+                finally:
+                    # ==> A CTRL-C DURING A RATE-LIMIT WAIT MUST STILL STOP THE SPINNER
+                    spinnerActive = False
 
 
 
-                spinnerActive = False
                 spinnerThread.join()
                 print("\r" + " " * 60 + "\r", end="")
 
@@ -2126,24 +2222,34 @@ class Packages:
 
 
 
-    def _getVulnerabilityInfo(self, packageName: str, version: str) -> tuple:
+    def _nvdClient(self):
+        # ==> ONLY --versions --assess-risk NEEDS HTTP, KEEP IT OUT OF EVERY OTHER COMMAND'S STARTUP
+        if self.nvdClient is None:
+            from core.nvd import NvdClient
+            self.nvdClient = NvdClient(enabled=self.pactool.cache.enabled, executor=self.pactool.executor)
+        return self.nvdClient
+
+
+
+
+
+    def _getVulnerabilityInfo(self, packageName: str, versions: list) -> list:
         """
-        Returns (riskLevel, vulnCount) for a package version.
+        Returns (riskLevel, vulnCount) for every version, in order.
         Uses the NVD API (no third-party libraries).
         """
-        
-        
-        try:
-            # ==> BUILD QUERY URL
-            baseUrl = "https://services.nvd.nist.gov/rest/json/cves/2.0?keywordSearch="
-            query = quote(f"{packageName} {version}")
-            url = f"{baseUrl}{query}"
+        responses = self._nvdClient().search([f"{packageName} {version}" for version in versions])
+        info = []
+
 
+        for version in versions:
+            data = responses.get(f"{packageName} {version}")
 
-            # ==> SEND HTTP REQUEST
-            req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-            with urlopen(req, timeout=10) as response:
-                data = jsonLoads(response.read().decode("utf-8"))
+
+            # ==> IF API FAILS, RETURN SAFE DEFAULT
+            if data is None:
+                info.append((Formatter.colorText("Unknown", Formatter.brightBlack, Formatter.bold), 0))
+                continue
 
 
             # ==> PARSE CVE COUNT
@@ -2157,13 +2263,8 @@ class Packages:
                 riskLevel = Formatter.colorText("Medium risk", Formatter.yellow, Formatter.bold)
             else:
                 riskLevel = Formatter.colorText("High risk", Formatter.red, Formatter.bold)
+            info.append((riskLevel, vulnCount))
 
 
-            return (riskLevel, vulnCount)
-
-
-
-        except Exception as error:
-            # ==> IF API FAILS, RETURN SAFE DEFAULT
-            return (Formatter.colorText("Unknown", Formatter.brightBlack, Formatter.bold), 0)
+        return info
 
@@ -39,17 +39,16 @@
 
 
 from shutil import get_terminal_size
-from subprocess import run
 from datetime import datetime, timedelta
-from urllib.request import urlopen
-from urllib.error import URLError, HTTPError
-from json import loads as jsonLoads, JSONDecodeError
 from textwrap import wrap as textWrap, fill as textFill
 
 
 # ==> PACTOOL FILES
+from core.process import run
 from core.formatter import Formatter
+from core.render import TableRenderer
 from core.logger import logError
+from core.nvd import NvdClient
 
 
 
@@ -265,8 +264,7 @@ class Security:
 
             try:
                 # ==> CHECK IF arch-audit IS INSTALLED
-                check_audit = run(["which", "arch-audit"], capture_output=True, text=True)
-                if check_audit.returncode != 0:
+                if "arch-audit" not in self.pactool.snapshot.packageNames():
                     # ==> ASK USER TO INSTALL TOOL
                     print(Formatter.colorText(f"arch-audit is not installed. Pactool needs it.", Formatter.red))
                     
@@ -305,11 +303,7 @@ class Security:
                     
                     
                     # ==> FETCH EXPLICITLY INSTALLED USER PACKAGES
-                    userPackages = run(
-                        ["pacman", "-Qe"],
-                        capture_output=True, text=True
-                    ).stdout.splitlines()
-                    userPkgNames = {pkg.split()[0] for pkg in userPackages}
+                    userPkgNames = self.pactool.snapshot.userPackages()
 
 
 
@@ -377,10 +371,11 @@ class Security:
 
 
         try:
-            # ==> FETCH DATA FROM NVD API
-            url = f"https://services.nvd.nist.gov/rest/json/cves/2.0?keywordSearch={package}"
-            with urlopen(url) as response:
-                data = jsonLoads(response.read().decode('utf-8'))
+            # ==> FETCH DATA FROM NVD API (CACHED, RATE LIMITED, PACTOOL_NVD_URL OVERRIDES THE SERVER)
+            data = NvdClient(enabled=self.pactool.cache.enabled).search([package])[package]
+            if data is None:
+                print(Formatter.colorText("Failed to fetch CVE data from NVD.", Formatter.red))
+                return
 
 
 
@@ -452,8 +447,8 @@ class Security:
 
 
 
-        except (URLError, HTTPError, JSONDecodeError) as error:
-            print(Formatter.colorText(f"Failed to fetch CVE data ({error})", Formatter.red))
+        except (KeyError, TypeError, ValueError) as error:
+            print(Formatter.colorText(f"Failed to read CVE data ({error})", Formatter.red))
             
             
             
@@ -542,36 +537,49 @@ class Security:
 
 
     def _printCveChunk(self, cves, startIndex=0, deepSearch=False, searchKeyword=""):
-        # ==> PRINT A SINGLE PAGE OF CVE RESULTS
+        # ==> BUILD A SINGLE PAGE OF CVE RESULTS AND WRITE IT AT ONCE
+        page = TableRenderer()
+        divider = "-" * get_terminal_size().columns + "\n"
+        publishedLabel = Formatter.colorText("Published:", Formatter.cyan)
+        modifiedLabel = Formatter.colorText("Last Modified:", Formatter.cyan)
+        infoLabel = Formatter.colorText("More Info:", Formatter.cyan)
+
+
         for i, vuln in enumerate(cves, start=startIndex + 1):
             cveId = vuln["cve"]["id"]
             description = vuln["cve"]["descriptions"][0]["value"]
             pubDate = self._formatDate(vuln["cve"].get("published"))
             modDate = self._formatDate(vuln["cve"].get("lastModified"))
             wrappedDesc = self._wrapText(description, prefix="  Details: ")
+            cveLabel = cveId
 
 
 
             # ==> APPLY HIGHLIGHTING
             if searchKeyword:
-                cveId = self._highlightKeyword(cveId, searchKeyword)
+                cveLabel = self._highlightKeyword(cveId, searchKeyword)
                 wrappedDesc = self._highlightKeyword(wrappedDesc, searchKeyword)
 
 
 
-            print(Formatter.colorText(f"[{i}] {cveId}", Formatter.red, Formatter.bold))
-            print(f"  {Formatter.colorText('Published:', Formatter.cyan)} {pubDate}")
-            print(f"  {Formatter.colorText('Last Modified:', Formatter.cyan)} {modDate}")
-            print(wrappedDesc)
-            print(f"  {Formatter.colorText('More Info:', Formatter.cyan)} https://nvd.nist.gov/vuln/detail/{cveId}\n")
-            print("-" * get_terminal_size().columns + "\n")
+            page.addLine(Formatter.colorText(f"[{i}] {cveLabel}", Formatter.red, Formatter.bold))
+            page.addLine(f"  {publishedLabel} {pubDate}")
+            page.addLine(f"  {modifiedLabel} {modDate}")
+            page.addLine(wrappedDesc)
+            page.addLine(f"  {infoLabel} https://nvd.nist.gov/vuln/detail/{cveId}\n")
+            page.addLine(divider)
 
 
 
+            # ==> DEEP SEARCH PRINTS ITS OWN DETAILS, SO KEEP THE ORDER
             if deepSearch:
+                page.flush()
                 self._deepSearchDetails(cveId)
 
 
+        page.flush()
+
+
 
 
 
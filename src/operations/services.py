@@ -37,12 +37,14 @@
 #                                                                        #
 ##########################################################################
 
-from subprocess import run, PIPE
+from subprocess import PIPE
 
 
 # ==> PACTOOL FILES
+from core.process import run
 from core.logger import logError
 from core.formatter import Formatter
+from core.render import TableRenderer
 
 
 
@@ -105,9 +107,13 @@ class Services:
 
 
             # ==> DISPLAY ALL SERVICES WITH COLOR-CODED STATUS
+            table = TableRenderer([
+                TableRenderer.column(maxNameWidth, style=Formatter.cyan, prefix="  "),
+                TableRenderer.column(maxStatusWidth, dynamicStyle=True),
+            ])
             for name, status in services:
-                color = self._getServiceStatusColor(status.lower())
-                print(f"  {Formatter.colorText(name.ljust(maxNameWidth), Formatter.cyan)}  {Formatter.colorText(status.ljust(maxStatusWidth), color)}")
+                table.addRow(name, self._getServiceStatusColor(status.lower()), status)
+            table.flush()
 
 
         except Exception as error:
@@ -39,19 +39,31 @@
 #                                                                        #
 ##########################################################################
 
+from sys import exit as sysExit, argv as sysArgv, stdout as sysStdout
+
+
+# ==> TAB COMPLETION ANSWERS BEFORE ANYTHING ELSE IS IMPORTED
+if __name__ == "__main__" and sysArgv[1:2] == ["--complete"]:
+    from core.completion import completeMain
+    sysExit(completeMain(sysArgv[2:]))
+
+
+# ==> PROFILE A CLEAN RUN OF THE SAME COMMAND IN A CHILD INTERPRETER
+if __name__ == "__main__" and "--profile-startup" in sysArgv[1:]:
+    from core.startup import StartupProfiler
+    sysExit(StartupProfiler(sysArgv[0], sysArgv[1:]).run())
+
+
 from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
-from sys import exit as sysExit, argv as sysArgv
+from shutil import get_terminal_size
+from os.path import abspath
 
 
 # ==> PACTOOL FILES
 from core.logger import logSuccess, logError
 from core.formatter import Formatter
 from core.manager import Manager
-from operations.packages import Packages
-from operations.services import Services
-from operations.mirrors import Mirrors
-from operations.kernels import Kernels
-from operations.security import Security
+from core.cache import InventoryCache
 
 
 
@@ -133,13 +145,31 @@ class PactoolArgumentParser(ArgumentParser):
             f"\n{Formatter.bold}{Formatter.yellow}GENERAL COMMANDS:{Formatter.reset}\n"
             "  --version                   Show Pactool version and exit\n"
             "  --about                     Display detailed information about Pactool\n"
+            "  --no-cache                  Ignore the package inventory cache for this run\n"
+            "  --count-spawns              Report every subprocess the command started\n"
+            "  --jobs N                    Run at most N package-manager queries in parallel\n"
+            "  --completion SHELL          Print a bash/zsh/fish completion script\n"
+            "  --profile-startup           Run the command and report import times\n"
+            "  --daemon                    Serve queries from memory over a Unix socket\n"
+            "  --no-daemon                 Do not hand queries to a running daemon\n"
             f"\n{Formatter.bold}{Formatter.yellow}PACKAGE COMMANDS:{Formatter.reset}\n"
             "  --list                      List installed packages (paged by default)\n"
             "  -n N                        Number of packages to show (0 = all)\n"
             "  --stats                     Show statistics about packages\n"
+            "  --group-by KEY[,KEY]        Break --stats down by type/month/section\n"
             "  --files PACKAGE             List all files installed by a package\n"
+            "  --owns PATH                 Show which package owns a file or directory\n"
+            "  --owns-glob PATTERN         List packaged paths matching a shell pattern\n"
+            "  --orphan-files DIR          List files under DIR that no package owns\n"
             "  --search SEARCH             Search for a package by name\n"
+            "  --fuzzy                     Let --search tolerate typos and complete prefixes\n"
             "  --why PACKAGE               Show reverse dependencies of a package\n"
+            "  --depth N                   Limit --why to N levels\n"
+            "  --max-nodes N               Stop --why after N nodes\n"
+            "  --tree-mode MODE            --why output: tree/flat/dot\n"
+            "  --format FORMAT             Machine-readable json/ndjson/tsv output for\n"
+            "                              --list, --stats, --outdated, --unused, --bloat,\n"
+            "                              --changes-since, --changes-between\n"
             "  --uninstall PACKAGE         Uninstall a package by name\n"
             "  --install PACKAGE           Install a package by name\n"
             "  --update                    Update all installed packages\n"
@@ -150,10 +180,12 @@ class PactoolArgumentParser(ArgumentParser):
             "  --user                      Show only user-installed packages\n"
             "  --system                    Show only system packages\n"
             "  --info PACKAGE              Show detailed information about a package\n"
-            "  --bloat                     Find unused optional dependencies (bloat)\n"
+            "  --bloat                     Find packages only kept by optional dependencies\n"
             "  --unused                    Find unused or orphaned packages\n"
             "  --outdated                  List all outdated packages\n"
             "  --history PACKAGE           Show version history and updates of a package\n"
+            "  --changes-since DATE        List every package change since DATE, by transaction\n"
+            "  --changes-between START END List every package change in a time window\n"
             "  --versions PACKAGE          Show all available versions of a package with risk levels\n"
             f"\n{Formatter.bold}{Formatter.yellow}SERVICE COMMANDS:{Formatter.reset}\n"
             "  --services                  Show status of services related to packages\n"
@@ -205,6 +237,25 @@ class PactoolArgumentParser(ArgumentParser):
 
 
 class Main:
+    # ==> OPERATION MODULES ARE IMPORTED THE FIRST TIME A COMMAND USES THEM
+    operationModules = {
+        "packages": ("operations.packages", "Packages"),
+        "services": ("operations.services", "Services"),
+        "mirrors": ("operations.mirrors", "Mirrors"),
+        "kernels": ("operations.kernels", "Kernels"),
+        "security": ("operations.security", "Security"),
+    }
+
+
+    # ==> SHARED OBJECTS, ALSO BUILT ON FIRST USE (--version NEVER TOUCHES THEM)
+    coreModules = {
+        "snapshot": ("core.snapshot", "PackageSnapshot"),
+        "executor": ("core.executor", "ParallelExecutor"),
+    }
+
+
+
+
     def __init__(self) -> None:
         # ==> GENERAL INFO
         self.description = Version.description
@@ -212,15 +263,105 @@ class Main:
         self.releaseDate = Version.releaseDate
 
 
+        # ==> PLAIN TEXT WHEN STDOUT IS NOT A TERMINAL
+        Formatter.configureColors(sysStdout)
+
+
         # ==> CREATE OBJECTS
         self.manager = Manager()
-        self.packages = Packages(Pactool=self)
-        self.services = Services(Pactool=self)
-        self.mirrors = Mirrors(Pactool=self)
-        self.kernels = Kernels(Pactool=self)
-        self.security = Security(Pactool=self)
-        
-        
+        self.cache = InventoryCache(self.manager.defaultPackageManager)
+
+
+
+
+
+    def __getattr__(self, name: str):
+        # ==> ONLY REACHED WHILE THE OBJECT HAS NOT BEEN CREATED YET
+        if name in self.coreModules:
+            moduleName, className = self.coreModules[name]
+            arguments = {"Pactool": self} if name == "snapshot" else {}
+        elif name in self.operationModules:
+            moduleName, className = self.operationModules[name]
+            arguments = {"Pactool": self}
+        else:
+            raise AttributeError(name)
+
+
+        # ==> __import__ (UNLIKE importlib) GOES THROUGH THE INSTRUMENTED PATH, SO --profile-startup SEES IT
+        value = getattr(__import__(moduleName, fromlist=[className]), className)(**arguments)
+        setattr(self, name, value)
+        return value
+
+
+
+
+
+    def daemonQuery(self, args: Namespace, sortOption: str, reverseSort: bool):
+        """
+        (query, arguments) for a command the daemon can answer, in the same
+        order as the dispatch in run(); None for everything else.
+        """
+        # ==> PAGING AND KEYWORD PROMPTS NEED THIS TERMINAL, SO THOSE STAY LOCAL
+        interactive = sysStdout.isatty() and args.n != 0
+
+
+        if args.list:
+            if interactive and not args.format:
+                return None
+            return "list", {"limit": args.n, "sortBy": sortOption, "showUser": args.user, "showSystem": args.system, "reverseSort": reverseSort, "outputFormat": args.format}
+        elif args.stats:
+            groupBy = [key.strip() for key in args.group_by.split(",")] if args.group_by else None
+            return "stats", {"limit": args.n, "groupBy": groupBy, "outputFormat": args.format}
+        elif args.files:
+            return "files", {"packageName": args.files}
+        elif args.owns:
+            # ==> THE DAEMON HAS ITS OWN WORKING DIRECTORY
+            return "owns", {"path": abspath(args.owns)}
+        elif args.owns_glob:
+            return "owns-glob", {"pattern": args.owns_glob, "limit": args.n}
+        elif args.orphan_files:
+            return "orphans", {"directory": abspath(args.orphan_files), "limit": args.n}
+        elif args.search:
+            return None if interactive else ("search", {"name": args.search, "limit": args.n, "fuzzy": args.fuzzy})
+        elif args.why:
+            return "why", {"packageName": args.why, "mode": args.tree_mode, "maxDepth": args.depth, "maxNodes": args.max_nodes}
+        elif args.info and not any((args.uninstall, args.install, args.update, args.upgrade, args.clean)):
+            return "info", {"packageName": args.info}
+        return None
+
+
+
+
+
+    def forwardToDaemon(self, args: Namespace, sortOption: str, reverseSort: bool) -> bool:
+        # ==> --no-cache AND --count-spawns ARE ABOUT THIS PROCESS, NOT THE DAEMON'S MEMORY
+        if args.no_daemon or args.no_cache or args.count_spawns:
+            return False
+
+
+        query = self.daemonQuery(args, sortOption, reverseSort)
+        if query is None:
+            return False
+
+
+        if not self.cache.daemonSocket.exists():
+            return False
+
+
+        from core.daemon import DaemonClient
+
+
+        reply = DaemonClient().request(*query, color=Formatter.colorsEnabled, columns=get_terminal_size().columns)
+        if not reply or not reply.get("ok"):
+            # ==> A BROKEN OR STALE DAEMON NEVER COSTS THE ANSWER, IT IS JUST COMPUTED HERE
+            return False
+
+
+        sysStdout.write(reply["output"])
+        return True
+
+
+
 
 
     def baseMessage(self) -> None:
@@ -288,6 +429,13 @@ class Main:
         ##########################################################################
         parser.add_argument("--version", action="store_true", help="Show Pactool version and exit")
         parser.add_argument("--about", action="store_true", help="Display detailed information about Pactool")
+        parser.add_argument("--no-cache", action="store_true", help="Ignore the package inventory cache for this run")
+        parser.add_argument("--count-spawns", action="store_true", help="Report every subprocess the command started")
+        parser.add_argument("--jobs", type=int, metavar="N", help="Run at most N package-manager queries in parallel")
+        parser.add_argument("--completion", metavar="SHELL", help="Print a bash/zsh/fish completion script")
+        parser.add_argument("--profile-startup", action="store_true", help="Run the command and report import times")
+        parser.add_argument("--daemon", action="store_true", help="Serve queries from memory over a Unix socket")
+        parser.add_argument("--no-daemon", action="store_true", help="Do not hand queries to a running daemon")
 
 
         ##########################################################################
@@ -296,9 +444,18 @@ class Main:
         parser.add_argument("--list", action="store_true", help="List installed packages (paged by default)")
         parser.add_argument("-n", type=int, metavar="N", help="Number of packages to show (0 = all)")
         parser.add_argument("--stats", action="store_true", help="Show statistics about packages")
+        parser.add_argument("--group-by", metavar="KEY[,KEY]", help="Break --stats down by type/month/section")
         parser.add_argument("--files", metavar="PACKAGE", help="List all files installed by a package")
+        parser.add_argument("--owns", metavar="PATH", help="Show which package owns a file or directory")
+        parser.add_argument("--owns-glob", metavar="PATTERN", help="List packaged paths matching a shell pattern")
+        parser.add_argument("--orphan-files", metavar="DIR", help="List files under DIR that no package owns")
         parser.add_argument("--search", metavar="SEARCH", help="Search for a package by name")
+        parser.add_argument("--fuzzy", action="store_true", help="Let --search tolerate typos and complete prefixes")
         parser.add_argument("--why", metavar="PACKAGE", help="Show reverse dependencies of a package")
+        parser.add_argument("--depth", type=int, metavar="N", help="Limit --why to N levels")
+        parser.add_argument("--max-nodes", type=int, metavar="N", help="Stop --why after N nodes")
+        parser.add_argument("--tree-mode", metavar="MODE", default="tree", help="--why output: tree/flat/dot")
+        parser.add_argument("--format", metavar="FORMAT", help="Machine-readable json/ndjson/tsv output")
         parser.add_argument("--uninstall", metavar="PACKAGE", help="Uninstall a package by name")
         parser.add_argument("--install", metavar="PACKAGE", help="Install a package by name")
         parser.add_argument("--update", action="store_true", help="Update all installed packages")
@@ -309,10 +466,12 @@ class Main:
         parser.add_argument("--user", action="store_true", help="Show only user-installed packages")
         parser.add_argument("--system", action="store_true", help="Show only system packages")
         parser.add_argument("--info", metavar="PACKAGE", help="Show detailed information about a package")
-        parser.add_argument("--bloat", action="store_true", help="Find unused optional dependencies (bloat)")
+        parser.add_argument("--bloat", action="store_true", help="Find packages only kept by optional dependencies")
         parser.add_argument("--unused", action="store_true", help="Find unused or orphaned packages")
         parser.add_argument("--outdated", action="store_true", help="List all outdated packages")
         parser.add_argument("--history", metavar="PACKAGE", help="Show version history and updates of a package")
+        parser.add_argument("--changes-since", metavar="DATE", help="List every package change since DATE, by transaction")
+        parser.add_argument("--changes-between", nargs=2, metavar=("START", "END"), help="List every package change in a time window")
         parser.add_argument("--versions", metavar="PACKAGE", help="Show all available versions of a package with risk levels")
         parser.add_argument("--assess-risk", action="store_true", help="Assess risk level for package versions (Only used with --versions)")
         
@@ -374,13 +533,45 @@ class Main:
 
 
 
+    def checkChoices(self, parser: ArgumentParser, args: Namespace) -> None:
+        """
+        The choices that live in modules pactool does not import at start-up,
+        checked only for the options that were actually given.
+        """
+        choices = {}
+        if args.completion:
+            from core.completion import shells
+            choices["--completion"] = (args.completion, shells)
+        if args.tree_mode != "tree":
+            from core.tree import TreeRenderer
+            choices["--tree-mode"] = (args.tree_mode, TreeRenderer.modes)
+        if args.format:
+            from core.export import RecordWriter
+            choices["--format"] = (args.format, RecordWriter.formats)
+
+
+        for option, (value, allowed) in choices.items():
+            if value not in allowed:
+                parser.error(f"argument {option}: invalid choice: {value!r} (choose from {', '.join(map(repr, allowed))})")
+
+
+
+
+
     def run(self) -> None:
         parser = self.createParser()
 
         try:
             args: Namespace = parser.parse_args()
+            self.checkChoices(parser, args)
 
             
+            # ==> BYPASS THE INVENTORY CACHE IF REQUESTED
+            self.cache.enabled = self.cache.enabled and not args.no_cache
+            if args.jobs:
+                self.executor.workers = max(1, args.jobs)
+
+
             # ==> GET SORTING OPTIONS (IF ANY)
             sortOption = args.sort or args.rsort
             reverseSort = bool(args.rsort)
@@ -388,19 +579,38 @@ class Main:
 
             if args.about:
                 self.about()
+            elif args.completion:
+                from core.completion import completionScript
+                options = {option: action.help for action in parser._actions for option in action.option_strings}
+                sysStdout.write(completionScript(args.completion, options))
+            elif args.daemon:
+                from core.daemon import PactoolDaemon
+                PactoolDaemon(Pactool=self).serve()
+
+
+            # ==> READ-ONLY QUERIES ARE ANSWERED BY A RUNNING DAEMON WHEN THERE IS ONE
+            elif self.forwardToDaemon(args, sortOption, reverseSort):
+                pass
 
 
             # ==> PACKAGE COMMANDS
             elif args.list:
-                self.packages.list(args.n, sortOption, args.user, args.system, reverseSort)
+                self.packages.list(args.n, sortOption, args.user, args.system, reverseSort, args.format)
             elif args.stats:
-                self.packages.stats(args.n)
+                groupBy = [key.strip() for key in args.group_by.split(",")] if args.group_by else None
+                self.packages.stats(args.n, groupBy=groupBy, outputFormat=args.format)
             elif args.files:
                 self.packages.listFiles(args.files)
+            elif args.owns:
+                self.packages.owns(args.owns)
+            elif args.owns_glob:
+                self.packages.ownsGlob(args.owns_glob, args.n)
+            elif args.orphan_files:
+                self.packages.orphanFiles(args.orphan_files, args.n)
             elif args.search:
-                self.packages.search(args.search, args.n)
+                self.packages.search(args.search, args.n, args.fuzzy)
             elif args.why:
-                self.packages.why(args.why)
+                self.packages.why(args.why, args.tree_mode, args.depth, args.max_nodes)
             elif args.uninstall:
                 self.packages.uninstall(args.uninstall)
             elif args.install:
@@ -414,13 +624,17 @@ class Main:
             elif args.info:
                 self.packages.info(args.info)   
             elif args.bloat:
-                self.packages.bloat(args.n)
+                self.packages.bloat(args.n, args.format)
             elif args.unused:
-                self.packages.unused(args.n)
+                self.packages.unused(args.n, args.format)
             elif args.outdated:
-                self.packages.outdated(args.n)
+                self.packages.outdated(args.n, args.format)
             elif args.history:
                 self.packages.history(args.history)
+            elif args.changes_since:
+                self.packages.changes(args.changes_since, outputFormat=args.format)
+            elif args.changes_between:
+                self.packages.changes(*args.changes_between, outputFormat=args.format)
             elif args.versions:
                 self.packages.versions(args.versions, assessRisk=args.assess_risk)
 
@@ -468,6 +682,12 @@ class Main:
                 self.baseMessage()
 
 
+            # ==> SUBPROCESS INSTRUMENTATION
+            if args.count_spawns:
+                from core.process import SpawnCounter
+                SpawnCounter.report()
+
+
             self.quit(code=0)
 
 